@@ -1 +1,9 @@
-from .map_generation import GenerateurCarte
+from .map_generation import GenerateurCarte, StrategieGeneration, densite_eloignement_entree, formater_rapport
+from .caverne import GenerateurCaverne
+from .strategies import STRATEGIES, creer_generateur
+from .room_graph import RoomGraph
+from .union_find import UnionFind
+from .floor_plan import FloorPlan
+from .etage import construire_etage, generer_contour_noir
+from .cache import CacheEtages
+from .solvabilite import verifier_etage, verifier_plan
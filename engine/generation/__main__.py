@@ -0,0 +1,145 @@
+"""Génération d'étages en lot, hors du jeu, pour mesurer le débit du générateur et trouver les graines qui le cassent.
+
+Exemples :
+    python -m engine.generation -n 200 -t 50 100 150 -d 1 5 10 -p 8
+    python -m engine.generation -n 10 -t 250 500 1000 -d 5 -g bsp caverne -m
+"""
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import os
+from random import getrandbits
+import sys
+from time import perf_counter
+import traceback
+import tracemalloc
+
+from .etage import convertir_carte
+from .map_generation import CONNECTEURS
+from .solvabilite import verifier_plan
+from .strategies import STRATEGIES, creer_generateur
+
+
+# Colonnes ajoutées aux phases du générateur : la mise à l'échelle et la vérification faites pour le jeu
+PHASES_JEU = ("mise_a_l_echelle", "verification")
+
+# Phases déjà comptées dans la durée de la phase qui les appelle
+SOUS_PHASES = ("separations",)
+
+
+def generer_un_etage(taille: int, difficulte: int, seed: int, connecteur: str, strategie: str = "bsp", memoire: bool = False) -> dict:
+    """
+    Génère un étage en mesurant chaque phase, sans jamais lever d'exception.
+
+    Args:
+        taille (int): La largeur et la hauteur de la carte, en cases.
+        difficulte (int): Le coefficient de difficulté de la carte.
+        seed (int): La graine de la carte.
+        connecteur (str): L'algorithme de connexion des salles (stratégie 'bsp' seulement).
+        strategie (str, optional): La stratégie de génération, clé de STRATEGIES. Par défaut 'bsp'.
+        memoire (bool, optional): Mesure aussi le pic de mémoire avec tracemalloc (plus lent). Par défaut False.
+
+    Returns:
+        dict: {"strategie", "taille", "difficulte", "seed", "rapport", "pic", "erreur"} où rapport est celui
+              du générateur (phases terminées seulement), pic le pic de mémoire en octets (None s'il n'est
+              pas mesuré) et erreur décrit l'échec (None si l'étage est valide).
+    """
+    resultat = {"strategie": strategie, "taille": taille, "difficulte": difficulte, "seed": seed, "rapport": {}, "pic": None, "erreur": None}
+    options = {"connecteur": connecteur} if strategie == "bsp" else {}
+    if memoire:
+        tracemalloc.start()
+    dg = None
+    try:
+        dg = creer_generateur(strategie, taille, difficulte, seed=seed, **options)
+        dg.generate_map(profiler=True)
+        etage = dg.mesurer("mise_a_l_echelle", convertir_carte, dg)
+        solvabilite = dg.mesurer("verification", verifier_plan, etage)
+    except Exception as e:
+        resultat["erreur"] = f"{type(e).__name__}: {e} ({traceback.extract_tb(e.__traceback__)[-1].name})"
+        return resultat
+    finally:
+        resultat["rapport"] = (dg.rapport if dg is not None else None) or {}
+        if memoire:
+            resultat["pic"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    if etage.entree is None or etage.sortie is None:
+        resultat["erreur"] = "pas d'entrée ni de sortie"
+    elif etage.entree == etage.sortie:
+        resultat["erreur"] = "l'entrée et la sortie sont confondues"
+    elif not solvabilite.soluble:
+        resultat["erreur"] = f"étage insoluble : {solvabilite}"
+
+    return resultat
+
+
+def main(arguments=None) -> int:
+    """
+    Point d'entrée de la ligne de commande.
+
+    Args:
+        arguments (list, optional): Les arguments de la ligne de commande. Par défaut ceux de sys.argv.
+
+    Returns:
+        int: Le code de sortie : 0 si tous les étages sont valides, 1 sinon.
+    """
+    parser = ArgumentParser(prog="python -m engine.generation", description="Génère des étages en parallèle et mesure le générateur.")
+    parser.add_argument("-n", "--nombre", type=int, default=100, help="nombre d'étages par couple (taille, difficulté)")
+    parser.add_argument("-t", "--tailles", type=int, nargs="+", default=[50, 100, 150], help="tailles des cartes, en cases")
+    parser.add_argument("-d", "--difficultes", type=int, nargs="+", default=[1, 5, 10], help="coefficients de difficulté")
+    parser.add_argument("-p", "--processus", type=int, default=os.cpu_count(), help="nombre de processus (par défaut un par cœur)")
+    parser.add_argument("-c", "--connecteur", choices=CONNECTEURS, default=CONNECTEURS[0], help="algorithme de connexion des salles")
+    parser.add_argument("-s", "--graine", type=int, default=None, help="graine du premier étage, les suivantes sont consécutives")
+    parser.add_argument("-g", "--strategies", choices=list(STRATEGIES), nargs="+", default=[next(iter(STRATEGIES))],
+                        help="stratégies de génération à comparer (mêmes graines pour chacune)")
+    parser.add_argument("-m", "--memoire", action="store_true", help="mesure le pic de mémoire de chaque étage (plus lent)")
+    args = parser.parse_args(arguments)
+
+    graine = getrandbits(32) if args.graine is None else args.graine
+    taches = [
+        (taille, difficulte, graine + i, args.connecteur, strategie, args.memoire)
+        for strategie, taille, difficulte in product(args.strategies, args.tailles, args.difficultes)
+        for i in range(args.nombre)
+    ]
+    print(f"{len(taches)} étages, {args.processus} processus, stratégies {', '.join(args.strategies)}, "
+          f"connecteur {args.connecteur}, graines {graine}..{graine + args.nombre - 1}")
+
+    debut = perf_counter()
+    with ProcessPoolExecutor(max_workers=args.processus) as executeur:
+        resultats = list(executeur.map(generer_un_etage, *zip(*taches), chunksize=max(1, len(taches) // (4 * args.processus))))
+    duree = perf_counter() - debut
+
+    print(f"{len(resultats) / duree:.1f} étages/s ({duree:.2f} s au total)")
+    print()
+
+    # moyenne de chaque phase (durée en ms et variation des blocs alloués) par stratégie et par couple (taille, difficulté),
+    # sur les étages réussis
+    for strategie, taille, difficulte in product(args.strategies, args.tailles, args.difficultes):
+        groupe = [r for r in resultats if r["strategie"] == strategie and r["taille"] == taille and r["difficulte"] == difficulte]
+        reussis = [r for r in groupe if r["erreur"] is None]
+        print(f"{strategie}, taille {taille}, difficulté {difficulte} : {len(reussis)} réussis, {len(groupe) - len(reussis)} échecs")
+        if not reussis:
+            continue
+        total = 0
+        for phase in STRATEGIES[strategie].PHASES + PHASES_JEU:
+            temps = sum(r["rapport"][phase]["temps"] for r in reussis) / len(reussis)
+            blocs = sum(r["rapport"][phase]["blocs"] for r in reussis) / len(reussis)
+            if phase not in SOUS_PHASES:
+                total += temps
+            print(f"  {phase:<20} {1000 * temps:>9.2f} ms {blocs:>+10.0f} blocs")
+        print(f"  {'total':<20} {1000 * total:>9.2f} ms  ({1 / total:.1f} étages/s par processus)")
+        if args.memoire:
+            print(f"  {'pic de mémoire':<20} {max(r['pic'] for r in reussis) / 2 ** 20:>9.2f} Mo")
+        print()
+
+    echecs = [r for r in resultats if r["erreur"] is not None]
+    if echecs:
+        print(f"{len(echecs)} échec(s) :")
+        for r in echecs:
+            print(f"  strategie={r['strategie']} taille={r['taille']} difficulte={r['difficulte']} seed={r['seed']} : {r['erreur']}")
+
+    return 1 if echecs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
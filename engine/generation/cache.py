@@ -0,0 +1,283 @@
+from array import array
+from hashlib import sha256
+import os
+import struct
+import sys
+import zlib
+
+from .floor_plan import FloorPlan
+from .map_generation import VERSION_GENERATEUR
+
+
+# En-tête d'un fichier d'étage : signature, version du format, hauteur et largeur de la matrice,
+# nombre de portes, de clés, de monstres, de salles, de couloirs et de cases de couloirs,
+# puis positions (x, y) de l'entrée et de la sortie
+MAGIQUE = b"KDET"
+VERSION_FORMAT = 2
+FORMAT_ENTETE = "<4sBHHIIIIIIHHHH"
+TAILLE_ENTETE = struct.calcsize(FORMAT_ENTETE)
+ABSENT = 0xFFFF # coordonnée d'une entrée ou d'une sortie absente
+
+EXTENSION = ".etage"
+
+
+class CacheEtages:
+    """Cache sur disque des étages terminés, indexé par (graine, taille, difficulté).
+
+    Chaque étage est stocké dans un fichier binaire compressé dont le nom est l'empreinte de sa clé.
+    La taille totale du dossier est bornée : les étages les moins récemment utilisés sont supprimés
+    en premier (la date de modification d'un fichier est mise à jour à chaque lecture).
+    """
+
+    __slots__ = ['dossier', 'taille_max']
+
+    def __init__(self, dossier: str, taille_max: int = 32 * 1024 * 1024) -> None:
+        """
+        Initialise le cache.
+
+        Args:
+            dossier (str): Le dossier contenant les fichiers d'étages (créé à la première écriture).
+            taille_max (int, optional): La taille maximale du dossier, en octets. Par défaut 32 Mo.
+        """
+        self.dossier = dossier
+        self.taille_max = taille_max
+
+    def chemin(self, seed, taille: int, difficulte: int) -> str:
+        """
+        Renvoie le chemin du fichier correspondant à un étage.
+
+        Args:
+            seed (int | str): La graine de l'étage.
+            taille (int): La taille de la carte.
+            difficulte (int): Le coefficient de difficulté de la carte.
+
+        Returns:
+            str: Le chemin du fichier, qu'il existe ou non.
+        """
+        cle = f"{VERSION_GENERATEUR}:{type(seed).__name__}:{seed}:{taille}:{difficulte}"
+        return os.path.join(self.dossier, sha256(cle.encode()).hexdigest()[:32] + EXTENSION)
+
+    def charger(self, seed, taille: int, difficulte: int):
+        """
+        Charge un étage depuis le cache.
+
+        Args:
+            seed (int | str): La graine de l'étage.
+            taille (int): La taille de la carte.
+            difficulte (int): Le coefficient de difficulté de la carte.
+
+        Returns:
+            FloorPlan | None: Le plan de l'étage, ou None s'il n'est pas en cache.
+        """
+        chemin = self.chemin(seed, taille, difficulte)
+        try:
+            with open(chemin, "rb") as f:
+                donnees = f.read()
+            etage = decoder_etage(donnees)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error, zlib.error) as e:
+            print("Étage en cache illisible, suppression :", chemin, e)
+            self.supprimer(chemin)
+            return None
+
+        try:
+            os.utime(chemin) # l'étage devient le plus récemment utilisé
+        except OSError:
+            pass
+        return etage
+
+    def enregistrer(self, seed, taille: int, difficulte: int, etage: FloorPlan) -> None:
+        """
+        Enregistre un étage dans le cache, puis supprime les plus anciens si le cache est trop gros.
+
+        Args:
+            seed (int | str): La graine de l'étage.
+            taille (int): La taille de la carte.
+            difficulte (int): Le coefficient de difficulté de la carte.
+            etage (FloorPlan): Le plan de l'étage.
+        """
+        chemin = self.chemin(seed, taille, difficulte)
+        temporaire = chemin + ".tmp"
+        try:
+            os.makedirs(self.dossier, exist_ok=True)
+            with open(temporaire, "wb") as f:
+                f.write(encoder_etage(etage))
+            os.replace(temporaire, chemin) # écriture atomique : jamais de fichier à moitié écrit
+        except OSError as e:
+            print("Impossible d'enregistrer l'étage dans le cache :", e)
+            self.supprimer(temporaire)
+            return
+
+        self.evincer()
+
+    def evincer(self) -> None:
+        """
+        Supprime les étages les moins récemment utilisés jusqu'à ce que le cache respecte sa taille maximale.
+        """
+        try:
+            fichiers = [entree for entree in os.scandir(self.dossier) if entree.name.endswith(EXTENSION)]
+        except OSError:
+            return
+
+        fichiers = [(entree.stat().st_mtime, entree.stat().st_size, entree.path) for entree in fichiers]
+        total = sum(taille for _, taille, _ in fichiers)
+        for _, taille, chemin in sorted(fichiers):
+            if total <= self.taille_max:
+                break
+            self.supprimer(chemin)
+            total -= taille
+
+    def vider(self) -> None:
+        """
+        Supprime tous les étages du cache.
+        """
+        try:
+            fichiers = [entree.path for entree in os.scandir(self.dossier) if entree.name.endswith(EXTENSION)]
+        except OSError:
+            return
+        for chemin in fichiers:
+            self.supprimer(chemin)
+
+    def supprimer(self, chemin: str) -> None:
+        """
+        Supprime un fichier du cache s'il existe.
+
+        Args:
+            chemin (str): Le chemin du fichier.
+        """
+        try:
+            os.remove(chemin)
+        except OSError:
+            pass
+
+
+def _coordonnees(valeurs) -> bytes:
+    """
+    Convertit une suite d'entiers en entiers non signés de 16 bits, petit-boutistes.
+
+    Args:
+        valeurs (iterable): Les entiers, par exemple les coordonnées x0, y0, x1, y1, ...
+
+    Returns:
+        bytes: Les entiers encodés.
+    """
+    valeurs = array("H", valeurs)
+    if sys.byteorder == "big":
+        valeurs.byteswap()
+    return valeurs.tobytes()
+
+
+def _entiers(donnees: bytes) -> array:
+    """
+    Opération inverse de _coordonnees.
+
+    Args:
+        donnees (bytes): Les entiers encodés.
+
+    Returns:
+        array: Les entiers.
+    """
+    valeurs = array("H")
+    valeurs.frombytes(donnees)
+    if sys.byteorder == "big":
+        valeurs.byteswap()
+    return valeurs
+
+
+def _positions(donnees: bytes, taille: int = 2) -> list:
+    """
+    Décode des positions (ou des rectangles) encodés par _coordonnees.
+
+    Args:
+        donnees (bytes): Les coordonnées x0, y0, x1, y1, ...
+        taille (int, optional): Le nombre d'entiers par position. Par défaut 2.
+
+    Returns:
+        list: Les tuples de coordonnées.
+    """
+    valeurs = _entiers(donnees)
+    return list(zip(*(valeurs[i::taille] for i in range(taille))))
+
+
+def encoder_etage(etage: FloorPlan) -> bytes:
+    """
+    Encode un étage dans le format binaire du cache : un en-tête fixe suivi, après compression,
+    de la matrice (un octet par case), des positions des portes, des clés et des monstres,
+    des rectangles des salles, de la longueur de chaque couloir et enfin des cases des couloirs.
+
+    Args:
+        etage (FloorPlan): Le plan de l'étage.
+
+    Returns:
+        bytes: L'étage encodé.
+    """
+    largeur, hauteur = etage.taille
+    entree = etage.entree or (ABSENT, ABSENT)
+    sortie = etage.sortie or (ABSENT, ABSENT)
+    nb_cases_couloirs = sum(len(couloir) for couloir in etage.couloirs)
+
+    entete = struct.pack(
+        FORMAT_ENTETE, MAGIQUE, VERSION_FORMAT, hauteur, largeur,
+        len(etage.portes), len(etage.cles), len(etage.monstres), len(etage.salles), len(etage.couloirs), nb_cases_couloirs,
+        *entree, *sortie
+    )
+    corps = b"".join((
+        b"".join(etage.matrice),
+        _coordonnees(v for position in etage.portes for v in position),
+        _coordonnees(v for position in etage.cles for v in position),
+        _coordonnees(v for position in etage.monstres for v in position),
+        _coordonnees(v for salle in etage.salles for v in salle),
+        _coordonnees(len(couloir) for couloir in etage.couloirs),
+        _coordonnees(v for couloir in etage.couloirs for position in couloir for v in position),
+    ))
+    return entete + zlib.compress(corps)
+
+
+def decoder_etage(donnees: bytes) -> FloorPlan:
+    """
+    Décode un étage encodé par encoder_etage.
+
+    Args:
+        donnees (bytes): L'étage encodé.
+
+    Returns:
+        FloorPlan: Le plan de l'étage.
+
+    Raises:
+        ValueError: Si les données ne sont pas un étage valide.
+    """
+    (magique, version, hauteur, largeur, nb_portes, nb_cles, nb_monstres, nb_salles, nb_couloirs, nb_cases_couloirs,
+     ex, ey, sx, sy) = struct.unpack_from(FORMAT_ENTETE, donnees)
+    if magique != MAGIQUE or version != VERSION_FORMAT:
+        raise ValueError("format d'étage inconnu")
+
+    corps = zlib.decompress(donnees[TAILLE_ENTETE:])
+    fin_matrice = hauteur * largeur
+    fin_portes = fin_matrice + 4 * nb_portes
+    fin_cles = fin_portes + 4 * nb_cles
+    fin_monstres = fin_cles + 4 * nb_monstres
+    fin_salles = fin_monstres + 8 * nb_salles
+    fin_longueurs = fin_salles + 2 * nb_couloirs
+    if len(corps) != fin_longueurs + 4 * nb_cases_couloirs:
+        raise ValueError("étage tronqué")
+
+    cases_couloirs = _positions(corps[fin_longueurs:])
+    couloirs = []
+    debut = 0
+    for longueur in _entiers(corps[fin_salles:fin_longueurs]):
+        couloirs.append(cases_couloirs[debut:debut + longueur])
+        debut += longueur
+    if debut != nb_cases_couloirs:
+        raise ValueError("couloirs incohérents")
+
+    return FloorPlan(
+        matrice=[bytearray(corps[y * largeur:(y + 1) * largeur]) for y in range(hauteur)],
+        salles=_positions(corps[fin_monstres:fin_salles], 4),
+        couloirs=couloirs,
+        portes=_positions(corps[fin_matrice:fin_portes]),
+        cles=_positions(corps[fin_portes:fin_cles]),
+        monstres=_positions(corps[fin_cles:fin_monstres]),
+        entree=None if ex == ABSENT else (ex, ey),
+        sortie=None if sx == ABSENT else (sx, sy),
+    )
@@ -0,0 +1,371 @@
+from array import array
+from bisect import bisect_right
+from random import Random
+from typing import Callable, List, Optional, Union
+
+from .map_generation import CLE, ENTREE, MUR, PORTE, SOL, SORTIE, StrategieGeneration
+from .solvabilite import MOTIF_PRATICABLE, TABLE_PRATICABLE, Segments
+
+# Phases de GenerateurCaverne.generate_map, dans l'ordre d'exécution
+PHASES_CAVERNE = ('remplissage', 'automate', 'plus_grande_caverne', 'in_out', 'placements_entitees', 'placements_monstres')
+
+# Table qui donne le code de la grille d'un chiffre hexadécimal de l'automate (1 pour un mur, 0 pour le sol)
+TABLE_CASES = bytes(MUR if code == ord('1') else SOL for code in range(256))
+
+# Table qui garde tout ce qui n'est pas un mur (les portes comptent : elles s'ouvrent avec une clé)
+TABLE_NON_MUR = bytes(int(code != MUR) for code in range(256))
+
+
+def _vers_entier(chiffres: bytes) -> int:
+    """
+    Convertit des chiffres hexadécimaux (un par case, la case 0 en premier) en entier :
+    la case k occupe les bits 4k à 4k+3.
+
+    Args:
+        chiffres (bytes): Les chiffres ASCII des cases.
+
+    Returns:
+        int: L'entier, un groupe de 4 bits par case.
+    """
+    return int(chiffres[::-1], 16) if chiffres else 0
+
+
+def _vers_chiffres(entier: int, taille: int) -> bytes:
+    """
+    Opération inverse de _vers_entier.
+
+    Args:
+        entier (int): L'entier, un groupe de 4 bits par case.
+        taille (int): Le nombre de cases.
+
+    Returns:
+        bytes: Les chiffres ASCII des cases, la case 0 en premier.
+    """
+    return (b"%x" % entier).rjust(taille, b"0")[::-1]
+
+
+class GenerateurCaverne(StrategieGeneration):
+    """Classe pour générer une carte de cavernes par automate cellulaire.
+
+    La grille est remplie de murs au hasard puis lissée : à chaque itération, une case devient un mur si au moins
+    cinq des neuf cases de son voisinage (elle comprise) en sont. Seule la plus grande caverne est gardée.
+    L'entrée et la sortie sont aux deux bouts du plus long chemin de la caverne, et chaque porte ferme toute
+    une couche de cases à la même distance de l'entrée : elle ne peut pas être contournée.
+    """
+
+    __slots__ = ['remplissage', 'iterations', 'distances']
+
+    NOM = 'caverne'
+    PHASES = PHASES_CAVERNE
+
+    def __init__(self, w: int, h: int, nb_cle:int=6, coef_difficulte:int=1, seed:Optional[Union[int, str, Random]]=None,
+                 densite_monstres:Optional[Callable[['StrategieGeneration', int, int], float]]=None,
+                 remplissage:float=0.45, iterations:int=5):
+        """
+        Initialise le générateur de cavernes.
+
+        Paramètres:
+            - w (int): La largeur de la carte.
+            - h (int): La hauteur de la carte.
+            - nb_cle (int): Le nombre de clés à placer sur la carte.
+            - coef_difficulte (int): Le coefficient de difficulté de la carte.
+            - seed (int | str | Random, optional): La graine du générateur aléatoire. Par défaut None.
+            - densite_monstres (callable, optional): Voir StrategieGeneration. Par défaut None.
+            - remplissage (float): La proportion de murs tirés au départ. Par défaut 0.45.
+            - iterations (int): Le nombre d'itérations de l'automate. Par défaut 5.
+
+        Returns:
+            None
+        """
+        super().__init__(w, h, nb_cle, coef_difficulte, seed, densite_monstres)
+        self.remplissage = remplissage
+        self.iterations = iterations
+        self.distances = None # distance de chaque case à l'entrée, calculée par in_out
+
+    def remplissage_aleatoire(self) -> int:
+        """
+        Tire les murs de départ, un octet aléatoire par case, et encadre la carte de murs.
+
+        Returns:
+            int: L'état de l'automate, un groupe de 4 bits par case (voir automate).
+        """
+        largeur, hauteur = self.width, self.height
+        seuil = round(256 * self.remplissage)
+        tirage = bytes(ord('1') if octet < seuil else ord('0') for octet in range(256))
+
+        # chaque ligne est suivie d'une case de garde, toujours vide, qui sépare les lignes de l'automate
+        pas = largeur + 1
+        chiffres = self.rng.randbytes(hauteur * pas).translate(tirage)
+        return (_vers_entier(chiffres) & self.masque()) | self.masque(bord=True)
+
+    def masque(self, bord: bool = False) -> int:
+        """
+        Renvoie un masque de l'automate : un 1 dans chaque case de la carte (hors cases de garde),
+        ou seulement dans les cases du bord si bord est vrai.
+
+        Args:
+            bord (bool, optional): Ne garder que les cases du bord (celles qui restent des murs). Par défaut False.
+
+        Returns:
+            int: Le masque, un groupe de 4 bits par case.
+        """
+        largeur, hauteur = self.width, self.height
+        pleine = b"1" * largeur + b"0"
+        if not bord:
+            return _vers_entier(pleine * hauteur)
+        cotes = b"1" + b"0" * (largeur - 2) + b"10" if largeur > 1 else pleine
+        return _vers_entier(pleine + cotes * (hauteur - 2) + pleine if hauteur > 1 else pleine)
+
+    def automate(self, etat: int) -> None:
+        """
+        Lisse la carte par automate cellulaire, puis l'écrit dans la grille.
+
+        Toute la grille est traitée à chaque itération, comme une convolution : chaque case occupe 4 bits
+        d'un seul grand entier, et les décalages de l'entier additionnent en une fois les voisins de toutes
+        les cases (au plus 9, le groupe ne déborde jamais). Les cases de garde, vides, évitent qu'une ligne
+        ne déborde sur la suivante.
+
+        Args:
+            etat (int): L'état renvoyé par remplissage_aleatoire.
+        """
+        largeur, hauteur = self.width, self.height
+        pas = largeur + 1
+        cases = self.masque()
+        bord = self.masque(bord=True)
+        trois = 3 * _vers_entier(b"1" * (hauteur * pas))
+        ligne = 4 * pas
+
+        for _ in range(self.iterations):
+            horizontal = etat + (etat << 4) + (etat >> 4)
+            voisins = horizontal + (horizontal << ligne) + (horizontal >> ligne)
+            # au moins 5 murs <=> voisins + 3 >= 8 <=> le bit 3 du groupe est à 1
+            etat = (((voisins + trois) >> 3) & cases) | bord
+
+        chiffres = _vers_chiffres(etat, hauteur * pas).translate(TABLE_CASES)
+        self.dungeon = bytearray(b"".join(chiffres[r * pas:r * pas + largeur] for r in range(hauteur)))
+
+    def lignes(self, table: bytes) -> List[bytes]:
+        """
+        Renvoie les lignes de la grille, traduites par la table donnée.
+
+        Args:
+            table (bytes): La table de traduction des codes.
+
+        Returns:
+            List[bytes]: Les lignes traduites.
+        """
+        grille, largeur = self.dungeon.translate(table), self.width
+        return [grille[r * largeur:(r + 1) * largeur] for r in range(self.height)]
+
+    def garder_composante(self, segments: Segments, composante: int) -> None:
+        """
+        Remplit de murs tous les segments qui ne sont pas dans la composante à garder.
+
+        Args:
+            segments (Segments): Les segments de la grille.
+            composante (int): Le représentant de la composante à garder.
+        """
+        grille, largeur = self.dungeon, self.width
+        find = segments.groupes.find
+        for y, (debuts, fins, premier) in enumerate(zip(segments.debuts, segments.fins, segments.premiers)):
+            for k, (debut, fin) in enumerate(zip(debuts, fins)):
+                if find(premier + k) != composante:
+                    grille[y * largeur + debut:y * largeur + fin] = bytes(fin - debut)
+
+    def plus_grande_caverne(self) -> None:
+        """
+        Ne garde que la plus grande caverne : les autres, inaccessibles, sont remplies de murs.
+        """
+        segments = Segments(self.lignes(TABLE_PRATICABLE), MOTIF_PRATICABLE)
+        find = segments.groupes.find
+        tailles = {}
+        for debuts, fins, premier in zip(segments.debuts, segments.fins, segments.premiers):
+            for k, (debut, fin) in enumerate(zip(debuts, fins)):
+                composante = find(premier + k)
+                tailles[composante] = tailles.get(composante, 0) + fin - debut
+        if tailles:
+            self.garder_composante(segments, max(tailles, key=tailles.get))
+
+    def parcours(self, depart: int, distances: Optional[array] = None) -> List[List[int]]:
+        """
+        Parcours en largeur de la caverne depuis une case, couche par couche.
+
+        La carte est entourée de murs : les voisins d'une case de sol sont toujours dans la grille.
+
+        Args:
+            depart (int): L'index de la case de départ.
+            distances (array, optional): Si donné, reçoit la distance de chaque case atteinte.
+
+        Returns:
+            List[List[int]]: Les couches : les index des cases à distance 0, 1, 2, ... du départ.
+        """
+        libres = bytearray(self.dungeon.translate(TABLE_PRATICABLE))
+        largeur = self.width
+        libres[depart] = 0
+        couches = [[depart]]
+        couche = couches[0]
+        while couche:
+            suivante = []
+            ajouter = suivante.append
+            for i in couche:
+                # les quatre voisins, sans construire de tuple : c'est la boucle la plus chaude du générateur
+                if libres[i - 1]:
+                    libres[i - 1] = 0
+                    ajouter(i - 1)
+                if libres[i + 1]:
+                    libres[i + 1] = 0
+                    ajouter(i + 1)
+                if libres[i - largeur]:
+                    libres[i - largeur] = 0
+                    ajouter(i - largeur)
+                if libres[i + largeur]:
+                    libres[i + largeur] = 0
+                    ajouter(i + largeur)
+            if suivante:
+                couches.append(suivante)
+            couche = suivante
+
+        if distances is not None:
+            for d, couche in enumerate(couches):
+                for i in couche:
+                    distances[i] = d
+        return couches
+
+    def in_out(self) -> List[List[int]]:
+        """
+        Place l'entrée et la sortie aux deux bouts d'un des plus longs chemins de la caverne, par double parcours
+        en largeur : l'entrée est la case la plus éloignée d'une case quelconque, la sortie la plus éloignée de l'entrée.
+
+        Returns:
+            List[List[int]]: Les couches du parcours depuis l'entrée (vide s'il n'y a pas de caverne).
+        """
+        depart = self.dungeon.find(SOL)
+        if depart == -1:
+            return []
+
+        largeur = self.width
+        entree = self.parcours(depart)[-1][0]
+        self.distances = array('i', [-1]) * len(self.dungeon)
+        couches = self.parcours(entree, self.distances)
+        if len(couches) == 1: # caverne d'une seule case
+            return []
+        sortie = couches[-1][0]
+
+        self.dungeon[entree] = ENTREE
+        self.dungeon[sortie] = SORTIE
+        self.liste_SE = [divmod(entree, largeur), divmod(sortie, largeur)]
+        return couches
+
+    def chemin(self, arrivee: int) -> List[int]:
+        """
+        Remonte un plus court chemin de l'entrée jusqu'à la case donnée.
+
+        Args:
+            arrivee (int): L'index de la case d'arrivée.
+
+        Returns:
+            List[int]: Les index des cases du chemin, l'entrée en premier.
+        """
+        distances, largeur = self.distances, self.width
+        chemin = [arrivee]
+        i = arrivee
+        while distances[i] > 0:
+            i = next(j for j in (i - 1, i + 1, i - largeur, i + largeur) if distances[j] == distances[i] - 1)
+            chemin.append(i)
+        chemin.reverse()
+        return chemin
+
+    def placements_entitees(self, couches: List[List[int]]) -> None:
+        """
+        Coupe le chemin de l'entrée à la sortie en sections séparées par des portes, puis place une clé par section.
+
+        Toutes les cases à une même distance de l'entrée forment une couche que tout chemin vers la sortie doit
+        traverser : elle devient un mur, sauf sa case sur le plus court chemin, qui devient la porte.
+        La clé qui ouvre une porte est placée au hasard dans la section qui la précède.
+
+        Args:
+            couches (List[List[int]]): Les couches du parcours depuis l'entrée (voir in_out).
+        """
+        longueur = len(couches) - 1
+        if longueur < 6:
+            return
+
+        # au moins deux cases entre deux portes
+        nb_cles = min(self.NB_CLE, longueur // 3 - 1)
+        chemin = self.chemin(couches[-1][0])
+        grille, largeur = self.dungeon, self.width
+        distances_portes = [k * longueur // (nb_cles + 1) for k in range(1, nb_cles + 1)]
+        for d in distances_portes:
+            for i in couches[d]:
+                grille[i] = MUR
+            grille[chemin[d]] = PORTE
+            self.portes.append(divmod(chemin[d], largeur))
+
+        # les couches fermées peuvent isoler des poches de la caverne : elles sont remplies de murs
+        segments = Segments(self.lignes(TABLE_NON_MUR), MOTIF_PRATICABLE)
+        ligne, colonne = divmod(chemin[0], largeur)
+        self.garder_composante(segments, segments.composante(colonne, ligne))
+
+        # la section k va de l'entrée (ou de la porte k) à la porte k + 1 : la clé k y est tirée au hasard
+        sections = Segments(self.lignes(TABLE_PRATICABLE), MOTIF_PRATICABLE)
+        debuts_sections = [chemin[0]] + [chemin[d + 1] for d in distances_portes[:-1]]
+        self.placement_cles(sections, [sections.composante(i % largeur, i // largeur) for i in debuts_sections])
+
+    def placement_cles(self, sections: Segments, representants: List[int]) -> None:
+        """
+        Place une clé dans chaque section, sur une case de sol tirée uniformément.
+
+        Args:
+            sections (Segments): Les segments de la grille, les portes étant fermées.
+            representants (List[int]): Le représentant de chaque section, dans l'ordre des clés.
+        """
+        grille, largeur = self.dungeon, self.width
+        find = sections.groupes.find
+
+        # pour chaque section : index de la première case de chacun de ses segments
+        # et nombre de cases de la section jusqu'à la fin du segment
+        debuts = {section: [] for section in representants}
+        cumuls = {section: [] for section in representants}
+        for y, (debuts_ligne, fins_ligne, premier) in enumerate(zip(sections.debuts, sections.fins, sections.premiers)):
+            for k, (debut, fin) in enumerate(zip(debuts_ligne, fins_ligne)):
+                section = find(premier + k)
+                if section in debuts:
+                    debuts[section].append(y * largeur + debut)
+                    cumuls[section].append((cumuls[section][-1] if cumuls[section] else 0) + fin - debut)
+
+        for numero, section in enumerate(representants):
+            total = cumuls[section][-1] if cumuls[section] else 0
+            # tirage par rejet : la section ne contient presque que du sol
+            for _ in range(total):
+                n = self.rng.randrange(total)
+                k = bisect_right(cumuls[section], n)
+                i = debuts[section][k] + n - (cumuls[section][k - 1] if k else 0)
+                if grille[i] == SOL:
+                    break
+            else:
+                # aucun tirage n'est tombé sur du sol : première case de sol des segments de la section
+                segments_section = zip(debuts[section], [0] + cumuls[section], cumuls[section])
+                i = next((i for debut, avant, apres in segments_section
+                          for i in range(debut, debut + apres - avant) if grille[i] == SOL), None)
+                if i is None:
+                    raise RuntimeError(f"La section {numero} n'a aucune case de sol où placer sa clé")
+
+            grille[i] = CLE
+            self.cles.append(divmod(i, largeur))
+
+    def generate_map(self, profiler: bool = False):
+        """
+        Génère une carte de cavernes : remplissage aléatoire, automate cellulaire, plus grande caverne,
+        entrée et sortie, portes et clés puis monstres.
+
+        Args:
+            profiler (bool, optional): Mesure chaque phase dans self.rapport. Par défaut False.
+        """
+        self.rapport = {} if profiler else None
+
+        etat = self.mesurer('remplissage', self.remplissage_aleatoire)
+        self.mesurer('automate', self.automate, etat)
+        self.mesurer('plus_grande_caverne', self.plus_grande_caverne)
+        couches = self.mesurer('in_out', self.in_out)
+        self.mesurer('placements_entitees', self.placements_entitees, couches)
+        self.mesurer('placements_monstres', self.placements_monstres)
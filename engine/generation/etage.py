@@ -0,0 +1,150 @@
+from random import Random
+from typing import List, Optional, Sequence, Tuple, Union
+
+from .floor_plan import ECHELLE, MARGE, FloorPlan, vers_jeu
+from .map_generation import StrategieGeneration, PORTE, SORTIE, ENTREE, MONSTRE, CLE, SOL
+from .solvabilite import verifier_plan
+from .strategies import creer_generateur
+
+
+# Codes qui ne gardent que la case du haut à gauche de leur carré une fois la carte agrandie
+MARQUEURS = (SORTIE, ENTREE, MONSTRE, CLE)
+
+# Table de traduction qui remplace les marqueurs par du sol (pour les trois autres cases du carré)
+TABLE_SANS_MARQUEURS = bytes(SOL if code in MARQUEURS else code for code in range(256))
+
+# Table de traduction qui remplace les monstres et les clés par du sol (ils deviennent des entités du jeu)
+TABLE_SANS_ENTITES = bytes(SOL if code in (MONSTRE, CLE) else code for code in range(256))
+
+# Nombre maximal d'étages générés par construire_etage(verifier=True) pour en obtenir un soluble
+ESSAIS_MAX = 10
+
+
+def generer_contour_noir(matrice: Sequence[Sequence[int]]) -> List[bytearray]:
+    """
+    Ajoute un contour noir autour de la matrice donnée puis double sa résolution.
+
+    Chaque case devient un carré de 2x2 cases. Pour les cases qui sont des entités ou des objets
+    (sortie, entrée, monstre, clé), seule la case du haut à gauche garde son code, les trois autres
+    deviennent du sol.
+
+    Le travail est fait ligne par ligne sur des octets : la marge est concaténée, les marqueurs sont
+    remplacés par translate et le doublement horizontal est une affectation de tranches à pas de 2.
+
+    Args:
+        matrice (Sequence[Sequence[int]]): La matrice renvoyée par GenerateurCarte.get_for_game
+                                           (des listes d'entiers ou des lignes d'octets).
+
+    Returns:
+        List[bytearray]: La matrice agrandie avec le contour noir, une ligne d'octets par rangée.
+    """
+    largeur = 2 * (len(matrice[0]) + 2 * MARGE)
+    marge = bytes(MARGE)
+
+    #  ajouter un cadre de 3 autour de la matrice pour éviter les sorties de la carte et rendre l'affichage des bords plus propre
+    square = [bytearray(largeur) for _ in range(2 * MARGE)]
+    for row in matrice:
+        ligne = marge + bytes(row) + marge
+        sans_marqueurs = ligne.translate(TABLE_SANS_MARQUEURS)
+
+        # ligne du haut : la case de gauche garde son code, celle de droite perd les marqueurs
+        haut = bytearray(largeur)
+        haut[0::2] = ligne
+        haut[1::2] = sans_marqueurs
+
+        # ligne du bas : les deux cases perdent les marqueurs
+        bas = bytearray(largeur)
+        bas[0::2] = sans_marqueurs
+        bas[1::2] = sans_marqueurs
+
+        square.append(haut)
+        square.append(bas)
+    square.extend(bytearray(largeur) for _ in range(2 * MARGE))
+
+    return square
+
+
+def convertir_carte(dg: StrategieGeneration) -> FloorPlan:
+    """
+    Convertit la carte d'un générateur en plan d'étage pour le jeu : contour, mise à l'échelle et placements.
+
+    Les positions viennent de ce que le générateur a placé (salles, couloirs, portes, clés, monstres, entrée
+    et sortie) : la matrice n'est jamais parcourue case par case. Un placement n'est gardé que si sa case
+    porte toujours le bon code (une clé peut par exemple recouvrir la sortie). Les monstres et les clés
+    sont retirés de la grille avant l'agrandissement.
+
+    Args:
+        dg (StrategieGeneration): Le générateur, après generate_map.
+
+    Returns:
+        FloorPlan: Le plan de l'étage.
+    """
+    grille, largeur = dg.dungeon, dg.width
+
+    def placees(cases, code):
+        # cases (ligne, colonne) qui portent toujours le code, sans doublon, dans l'ordre de lecture
+        return sorted(case for case in set(cases) if grille[case[0] * largeur + case[1]] == code)
+
+    # chaque porte occupe les quatre cases de son carré, et chaque case est une porte du jeu
+    portes = []
+    for ligne, colonne in placees(dg.portes, PORTE):
+        x, y = vers_jeu(ligne, colonne)
+        portes.extend((x + dx, y + dy) for dy in range(ECHELLE) for dx in range(ECHELLE))
+    portes.sort(key=lambda case: (case[1], case[0]))
+
+    sans_entites = grille.translate(TABLE_SANS_ENTITES)
+    entree, sortie = dg.liste_SE # (0, 0) quand il n'y a pas d'entrée ni de sortie, c'est un mur
+    return FloorPlan(
+        matrice=generer_contour_noir([sans_entites[r * largeur:(r + 1) * largeur] for r in range(dg.height)]),
+        salles=[(*vers_jeu(salle.row, salle.col), ECHELLE * salle.width, ECHELLE * salle.height) for salle in dg.rooms],
+        couloirs=[[vers_jeu(*case) for case in couloir] for _, _, couloir in dg.graphe.corridors()],
+        portes=portes,
+        cles=[vers_jeu(*case) for case in placees(dg.cles, CLE)],
+        monstres=[vers_jeu(i // largeur, i % largeur) for i in dg.monstres if grille[i] == MONSTRE],
+        entree=vers_jeu(*entree) if grille[entree[0] * largeur + entree[1]] == ENTREE else None,
+        sortie=vers_jeu(*sortie) if grille[sortie[0] * largeur + sortie[1]] == SORTIE else None,
+    )
+
+
+def construire_etage(taille: int, coef_difficulte: int, seed: Optional[Union[int, str, Random]] = None, afficher: bool = False,
+                     profiler: bool = False, verifier: bool = False, strategie: str = 'bsp') -> Union[FloorPlan, Tuple[FloorPlan, dict]]:
+    """
+    Génère un étage complet : la carte, son contour, sa mise à l'échelle et la liste des placements.
+
+    Le plan ne contient que des types simples (listes, tuples, octets) : il peut être sauvegardé,
+    mis en cache ou transmis à un autre processus.
+
+    Args:
+        taille (int): La largeur et la hauteur de la carte, en cases.
+        coef_difficulte (int): Le coefficient de difficulté de la carte (l'étage).
+        seed (int | str | Random, optional): La graine de la carte. Par défaut None.
+        afficher (bool, optional): Affiche la carte générée dans la console. Par défaut False.
+        profiler (bool, optional): Mesure chaque phase de la génération, mise à l'échelle comprise.
+                                   Par défaut False.
+        verifier (bool, optional): Vérifie que l'étage peut être terminé et, sinon, en génère un autre
+                                   (au plus ESSAIS_MAX fois). Les graines des essais suivants sont dérivées
+                                   de seed : le résultat reste reproductible. Par défaut False.
+        strategie (str, optional): La stratégie de génération, clé de STRATEGIES. Par défaut 'bsp'
+                                   (salles et couloirs).
+
+    Returns:
+        FloorPlan | Tuple[FloorPlan, dict]: Le plan de l'étage, suivi du rapport de mesure si profiler est vrai.
+    """
+    for essai in range(ESSAIS_MAX if verifier else 1):
+        graine = seed if essai == 0 or seed is None or isinstance(seed, Random) else f"{seed}#{essai}"
+        dg = creer_generateur(strategie, taille, coef_difficulte, seed=graine)
+        dg.generate_map(profiler=profiler)
+        if afficher:
+            dg.print_map()
+
+        plan = dg.mesurer('mise_a_l_echelle', convertir_carte, dg)
+        if not verifier:
+            break
+        rapport = dg.mesurer('verification', verifier_plan, plan)
+        if rapport.soluble:
+            break
+        print(f"Étage {coef_difficulte} ({taille}x{taille}) insoluble, essai {essai + 1} : {rapport}")
+
+    if profiler:
+        return plan, dg.rapport
+    return plan
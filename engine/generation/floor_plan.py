@@ -0,0 +1,83 @@
+from typing import List, Optional, Tuple
+
+
+# Largeur du contour noir ajouté autour de la carte, en cases (avant agrandissement)
+MARGE = 3
+
+# Facteur d'agrandissement de la carte pour le jeu : chaque case devient un carré de 2x2 cases
+ECHELLE = 2
+
+
+def vers_jeu(ligne: int, colonne: int) -> Tuple[int, int]:
+    """
+    Convertit une case de la grille du générateur en position dans la matrice du jeu
+    (après l'ajout du contour et l'agrandissement).
+
+    Args:
+        ligne (int): La ligne de la case dans la grille du générateur.
+        colonne (int): La colonne de la case dans la grille du générateur.
+
+    Returns:
+        Tuple[int, int]: La position (x, y) de la case du haut à gauche du carré correspondant.
+    """
+    return ECHELLE * (colonne + MARGE), ECHELLE * (ligne + MARGE)
+
+
+class FloorPlan:
+    """Plan d'un étage généré, prêt pour le jeu.
+
+    Toutes les positions sont des tuples (x, y) dans la matrice du jeu (après l'ajout du contour
+    et l'agrandissement) : le jeu crée ses entités directement à partir du plan, sans parcourir la matrice.
+    """
+
+    __slots__ = ['matrice', 'salles', 'couloirs', 'portes', 'cles', 'monstres', 'entree', 'sortie']
+
+    def __init__(self, matrice: List[bytearray], salles: Optional[list] = None, couloirs: Optional[list] = None,
+                 portes: Optional[list] = None, cles: Optional[list] = None, monstres: Optional[list] = None,
+                 entree: Optional[Tuple[int, int]] = None, sortie: Optional[Tuple[int, int]] = None) -> None:
+        """
+        Initialise le plan d'un étage.
+
+        Args:
+            matrice (List[bytearray]): La matrice du jeu, une ligne d'octets par rangée. Les monstres
+                                       et les clés n'y figurent pas (ce sont des entités du jeu).
+            salles (list, optional): Les rectangles (x, y, largeur, hauteur) des salles.
+            couloirs (list, optional): Les couloirs, chacun étant la liste des positions de ses cases.
+            portes (list, optional): Les cases des portes (quatre par porte), dans l'ordre de lecture.
+            cles (list, optional): Les positions des clés.
+            monstres (list, optional): Les positions d'apparition des monstres.
+            entree (Tuple[int, int], optional): La position de l'entrée, None si elle est absente.
+            sortie (Tuple[int, int], optional): La position de la sortie, None si elle est absente.
+        """
+        self.matrice = matrice
+        self.salles = salles if salles is not None else []
+        self.couloirs = couloirs if couloirs is not None else []
+        self.portes = portes if portes is not None else []
+        self.cles = cles if cles is not None else []
+        self.monstres = monstres if monstres is not None else []
+        self.entree = entree
+        self.sortie = sortie
+
+    @property
+    def taille(self) -> Tuple[int, int]:
+        """
+        Renvoie la taille de la matrice du jeu.
+
+        Returns:
+            Tuple[int, int]: La largeur et la hauteur de la matrice.
+        """
+        return (len(self.matrice[0]) if self.matrice else 0), len(self.matrice)
+
+    def __eq__(self, other) -> bool:
+        """
+        Compare deux plans d'étage.
+
+        Args:
+            other (FloorPlan): L'autre plan.
+
+        Returns:
+            bool: True si les deux plans sont identiques, False sinon.
+        """
+        if not isinstance(other, FloorPlan):
+            return NotImplemented
+        return all(getattr(self, attribut) == getattr(other, attribut) for attribut in self.__slots__)
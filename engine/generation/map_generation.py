@@ -1,6 +1,37 @@
 # This code is released into the Public Domain.
-from math import sqrt
-from random import random, randrange, choice, randint
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from itertools import compress
+from math import log, sqrt
+from random import Random
+import sys
+from time import perf_counter
+from typing import Callable, Optional, Union
+
+from .room_graph import RoomGraph
+from .union_find import UnionFind
+
+# Version de l'algorithme de génération, à incrémenter dès qu'une même graine ne donne plus la même carte
+# (elle fait partie de la clé du cache des étages)
+VERSION_GENERATEUR = 2
+
+# Algorithmes disponibles pour relier les salles entre elles
+CONNECTEURS = ('kruskal', 'glouton')
+
+# Phases de generate_map, dans l'ordre d'exécution (separations est appelée par placements_entitees)
+PHASES = ('random_split', 'carve_rooms', 'connect_rooms', 'in_out', 'placements_entitees', 'separations', 'placements_monstres')
+
+# Codes des cases de la grille, identiques à ceux renvoyés par get_for_game
+MUR, SOL, PORTE, SORTIE, ENTREE, PASSAGE, MONSTRE, CLE = range(8)
+
+# Caractère affiché pour chaque code (l'index correspond au code)
+CARACTERES = ('#', '.', '+', 'E', 'S', '-', 'M', 'C')
+
+# Table de traduction code -> caractère ASCII, pour afficher la grille en un seul appel
+TABLE_CARACTERES = bytes(ord(CARACTERES[i]) if i < len(CARACTERES) else ord('?') for i in range(256))
+
+# Table de traduction qui donne le masque du sol (1 pour le sol, 0 pour le reste)
+TABLE_MASQUE_SOL = bytes(int(i == SOL) for i in range(256))
 
 class CaseCarte:  
     """Classe représentant une case de la carte du donjon."""
@@ -45,7 +76,7 @@ class CaseCarte:
         Retourne :
         - L'index correspondant au caractère actuel dans la liste des caractères possibles.
         """
-        return ('#', '.', '+', 'E', 'S', '-', 'M', 'C').index(self.get_ch())
+        return CARACTERES.index(self.get_ch())
 
 class PieceCarte:
     """Classe représentant une salle du donjon."""
@@ -70,47 +101,229 @@ class PieceCarte:
         self.height = h
         self.width = w
 
-class GenerateurCarte:
-    """Classe pour générer une carte de donjon."""
+class StrategieGeneration(ABC):
+    """Base commune des algorithmes de génération de carte.
+
+    Une stratégie remplit self.dungeon avec les codes du jeu (MUR, SOL, PORTE, SORTIE, ENTREE, PASSAGE,
+    MONSTRE, CLE) et note ce qu'elle place : l'entrée et la sortie (liste_SE), les portes et les clés
+    (cases (ligne, colonne)), les monstres (index dans la grille), les salles (rooms) et les couloirs (graphe).
+    C'est tout ce dont convertir_carte a besoin pour construire le plan de l'étage.
+    """
 
-    __slots__ = ['MAX', 'width', 'height', 'leaves', 'dungeon', 'rooms', 'NB_CLE', 'COEF_DIFFICULTE', 'liste_SE']
+    __slots__ = ['width', 'height', 'dungeon', 'rooms', 'NB_CLE', 'COEF_DIFFICULTE', 'liste_SE', 'graphe', 'rng', 'rapport', 'densite_monstres', 'portes', 'cles', 'monstres']
 
-    def __init__(self, w: int, h: int, nb_cle:int=6, coef_difficulte:int=1):
+    # Nom de la stratégie dans STRATEGIES et phases de generate_map, dans l'ordre d'exécution
+    NOM = None
+    PHASES = ()
+
+    def __init__(self, w: int, h: int, nb_cle:int=6, coef_difficulte:int=1, seed:Optional[Union[int, str, Random]]=None,
+                 densite_monstres:Optional[Callable[['StrategieGeneration', int, int], float]]=None):
             """
-            Initialise un objet de la classe MapGeneration.
+            Initialise la grille (pleine de murs) et le générateur aléatoire.
 
             Paramètres:
                 - w (int): La largeur de la carte.
                 - h (int): La hauteur de la carte.
                 - nb_cle (int): Le nombre de clés à placer sur la carte.
                 - coef_difficulte (int): Le coefficient de difficulté de la carte.
+                - seed (int | str | Random, optional): La graine du générateur aléatoire, ou directement une instance
+                  de random.Random. Par défaut None (carte différente à chaque fois).
+                - densite_monstres (callable, optional): Fonction (generateur, ligne, colonne) -> facteur entre 0 et 1
+                  appliqué à la probabilité de placer un monstre sur une case. Par défaut None (densité uniforme).
 
             Returns:
                 None
             """
-            
-            self.MAX = 15 # Cutoff for when we want to stop dividing sections
             self.width = int(w)
             self.height = int(h)
-            self.leaves = []
-            self.dungeon = [] # la grille
+            self.dungeon = bytearray(self.width * self.height) # la grille, une case par octet (MUR par défaut), ligne par ligne
             self.rooms = []
+            self.portes = [] # cases (ligne, colonne) où une porte a été placée
+            self.cles = [] # cases (ligne, colonne) où une clé a été placée
+            self.monstres = [] # index dans la grille des cases où un monstre a été placé
+            self.liste_SE = [(0, 0), (0, 0)] # entrée et sortie, (0, 0) tant qu'elles ne sont pas placées
+            self.graphe = RoomGraph() # les salles reliées par les couloirs
+            self.rng = seed if isinstance(seed, Random) else Random(seed) # tous les tirages passent par ce générateur
             self.NB_CLE = nb_cle
+            self.rapport = None # mesures de chaque phase, remplies par generate_map(profiler=True)
+            self.densite_monstres = densite_monstres
 
             self.COEF_DIFFICULTE = coef_difficulte
             self.NB_CLE = max(self.COEF_DIFFICULTE, int(self.width / 30))
 
+    def case(self, row: int, col: int) -> int:
+        """
+        Renvoie le code de la case aux coordonnées données.
+
+        Args:
+            row (int): La ligne de la case.
+            col (int): La colonne de la case.
+
+        Returns:
+            int: Le code de la case (MUR, SOL, PORTE, ...).
+        """
+        return self.dungeon[row * self.width + col]
+
+    def set_case(self, row: int, col: int, code: int) -> None:
+        """
+        Modifie le code de la case aux coordonnées données.
+
+        Args:
+            row (int): La ligne de la case.
+            col (int): La colonne de la case.
+            code (int): Le nouveau code de la case.
+        """
+        self.dungeon[row * self.width + col] = code
+
+    @abstractmethod
+    def generate_map(self, profiler: bool = False):
+        """
+        Génère la carte. À définir par chaque stratégie, qui doit passer chacune de ses phases par self.mesurer.
+
+        Args:
+            profiler (bool, optional): Mesure chaque phase dans self.rapport. Par défaut False.
+        """
+
+    def placements_monstres(self):
+        """
+        Place des monstres aléatoirement dans le donjon.
+
+        Chaque case de sol reçoit un monstre avec une probabilité de (COEF_DIFFICULTE + 1) / 101, multipliée
+        par self.densite_monstres si elle est définie.
+
+        Au lieu d'un tirage par case, le masque du sol est construit en une fois (translate puis compress)
+        et l'écart jusqu'au prochain monstre est tiré directement, selon une loi géométrique : il n'y a
+        qu'un tirage par monstre placé. La densité est appliquée par amincissement : chaque case tirée
+        garde son monstre avec une probabilité égale à la densité de la case.
+        """
+        dungeon = self.dungeon
+        sols = list(compress(range(len(dungeon)), dungeon.translate(TABLE_MASQUE_SOL)))
+
+        proba = (self.COEF_DIFFICULTE + 1) / 101
+        if proba <= 0 or not sols:
+            return
+
+        rng = self.rng
+        densite = self.densite_monstres
+        log_echec = log(1 - proba) if proba < 1 else None
+        k = -1
+        while True:
+            # nombre de cases de sol sautées avant le prochain monstre
+            k += 1 if log_echec is None else 1 + int(log(1.0 - rng.random()) / log_echec)
+            if k >= len(sols):
+                break
+
+            i = sols[k]
+            if densite is None or rng.random() < densite(self, i // self.width, i % self.width):
+                dungeon[i] = MONSTRE
+                self.monstres.append(i)
+
+    def mesurer(self, phase: str, fonction, *args):
+        """
+        Exécute une phase de la génération en mesurant sa durée et la variation du nombre de blocs
+        mémoire alloués par Python, si le rapport est activé. Sinon, appelle simplement la fonction.
+
+        Les mesures d'une phase incluent celles des phases qu'elle appelle (separations pour placements_entitees).
+
+        Args:
+            phase (str): Le nom de la phase, clé de self.rapport.
+            fonction (callable): La phase à exécuter.
+            *args: Les arguments de la phase.
+
+        Returns:
+            Le résultat de la fonction.
+        """
+        if self.rapport is None:
+            return fonction(*args)
+
+        # la phase est ajoutée avant d'être exécutée pour que le rapport garde l'ordre d'appel
+        mesure = self.rapport[phase] = {'temps': 0.0, 'blocs': 0}
+        blocs = sys.getallocatedblocks()
+        debut = perf_counter()
+        resultat = fonction(*args)
+        mesure['temps'] = perf_counter() - debut
+        mesure['blocs'] = sys.getallocatedblocks() - blocs
+        return resultat
+
+    def print_map(self):
+            """
+            Affiche la carte du donjon.
+            
+            Traduit la grille en caractères en un seul appel puis affiche chaque ligne.
+            """
+            texte = self.dungeon.translate(TABLE_CARACTERES).decode("ascii")
+            for r in range(self.height):
+                print(texte[r * self.width:(r + 1) * self.width])
+
+    def get_for_game(self, brut: bool = False):
+        """Retourne le dongeon sous la forme d'une matrice. Les codes de la grille sont déjà ceux du jeu.
+            
+            # -> 0 : mur
+            . -> 1 : sol
+            + -> 2 : porte
+            E -> 3 : sortie (end)
+            S -> 4 : entrée (start)
+            - -> 5 : passage
+            M -> 6 : monstre
+            C -> 7 : clef
+
+        Args:
+            brut (bool, optional): Si True, renvoie directement la grille (bytearray, ligne par ligne,
+                                   de taille width * height) sans la copier. Par défaut False.
+        
+        Returns:
+            List[List[int]] | bytearray: le dongeon sous forme de matrice, ou la grille brute
+        """
+        if brut:
+            return self.dungeon
+
+        largeur = self.width
+        return [list(self.dungeon[r * largeur:(r + 1) * largeur]) for r in range(self.height)]
+
+class GenerateurCarte(StrategieGeneration):
+    """Classe pour générer une carte de donjon : découpage en feuilles (BSP), salles et couloirs."""
 
-            for h in range(self.height):
-                row = []
-                for w in range(self.width):
-                    row.append(CaseCarte('#'))
+    __slots__ = ['MAX', 'leaves', 'connecteur']
+
+    NOM = 'bsp'
+    PHASES = PHASES
+
+    def __init__(self, w: int, h: int, nb_cle:int=6, coef_difficulte:int=1, connecteur:str='kruskal', seed:Optional[Union[int, str, Random]]=None,
+                 densite_monstres:Optional[Callable[['StrategieGeneration', int, int], float]]=None):
+            """
+            Initialise un objet de la classe MapGeneration.
+
+            Paramètres:
+                - w (int): La largeur de la carte.
+                - h (int): La hauteur de la carte.
+                - nb_cle (int): Le nombre de clés à placer sur la carte.
+                - coef_difficulte (int): Le coefficient de difficulté de la carte.
+                - connecteur (str): L'algorithme utilisé pour relier les salles, 'kruskal' (arbre couvrant minimal
+                  sur les salles voisines, au plus 4R paires) ou 'glouton' (recherche du groupe le plus proche à chaque fusion, en O(R²) ou plus).
+                - seed (int | str | Random, optional): La graine du générateur aléatoire, ou directement une instance
+                  de random.Random. Une même graine, avec la même taille et la même difficulté, donne toujours la même
+                  carte. Par défaut None (carte différente à chaque fois).
+                - densite_monstres (callable, optional): Fonction (generateur, ligne, colonne) -> facteur entre 0 et 1
+                  appliqué à la probabilité de placer un monstre sur une case, par exemple densite_eloignement_entree.
+                  Par défaut None (densité uniforme).
+
+            Returns:
+                None
+            """
+            
+            if connecteur not in CONNECTEURS:
+                raise ValueError(f"Connecteur inconnu : {connecteur} (attendu : {', '.join(CONNECTEURS)})")
 
-                self.dungeon.append(row)
+            super().__init__(w, h, nb_cle, coef_difficulte, seed, densite_monstres)
+            self.MAX = 15 # Cutoff for when we want to stop dividing sections
+            self.leaves = []
+            self.connecteur = connecteur
 
     def random_split(self, min_row, min_col, max_row, max_col):
             """
             Effectue une division aléatoire de la section donnée en utilisant les coordonnées minimales et maximales spécifiées.
+
+            Les feuilles obtenues sont ajoutées à self.leaves, dans l'ordre de iter_leaves.
             
             Args:
                 min_row (int): La coordonnée minimale de la ligne.
@@ -118,22 +331,53 @@ class GenerateurCarte:
                 max_row (int): La coordonnée maximale de la ligne.
                 max_col (int): La coordonnée maximale de la colonne.
             """
-            
-            # We want to keep splitting until the sections get down to the threshold
-            seg_height = max_row - min_row
-            seg_width = max_col - min_col        # j'indique la largeur et la hauteur de ma première feuille
-
-            if seg_height < self.MAX and seg_width < self.MAX: # les salles seront de largeur et hauteur <= 14 : la limite MAX
-                self.leaves.append((min_row, min_col, max_row, max_col)) 
-            elif seg_height < self.MAX and seg_width >= self.MAX:       # Si c'est plus grand en largeur que le MAX, alors je coupe verticalement
-                self.split_on_vertical(min_row, min_col, max_row, max_col)
-            elif seg_height >= self.MAX and seg_width < self.MAX:          #Si c'est plus grand en hauteur que le MAX, alors je coupe horizontalement
-                self.split_on_horizontal(min_row, min_col, max_row, max_col)
-            else:                                               #Sinon, puisqu'on une hauteur et une largeur plus grandes que le MAX, alors on coupe verticalement ou horizontalement
-                    if random() < 0.5:
-                        self.split_on_horizontal(min_row, min_col, max_row, max_col)
-                    else:
-                        self.split_on_vertical(min_row, min_col, max_row, max_col)
+            self.leaves.extend(self.iter_leaves(min_row, min_col, max_row, max_col))
+
+    def iter_leaves(self, min_row, min_col, max_row, max_col):
+            """
+            Découpe la section donnée en feuilles et les renvoie au fur et à mesure qu'elles sont trouvées.
+
+            Le découpage utilise une pile explicite au lieu de la récursion : la profondeur de la pile Python
+            ne dépend plus de la taille de la carte. Les sections sont traitées en profondeur d'abord, la première
+            moitié avant la seconde, ce qui donne les mêmes feuilles et les mêmes tirages aléatoires que le
+            découpage récursif.
+
+            Les tirages du découpage et ceux du consommateur se suivent dans le même générateur aléatoire :
+            consommer les feuilles au fil de l'eau (par exemple avec carve_rooms) donne une autre carte,
+            tout aussi reproductible, que les découper toutes d'abord.
+
+            Args:
+                min_row (int): La coordonnée minimale de la ligne.
+                min_col (int): La coordonnée minimale de la colonne.
+                max_row (int): La coordonnée maximale de la ligne.
+                max_col (int): La coordonnée maximale de la colonne.
+
+            Returns:
+                generator: Les feuilles (min_row, min_col, max_row, max_col).
+            """
+            pile = [(min_row, min_col, max_row, max_col)]
+            while pile:
+                section = pile.pop()
+
+                # We want to keep splitting until the sections get down to the threshold
+                seg_height = section[2] - section[0]
+                seg_width = section[3] - section[1]        # j'indique la largeur et la hauteur de ma feuille
+
+                if seg_height < self.MAX and seg_width < self.MAX: # les salles seront de largeur et hauteur <= 14 : la limite MAX
+                    yield section
+                    continue
+                elif seg_height < self.MAX and seg_width >= self.MAX:       # Si c'est plus grand en largeur que le MAX, alors je coupe verticalement
+                    premiere, seconde = self.split_on_vertical(*section)
+                elif seg_height >= self.MAX and seg_width < self.MAX:          #Si c'est plus grand en hauteur que le MAX, alors je coupe horizontalement
+                    premiere, seconde = self.split_on_horizontal(*section)
+                elif self.rng.random() < 0.5: #Sinon, puisqu'on une hauteur et une largeur plus grandes que le MAX, alors on coupe verticalement ou horizontalement
+                    premiere, seconde = self.split_on_horizontal(*section)
+                else:
+                    premiere, seconde = self.split_on_vertical(*section)
+
+                # la première moitié est empilée en dernier pour être découpée en premier
+                pile.append(seconde)
+                pile.append(premiere)
 
     def split_on_horizontal(self, min_row, min_col, max_row, max_col):
         """
@@ -144,11 +388,13 @@ class GenerateurCarte:
             min_col (int): La limite inférieure de la colonne.
             max_row (int): La limite supérieure de la ligne.
             max_col (int): La limite supérieure de la colonne.
+
+        Returns:
+            tuple: Les deux sections (min_row, min_col, max_row, max_col), celle du haut puis celle du bas.
         """
         
-        split = (min_row + max_row) // 2 + choice((-2, -1, 0, 1, 2))   # on prend la moyenne entre les limites min_row et max_row auquel on ajoute une valeur de bruit
-        self.random_split(min_row, min_col, split, max_col) # Je coupe dans le premier espace : entre le min et la limite split
-        self.random_split(split + 1, min_col, max_row, max_col)  # Je coupe dans le second espace : entre la limite split et et le max
+        split = (min_row + max_row) // 2 + self.rng.choice((-2, -1, 0, 1, 2))   # on prend la moyenne entre les limites min_row et max_row auquel on ajoute une valeur de bruit
+        return (min_row, min_col, split, max_col), (split + 1, min_col, max_row, max_col) # le premier espace : entre le min et la limite split, le second : entre la limite split et le max
 
     def split_on_vertical(self, min_row, min_col, max_row, max_col):  
         """
@@ -159,12 +405,14 @@ class GenerateurCarte:
             min_col (int): La limite inférieure de la colonne.
             max_row (int): La limite supérieure de la rangée.
             max_col (int): La limite supérieure de la colonne.
+
+        Returns:
+            tuple: Les deux sections (min_row, min_col, max_row, max_col), celle de gauche puis celle de droite.
         """
-        split = (min_col + max_col) // 2 + choice((-2, -1, 0, 1, 2)) # on prend la moyenne entre les limites min_col et max_col auquel on ajoute une valeur de bruit
-        self.random_split(min_row, min_col, max_row, split)
-        self.random_split(min_row, split + 1, max_row, max_col)
+        split = (min_col + max_col) // 2 + self.rng.choice((-2, -1, 0, 1, 2)) # on prend la moyenne entre les limites min_col et max_col auquel on ajoute une valeur de bruit
+        return (min_row, min_col, max_row, split), (min_row, split + 1, max_row, max_col)
 
-    def carve_rooms(self):
+    def carve_rooms(self, feuilles=None):
             """
             Creuse des salles dans le donjon en utilisant les feuilles générées précédemment.
 
@@ -176,36 +424,41 @@ class GenerateurCarte:
 
             Note: Cette méthode modifie directement la matrice du donjon et ajoute les salles à la liste des salles.
 
+            Args:
+                feuilles (iterable, optional): Les feuilles à creuser, par exemple le générateur renvoyé par
+                                               iter_leaves pour ne jamais les garder toutes en mémoire.
+                                               Par défaut self.leaves.
             """
             
-            for leaf in self.leaves:
+            for leaf in self.leaves if feuilles is None else feuilles:
                 # We don't want to fill in every possible room or the 
                 # dungeon looks too uniform
-                if random() > 0.80: continue
+                if self.rng.random() > 0.80: continue
                 section_width = leaf[3] - leaf[1]
                 section_height = leaf[2] - leaf[0]
 
                 # The actual room's height and width will be 60-100% of the 
                 # available section. 
-                room_width = round(randrange(60, 100) / 100 * section_width)
-                room_height = round(randrange(60, 100) / 100 * section_height)
+                room_width = round(self.rng.randrange(60, 100) / 100 * section_width)
+                room_height = round(self.rng.randrange(60, 100) / 100 * section_height)
 
                 # If the room doesn't occupy the entire section we are carving it from,
                 # 'jiggle' it a bit in the square
                 if section_height > room_height:
-                    room_start_row = leaf[0] + randrange(section_height - room_height)
+                    room_start_row = leaf[0] + self.rng.randrange(section_height - room_height)
                 else:
                     room_start_row = leaf[0]
 
                 if section_width > room_width:
-                    room_start_col = leaf[1] + randrange(section_width - room_width)
+                    room_start_col = leaf[1] + self.rng.randrange(section_width - room_width)
                 else:
                     room_start_col = leaf[1]
         
                 self.rooms.append(PieceCarte(room_start_row, room_start_col, room_height, room_width))
+                ligne_sol = bytes((SOL,)) * room_width
                 for r in range(room_start_row, room_start_row + room_height):
-                    for c in range(room_start_col, room_start_col + room_width):
-                        self.dungeon[r][c] = CaseCarte('.')
+                    debut = r * self.width + room_start_col
+                    self.dungeon[debut:debut + room_width] = ligne_sol
 
     def are_rooms_adjacent(self, room1, room2): # room1 et room2 sont des objets PieceCarte
             """
@@ -232,6 +485,23 @@ class GenerateurCarte:
 
             return (adj_rows, adj_cols)
 
+    def overlap_rooms(self, room1, room2):
+            """
+            Calcule les lignes et les colonnes communes à deux salles à partir de leurs bornes.
+
+            Même résultat que are_rooms_adjacent, mais sans parcourir les cases une à une.
+
+            Args:
+                room1 (PieceCarte): La première pièce.
+                room2 (PieceCarte): La deuxième pièce.
+
+            Returns:
+                tuple: Un tuple (lignes, colonnes) de deux range, vides si les salles ne se recouvrent pas.
+            """
+            rows = range(max(room1.row, room2.row), min(room1.row + room1.height, room2.row + room2.height))
+            cols = range(max(room1.col, room2.col), min(room1.col + room1.width, room2.col + room2.width))
+            return (rows, cols)
+
     def distance_between_rooms(self, room1, room2):
         """
         Calcule la distance entre deux salles.
@@ -248,7 +518,7 @@ class GenerateurCarte:
 
         return sqrt((centre1[0] - centre2[0]) ** 2 + (centre1[1] - centre2[1]) ** 2) # distance entre les centres
     
-    def carve_corridor_between_rooms(self, room1, room2, connections, dico_relation):
+    def carve_corridor_between_rooms(self, room1, room2, connections):
             """
             Crée un couloir entre deux salles dans la carte du donjon.
 
@@ -257,7 +527,6 @@ class GenerateurCarte:
                 room2 (tuple): La deuxième salle, représentée par un tuple contenant la salle elle-même, 
                                les lignes ou colonnes disponibles pour le couloir et le type de couloir ('rows' ou 'cols').
                 connections (dict): Un dictionnaire contenant les salles reliées entre elles.
-                dico_relation (dict): Un dictionnaire contenant les relations entre les salles.
 
             Returns:
                 None
@@ -266,104 +535,39 @@ class GenerateurCarte:
             # Je constitue mon dictionnaire connections, des salles reliées entre elles
             clef = self.centre(room1)
             value = self.centre(room2[0])
-            
+            connections.setdefault(clef, []).append(value)
 
             if room2[2] == 'rows':
-                row = choice(room2[1]) # je choisie une ligne parmi les lignes de room2
+                row = self.rng.choice(room2[1]) # je choisie une ligne parmi les lignes de room2
                 # Figure out which room is to the left of the other
                 if room1.col + room1.width < room2[0].col:
                     start_col = room1.col + room1.width
                     end_col = room2[0].col
-                    
-                    
-                    if clef not in connections.keys():
-                    
-                        connections[clef]= []
-                        connections[clef].append(value)
-                        dico_relation[clef]= []
-                        dico_relation[clef].append(value)
-                    else:
-                        connections[clef].append(value)
-                        dico_relation[clef].append(value)
-
-                
-                
-                
-                
                 else:
                     start_col = room2[0].col + room2[0].width
                     end_col = room1.col
-                    
-                    
-                    
-                    if clef not in connections.keys():
-                    
-                        connections[clef]= []
-                        connections[clef].append(value)
-                        dico_relation[clef]= []
-                        dico_relation[clef].append(value)
-                    else:
-                        connections[clef].append(value)    
-                        dico_relation[clef].append(value)    
-
-               
-               
-               
-                liste_passage = []               
-                for c in range(start_col, end_col):
-                    self.dungeon[row][c] = CaseCarte('-')
-                    liste_passage.append((row,c))
-                dico_relation[clef].append(liste_passage)    
-
-
-
-
-                    
-
 
+                liste_passage = [(row, c) for c in range(start_col, end_col)]
+                if end_col > start_col:
+                    debut = row * self.width
+                    self.dungeon[debut + start_col:debut + end_col] = bytes((PASSAGE,)) * (end_col - start_col)
 
             else:  # Il se passe la même chose qu'au-dessus, sauf qu'ici on s'intéresse aux lignes
-                col = choice(room2[1]) # Je choisie une colonne parmi les colonnes de room2
+                col = self.rng.choice(room2[1]) # Je choisie une colonne parmi les colonnes de room2
                 # Figure out which room is above the other
                 if room1.row + room1.height < room2[0].row:
                     start_row = room1.row + room1.height
                     end_row = room2[0].row
-
-
-                    if clef not in connections.keys():
-                    
-                        connections[clef]= []
-                        connections[clef].append(value)
-                        dico_relation[clef]= []
-                        dico_relation[clef].append(value)
-                    else:
-                        connections[clef].append(value) 
-                        dico_relation[clef].append(value) 
-
-
-
-
                 else:
                     start_row = room2[0].row + room2[0].height
                     end_row = room1.row
 
-                    if clef not in connections.keys():
-                    
-                        connections[clef]= []
-                        connections[clef].append(value)
-                        dico_relation[clef]= []
-                        dico_relation[clef].append(value) 
-                    else:
-                        connections[clef].append(value) 
-                        dico_relation[clef].append(value) 
-
-
+                liste_passage = [(r, col) for r in range(start_row, end_row)]
+                if end_row > start_row:
+                    # une colonne de la grille est une tranche de pas self.width
+                    self.dungeon[start_row * self.width + col:end_row * self.width + col:self.width] = bytes((PASSAGE,)) * (end_row - start_row)
 
-                liste_passage = []
-                for r in range(start_row, end_row):
-                    self.dungeon[r][col] = CaseCarte('-')
-                    liste_passage.append((r,col))
-                dico_relation[clef].append(liste_passage)
+            self.graphe.connect(clef, value, liste_passage)
     
     def centre(self, room1):
         """
@@ -377,7 +581,7 @@ class GenerateurCarte:
         """
         return (room1.row + room1.height // 2, room1.col + room1.width // 2)
     
-    def find_closest_unconnect_groups(self, groups, room_dict, connections, dico_relation):
+    def find_closest_unconnect_groups(self, groups, room_dict, connections):
         """
         Trouve les groupes de salles les plus proches non connectés et crée un corridor entre eux.
 
@@ -385,7 +589,6 @@ class GenerateurCarte:
             groups (list): Une liste de groupes de salles.
             room_dict (dict): Un dictionnaire contenant les informations sur les salles.
             connections (list): Une liste de connexions entre les salles.
-            dico_relation (dict): Un dictionnaire contenant les relations entre les salles.
 
         Returns:
             None
@@ -404,7 +607,7 @@ class GenerateurCarte:
                         start = room
                         nearest = other
                         start_group = group
-        self.carve_corridor_between_rooms(start, nearest, connections, dico_relation)
+        self.carve_corridor_between_rooms(start, nearest, connections)
 
         # Fusionner les groupes
         other_group = None
@@ -418,7 +621,20 @@ class GenerateurCarte:
         
     def connect_rooms(self):
             """
-            Connecte les salles entre elles en créant des connexions entre les salles adjacentes.
+            Connecte les salles entre elles en créant des connexions entre les salles adjacentes,
+            avec l'algorithme choisi à la création du générateur.
+            """
+            if self.connecteur == 'kruskal':
+                self.connect_rooms_kruskal()
+            else:
+                self.connect_rooms_glouton()
+
+    def connect_rooms_glouton(self):
+            """
+            Relie les salles en fusionnant à chaque étape les deux groupes les plus proches.
+
+            Returns:
+                dict: Les connexions créées (salle -> salles reliées).
             """
 
             groups = []
@@ -439,203 +655,161 @@ class GenerateurCarte:
                 groups.append([room]) #On ajoute dans le tableau groups les salles qui sont adjacentes à d'autres
                 
             connections = dict()
-            dico_relation = dict()
             while len(groups) > 1:
-                self.find_closest_unconnect_groups(groups, room_dict, connections, dico_relation)
-            self.in_out(connections, dico_relation)
+                self.find_closest_unconnect_groups(groups, room_dict, connections)
+            return connections
+
+    def candidate_pairs(self):
+            """
+            Liste les paires de salles qui peuvent être reliées par un couloir droit.
+
+            Pour chaque salle, seules ses plus proches voisines de chaque côté sont gardées : à gauche et à droite
+            parmi celles qui partagent des lignes avec elle, en haut et en bas parmi celles qui partagent des colonnes.
+            Un couloir ne traverse donc jamais une autre salle, et il y a au plus 4R paires.
+
+            Les voisines sont cherchées dans les salles triées sur leur début (ou leur fin) : la recherche part
+            de la première salle au-delà du bord par dichotomie et s'arrête à la première qui partage des lignes
+            (ou des colonnes). Le coût est en O(R log R + R·k), k étant le nombre de salles sautées avant
+            la plus proche (de l'ordre de √R pour les salles d'un BSP).
+
+            Returns:
+                list: Des tuples (distance², i, j, type) où i < j sont les index des salles dans self.rooms
+                      et type vaut 'rows' ou 'cols', comme dans connect_rooms_glouton.
+            """
+            rooms = self.rooms
+            centres = [self.centre(room) for room in rooms]
+            paires = []
+            deja_vues = set()
+
+            lignes = ([room.row for room in rooms], [room.row + room.height for room in rooms])
+            colonnes = ([room.col for room in rooms], [room.col + room.width for room in rooms])
+
+            def ajouter(i, j, type):
+                paire = (i, j) if i < j else (j, i)
+                if paire in deja_vues: # les lignes sont prioritaires sur les colonnes
+                    return
+                deja_vues.add(paire)
+                (r1, c1), (r2, c2) = centres[i], centres[j]
+                paires.append(((r1 - r2) ** 2 + (c1 - c2) ** 2, paire[0], paire[1], type))
+
+            # (type, intervalles partagés, axe de séparation)
+            for type, (debuts, fins), (debuts_axe, fins_axe) in (('rows', lignes, colonnes), ('cols', colonnes, lignes)):
+                par_debut = sorted(range(len(rooms)), key=debuts_axe.__getitem__)
+                cles_debut = [debuts_axe[i] for i in par_debut]
+                par_fin = sorted(range(len(rooms)), key=fins_axe.__getitem__)
+                cles_fin = [fins_axe[i] for i in par_fin]
+
+                for i in range(len(rooms)):
+                    # voisine suivante (à droite ou en bas) : le plus petit début après la fin de la salle
+                    for k in range(bisect_left(cles_debut, fins_axe[i]), len(par_debut)):
+                        j = par_debut[k]
+                        if debuts[j] < fins[i] and debuts[i] < fins[j]:
+                            ajouter(i, j, type)
+                            break
+
+                    # voisine précédente (à gauche ou en haut) : la plus grande fin avant le début de la salle
+                    for k in range(bisect_right(cles_fin, debuts_axe[i]) - 1, -1, -1):
+                        j = par_fin[k]
+                        if debuts[j] < fins[i] and debuts[i] < fins[j]:
+                            ajouter(i, j, type)
+                            break
+
+            return paires
+
+    def connect_rooms_kruskal(self):
+            """
+            Relie les salles avec un arbre couvrant minimal (algorithme de Kruskal et union-find).
+
+            Fusionner à chaque étape les deux groupes les plus proches revient à ajouter les couloirs
+            candidats par distance croissante en ignorant ceux qui relient un groupe à lui-même :
+            on obtient le même genre de réseau que connect_rooms_glouton. Avec au plus 4R paires candidates
+            (voir candidate_pairs), le tri et l'union-find coûtent O(R log R), en plus de la recherche des paires.
+
+            Returns:
+                dict: Les connexions créées (salle -> salles reliées).
+            """
+            rooms = self.rooms
+            groupes = UnionFind(len(rooms))
+            connections = dict()
+
+            for distance, i, j, type in sorted(self.candidate_pairs()):
+                if groupes.nb_groupes == 1:
+                    break
+                if not groupes.union(i, j):
+                    continue
+
+                rows, cols = self.overlap_rooms(rooms[i], rooms[j])
+                self.carve_corridor_between_rooms(rooms[i], (rooms[j], rows if type == 'rows' else cols, type, sqrt(distance)), connections)
+
+            return connections
 
-    def in_out(self, graphe, dico_relation):
+    def in_out(self):
         """
-        Cette méthode identifie les pièces d'un graphe qui sont des entrées ou des sorties.
-        
-        Args:
-            graphe (dict): Un dictionnaire représentant le graphe des pièces.
-            dico_relation (dict): Un dictionnaire représentant les relations entre les pièces.
+        Cette méthode identifie les pièces du graphe des salles qui sont des entrées ou des sorties.
+
+        Les candidates sont les salles reliées une seule fois (degré 1). L'entrée et la sortie sont
+        les deux extrémités du plus long chemin du graphe (son diamètre), trouvées par deux parcours
+        en largeur : le premier part d'une salle candidate et s'arrête sur la salle la plus éloignée,
+        le second part de celle-ci. La distance est donc celle parcourue à pied, en nombre de couloirs.
         
         Returns:
             None
         """
-        liste=[]
         #Je regarde s'il y a des pièces reliées qu'une seule fois 
-        for key in graphe.keys():
-            compteur = 0
-            for a in graphe.values():
-                for z in a:
-                    if (key == z) or (len(graphe[key])>1) : 
-                        compteur +=1
-
-            if compteur == 0:
-                liste.append(key)
-
-        for b in graphe.values():
-            for val in b:
-                compteur2 = 0
-                compteur3 = 0
-                for c, f in graphe.items():
-                    if (val == c):
-                        compteur2 +=1
-                    for i in f : 
-                        if (val == i ):
-                            compteur3+=1
-
-                if (compteur2 == 0) and (compteur3 == 1):
-                    liste.append(val)
-        
-        # calcul de distance entre entrée et sortie; on prend le max
-        max = -99999
-        start= 0,0
+        liste = [salle for salle in self.graphe if self.graphe.degree(salle) == 1]
+
+        start = 0,0
         end = 0,0
-        
-        for coord in liste : 
-            for a in liste:
-                dist = sqrt((a[0] - coord[0]) ** 2 + (a[1] - coord[1]) ** 2)
-                if dist > max : 
-                    max = dist
-                    start = a[0], a[1]
-                    end =  coord[0], coord[1]
-        
-        # Je dessine
         if liste != []:
-            self.dungeon [start[0]][start[1]]= CaseCarte('S')
-            self.dungeon[end[0]][end[1]]= CaseCarte('E')   
+            # double parcours en largeur : le dernier sommet visité est le plus éloigné
+            start = self.graphe.bfs(liste[0])[1][-1]
+            end = self.graphe.bfs(start)[1][-1]
+
+            # Je dessine
+            self.set_case(start[0], start[1], ENTREE)
+            self.set_case(end[0], end[1], SORTIE)
 
         liste_SE = [(start[0],start[1]),(end[0],end[1])]
         self.liste_SE = liste_SE
-        dico_salle = graphe.copy()
-        self.placements_entitees(dico_salle, dico_relation)
 
-    def placements_entitees(self, dico_salle, dico_relation):
+    def placements_entitees(self):
         """ Description : 
-            La fonction complète dico_salle en rajoutant les données inverses (avant : A -> B ; maintenant : A <-> B)
-            Elle appelle la fonction get_path afin de trouver le plus court chemin entre le départ et l'entrée
+            La fonction cherche le plus court chemin entre le départ et l'arrivée dans le graphe des salles
             Elle appelle la fonction self.separation pour découper le plus court chemin obtenu
 
-        Paramètres:
-            - dico_salle (dict): dictionnaire qui indique quelle salle est reliée avec qui (graphe non orienté)
-            - dico_relation (dict): dictionnaire qui indique quelle salle est reliée avec qui en précisant les coordonnées de la jointure (graphe non orienté)
         Retourne:
         
         """
 
         coord_S = self.liste_SE[0]
         coord_E = self.liste_SE[1]
-        dico = dico_salle.copy()
-        for k,v in dico_salle.items():
-            for coord in v:
-                if coord not in dico_salle.keys():
-                    dico[coord] = [k]
-        dico_salle = dico.copy()
-        for k,v in dico_salle.items():
-            for coord in v:
-                for cle, valeur in dico_salle.items():
-                    if coord == cle and k not in valeur:
-                        valeur.append(k)
-        chemin = []
-        liste_chemin = self.get_path(self.affiche_largeur(coord_E, dico_salle)[0], coord_E, coord_S, chemin)
-        liste_chemin.append(coord_E)
-        self.separations(liste_chemin, dico_relation, dico_salle)
-        self.placements_monstres()
-
-    def placements_monstres(self):
-        """
-        Place des monstres aléatoirement dans le donjon.
-
-        Parcourt chaque case du donjon et remplace les cases vides par des monstres
-        en fonction d'une probabilité de difficulté.
-
-        """
-        for r in range(self.height):
-            for c in range(self.width):
-                if self.dungeon[r][c].get_ch() == ".":
-                    proba = randint(0, 100)
-                    if proba <= self.COEF_DIFFICULTE:
-                        self.dungeon[r][c] = CaseCarte("M")
-
-    def affiche_largeur(self, root, arbre):
-        """
-        Description : 
-            Utilise le graphe des relations des salles pour déterminer à partir d'un point l'arbre de parenté
+        liste_chemin = self.graphe.path(coord_S, coord_E)
+        self.mesurer('separations', self.separations, liste_chemin)
 
-        Paramètres:
-            - root (tuple): coordonnee de départ
-            - arbre (dict): dictionnaire qui indique quelle salle est reliée avec qui (équivalent d'un graphe) 
-        Retourne:
-            - parent (dict): indique le parent de chaque coordonnée
-            - liste_traitee (liste): indique quelles coordonnées apparaissant dans parent
-        """
-        parent = dict()
-        liste_root = []
-        liste_root.append(root)
-        liste_traite =[]
-        while len(liste_root) != 0:
-            racine = liste_root[0]
-            for c,v in arbre.items():
-                if racine==c:
-                    for j in v:
-                        comp = 0
-                        for i in liste_traite:
-                            if j != i:
-                                comp += 1
-                        if comp == len(liste_traite):
-                            sim = 0
-                            for y in liste_root:
-                                if j == y:
-                                    sim += 1
-                            if sim == 0:
-                                liste_root.append(j)
-                                parent[j] = racine
-            liste_traite.append(liste_root[0])
-            liste_root.remove(racine)
-        return(parent, liste_traite)
-
-    def get_path(self, G, root, lettre, chemin):
-        """
-            Description : 
-            Utilise le dictionnaire de parenté pour trouver le plus court chemin entre 2 salles (fonction récursive)
-
-            Paramètres:
-                - G (dict): coordonnee de départ
-                - root (tuple): coordonnée de départ 
-                - lettre (tuple): coordonnée d'arrivée
-                - chemin (liste): chemin reliant la salle de départ et d'arrivée
-            Retourne:
-                - chemin (liste): chemin reliant la salle de départ et d'arrivée
-            """
-        if lettre == root:
-            return(0)
-        else :
-            for c,v in G.items():
-                if lettre == c:
-                    chemin.append(c)
-                    p = self.get_path(G, root, v, chemin)
-                    return(chemin)
-
-    def separations(self, chemin, dico_relation, dico_salle):
+    def separations(self, chemin):
         """
             Description : 
             Permet de déterminer le nombre de séparation à faire selon le nombre de clé
+            Il ne peut pas y avoir plus de portes que de couloirs sur le chemin
 
 
             Paramètres:
-            - dico_salle (dict): dictionnaire qui indique quelle salle est reliée avec qui (graphe orienté)
-            - dico_relation (dict): dictionnaire qui indique quelle salle est reliée avec qui en précisant les coordonnées de la jointure (graphe non orienté)
             - chemin (liste): chemin reliant la salle de départ et d'arrivée
             Retourne:
                 
             """
-        longueur = len(chemin)//(self.NB_CLE+1)
-        for nb_sections in range(1, self.NB_CLE+1):
-            self.sections(chemin, nb_sections, longueur, dico_relation, dico_salle)
+        nb_cles = min(self.NB_CLE, len(chemin) - 1)
+        longueur = len(chemin)//(nb_cles+1)
+        for nb_sections in range(1, nb_cles+1):
+            self.sections(chemin, nb_sections, longueur)
 
-    def sections(self, chemin, nb_sections, longueur, dico_relation, dico_salle):
+    def sections(self, chemin, nb_sections, longueur):
         """
             Description : 
             Sépare le chemin entre l'arrivée et le départ en différente partie. Le nombre de partie dépend du nombre de cle
             Appelle la fonction placemnts_portes et placements_cle pour chaque partie du chemin reliant S et E
 
             Paramètres:
-            - dico_salle (dict): dictionnaire qui indique quelle salle est reliée avec qui (graphe orienté)
-            - dico_relation (dict): dictionnaire qui indique quelle salle est reliée avec qui en précisant les coordonnées de la jointure (graphe non orienté)
             - chemin (liste): chemin reliant la salle de départ et d'arrivée
             - nb_sections (int) : Numéro de la section traitée
             - longueure (int) : longueure min des sections 
@@ -645,206 +819,157 @@ class GenerateurCarte:
                 """
         valeur_min = (nb_sections-1) * (longueur)
         valeur_max = (nb_sections * (longueur))-1
-        self.placement_portes(valeur_max, chemin, dico_relation)
-        petit_chemin = []
-        for i in range(valeur_min, valeur_max+1):
-            petit_chemin.append(chemin[i])
-        self.placement_cles(petit_chemin, chemin, dico_salle)
+        self.placement_portes(valeur_max, chemin)
+        self.placement_cles(valeur_min, valeur_max, chemin)
 
-    def placement_cles(self, petit_chemin, chemin, dico_salle):
+    def placement_cles(self, valeur_min, valeur_max, chemin):
         """
             Description : 
-            Place une cle à l'intérieure du graphe délimité par la première et la dernière coordonnée de la section du chemin 
+            Place une cle dans une salle de la section du chemin, ou dans une salle des branches qui en partent.
+            Les salles du chemin qui entourent la section sont bloquées pour que le parcours reste dans la section.
 
             Paramètres:
-            - dico_salle (dict): dictionnaire qui indique quelle salle est reliée avec qui (graphe orienté)
+            - valeur_min (int) : index de la première salle de la section dans le chemin
+            - valeur_max (int) : index de la dernière salle de la section dans le chemin
             - chemin (liste): chemin reliant la salle de départ et d'arrivée
-            - petit_chemin (liste) : chemin d'une section  
               
             Retourne:
                 
                 """
-        dico_cle = dico_salle.copy()
-        if petit_chemin[0] == chemin [0]:
-            for k,v in dico_cle.items():
-                if k == petit_chemin[-1]:
-                    v.remove(chemin[len(petit_chemin)])
-        elif petit_chemin[-1] == chemin [-1]:
-            for k,v in dico_cle.items():
-                if k == petit_chemin[0]:
-                    v.remove(chemin[-len(petit_chemin)])
-        else:
-            i = 0
-            while chemin[i] != petit_chemin[0]:
-                i += 1
-            for k,v in dico_cle.items():
-                if k == petit_chemin[0]:
-                    v.remove(chemin[i-1])
-                if k == petit_chemin[-1]:
-                    v.remove(chemin[i+len(petit_chemin)]) 
-
-        liste_salle = self.affiche_largeur(petit_chemin[0], dico_cle)[1]
-        nb_random = randint(0, len(liste_salle)-1)
+        bloquees = set()
+        if valeur_min > 0:
+            bloquees.add(chemin[valeur_min - 1])
+        if valeur_max + 1 < len(chemin):
+            bloquees.add(chemin[valeur_max + 1])
+
+        liste_salle = self.graphe.bfs(chemin[valeur_min], bloquees)[1]
+        nb_random = self.rng.randint(0, len(liste_salle)-1)
         cle = liste_salle[nb_random]
         if cle == self.liste_SE[0]:
-            row = cle [0] + 1
-            col = cle [1] + 1
-            self.dungeon[row][col] = CaseCarte('C')
-        else:
-            self.dungeon[cle[0]][cle[1]] = CaseCarte('C')
+            cle = (cle[0] + 1, cle[1] + 1)
+        self.set_case(cle[0], cle[1], CLE)
+        self.cles.append(cle)
 
-    def placement_portes(self, valeur_max, chemin, dico_relation):
+    def placement_portes(self, valeur_max, chemin):
         """
             Description : 
-            Place une porte entre la jointure de deux sectiions du chemin 
+            Place une porte sur la première case du couloir qui relie deux sections du chemin 
 
             Paramètres:
-            - dico_relation (dict): dictionnaire qui indique quelle salle est reliée avec qui en précisant les coordonnées de la jointure (graphe non orienté)
             - chemin (liste): chemin reliant la salle de départ et d'arrivée
             - valeur_max (int) : dernière valeure de la section de chemin 
               
             Retourne:
                 
         """
-        coord_1 = chemin[valeur_max]
-        coord_2 = chemin[valeur_max + 1]
-        for c,v in dico_relation.items():
-            if c == coord_1:
-                for i in range(0, len(v)):
-                    if coord_2 == v[i]:
-                        val_1 = v[i+1]
-                        self.dungeon[val_1[0][0]][val_1[0][1]] = CaseCarte('+')
-            elif c == coord_2:
-                for i in range(0, len(v)):
-                    if coord_1 == v[i]:
-                        val_1 = v[i+1]
-                        self.dungeon[val_1[0][0]][val_1[0][1]] = CaseCarte('+')    
-
-    def generate_map(self):
+        couloir = self.graphe.corridor(chemin[valeur_max], chemin[valeur_max + 1])
+        self.set_case(couloir[0][0], couloir[0][1], PORTE)
+        self.portes.append(couloir[0])
+
+    def generate_map(self, profiler: bool = False):
         """
         Génère une carte en utilisant l'algorithme de génération de labyrinthe.
         
         Cette méthode divise la carte en plusieurs sections, crée des salles dans chaque section,
-        puis connecte les salles entre elles pour former un labyrinthe.
-        """
-        
-        self.random_split(1, 1, self.height - 1, self.width - 1) #min_row = 1 et min_col = 1 pour laisser une bordure
-        self.carve_rooms()
-        self.connect_rooms()
+        connecte les salles entre elles pour former un labyrinthe, choisit l'entrée et la sortie
+        puis place les portes, les clés et les monstres.
 
-    def print_map(self):
-            """
-            Affiche la carte du donjon.
-            
-            Parcourt chaque case de la carte et affiche le caractère correspondant à cette case.
-            """
-            for r in range(self.height):
-                row = ''
-                for c in range(self.width):
-                    row += self.dungeon[r][c].get_ch()
-                print(row)
+        Args:
+            profiler (bool, optional): Mesure chaque phase dans self.rapport. Par défaut False.
+        """
+        self.rapport = {} if profiler else None
 
-    def get_for_game(self):
-        """Retourne le dongeon sous la forme d'une matrice. Remplace les #, . et + par des chiffres.
-            
-            # -> 0 : mur
-            . -> 1 : sol
-            + -> 2 : porte
-            E -> 3 : sortie (end)
-            S -> 4 : entrée (start)
-            - -> 5 : passage
-            M -> 6 : monstre
-            C -> 7 : clef
-        
-        Returns:
-            List[List[int]]: le dongeon sous forme de matrice
-        """
-        #self.print_map()
-        new_dungeon = []
-        for row in self.dungeon:
-            new_row = []
-            for sqr in row:
-                sqr = sqr.get_ch()
-                if sqr == '#':
-                    new_row.append(0)
-                elif sqr == '.':
-                    new_row.append(1)
-                elif sqr == '+':
-                    new_row.append(2)
-                elif sqr == 'E':
-                    new_row.append(3)
-                elif sqr == 'S':
-                    new_row.append(4)
-                elif sqr == '-':
-                    new_row.append(5)
-                elif sqr == 'M':
-                    new_row.append(6)
-                elif sqr == 'C':
-                    new_row.append(7)
-            new_dungeon.append(new_row)
-
-        return new_dungeon
+        self.mesurer('random_split', self.random_split, 1, 1, self.height - 1, self.width - 1) #min_row = 1 et min_col = 1 pour laisser une bordure
+        self.mesurer('carve_rooms', self.carve_rooms)
+        self.mesurer('connect_rooms', self.connect_rooms)
+        self.mesurer('in_out', self.in_out)
+        self.mesurer('placements_entitees', self.placements_entitees)
+        self.mesurer('placements_monstres', self.placements_monstres)
 
     def get_for_game2(self):
             """
             Cette méthode retourne une matrice modifiée pour le jeu.
             
-            La méthode prend la matrice 'dungeon' existante et ajoute un cadre de 1 autour de la matrice pour éviter les sorties de la carte et rendre l'affichage des bords plus propre.
+            La méthode prend la grille 'dungeon' existante et ajoute un cadre de 1 autour de la matrice pour éviter les sorties de la carte et rendre l'affichage des bords plus propre.
             Ensuite, elle crée une nouvelle matrice 'square' avec des dimensions deux fois plus grandes que la matrice 'dungeon'.
-            Les caractères spécifiques dans la matrice 'dungeon' sont remplacés par des chiffres correspondants dans la matrice 'square'.
-            Les caractères 'S', 'E', 'M' et 'C' sont remplacés par des chiffres spécifiques et entourés de points.
-            Le caractère '+' est remplacé par des chiffres spécifiques et entouré de tirets.
-            Les autres caractères sont remplacés par des chiffres correspondants.
+            Les codes 'S', 'E', 'M' et 'C' sont conservés et entourés de sol.
+            Le code '+' est conservé et entouré de passages.
+            Les autres codes sont recopiés tels quels.
             
             Returns:
                 square (list): La matrice modifiée pour le jeu.
             """
             
-            matrice = self.dungeon
-            matrice = [[0] + row + [1] for row in matrice]
-            matrice = [[0 for _ in range(len(matrice[0]))]] + matrice + [[0 for _ in range(len(matrice[0]))]]
-
-            square = [[0 for _ in range(len(matrice[0]) * 2)] for _ in range(len(matrice) * 2)]
-
-            sol = CaseCarte('.').get_digit()
-            passage = CaseCarte('-').get_digit()
-
-            for i, row in enumerate(matrice):
-                for j, col in enumerate(row):
-                    if isinstance(col, int):
-                        continue
-                    if col.get_ch() in ('S', 'E', 'M', 'C'):
-                        square[i*2][j*2] = col.get_digit()
-                        square[i*2][j*2+1] = sol
-                        square[i*2+1][j*2] = sol
-                        square[i*2+1][j*2+1] = sol
-                    elif col.get_ch() == '+':
-                        if self.dungeon[i][j-1].get_ch() == '-':
-                            square[i*2][j*2] = passage
-                            square[i*2][j*2+1] = col.get_digit()
-                            square[i*2+1][j*2] = passage
-                            square[i*2+1][j*2+1] = col.get_digit()
-                        elif self.dungeon[i][j+1].get_ch() == '-':
-                            square[i*2][j*2] = col.get_digit()
-                            square[i*2][j*2+1] = passage
-                            square[i*2+1][j*2] = col.get_digit()
-                            square[i*2+1][j*2+1] = passage
-                        elif self.dungeon[i-1][j].get_ch() == '-':
-                            square[i*2][j*2] = col.get_digit()
-                            square[i*2][j*2+1] = passage
-                            square[i*2+1][j*2] = col.get_digit()
-                            square[i*2+1][j*2+1] = passage
-                        elif self.dungeon[i+1][j].get_ch() == '-':
-                            square[i*2][j*2] = col.get_digit()
-                            square[i*2][j*2+1] = col.get_digit()
-                            square[i*2+1][j*2] = passage
-                            square[i*2+1][j*2+1] = passage
+            square = [[0 for _ in range((self.width + 2) * 2)] for _ in range((self.height + 2) * 2)]
 
+            for r in range(self.height):
+                for c in range(self.width):
+                    code = self.case(r, c)
+                    i, j = r + 1, c + 1 # décalage dû au cadre
+                    if code in (ENTREE, SORTIE, MONSTRE, CLE):
+                        square[i*2][j*2] = code
+                        square[i*2][j*2+1] = SOL
+                        square[i*2+1][j*2] = SOL
+                        square[i*2+1][j*2+1] = SOL
+                    elif code == PORTE:
+                        if c > 0 and self.case(r, c-1) == PASSAGE:
+                            square[i*2][j*2] = PASSAGE
+                            square[i*2][j*2+1] = code
+                            square[i*2+1][j*2] = PASSAGE
+                            square[i*2+1][j*2+1] = code
+                        elif c + 1 < self.width and self.case(r, c+1) == PASSAGE:
+                            square[i*2][j*2] = code
+                            square[i*2][j*2+1] = PASSAGE
+                            square[i*2+1][j*2] = code
+                            square[i*2+1][j*2+1] = PASSAGE
+                        elif r > 0 and self.case(r-1, c) == PASSAGE:
+                            square[i*2][j*2] = code
+                            square[i*2][j*2+1] = PASSAGE
+                            square[i*2+1][j*2] = code
+                            square[i*2+1][j*2+1] = PASSAGE
+                        elif r + 1 < self.height and self.case(r+1, c) == PASSAGE:
+                            square[i*2][j*2] = code
+                            square[i*2][j*2+1] = code
+                            square[i*2+1][j*2] = PASSAGE
+                            square[i*2+1][j*2+1] = PASSAGE
 
                     else:
-                        square[i*2][j*2] = col.get_digit()
-                        square[i*2][j*2+1] = col.get_digit()
-                        square[i*2+1][j*2] = col.get_digit()
-                        square[i*2+1][j*2+1] = col.get_digit()
+                        square[i*2][j*2] = code
+                        square[i*2][j*2+1] = code
+                        square[i*2+1][j*2] = code
+                        square[i*2+1][j*2+1] = code
 
             return square
+
+
+def formater_rapport(rapport: dict) -> str:
+    """
+    Met en forme le rapport de GenerateurCarte.generate_map(profiler=True) pour l'afficher.
+
+    Args:
+        rapport (dict): Le rapport {phase: {"temps": secondes, "blocs": variation du nombre de blocs alloués}}.
+
+    Returns:
+        str: Une ligne par phase, avec sa durée en millisecondes et sa variation de blocs mémoire.
+    """
+    return "\n".join(f"{phase:<20} {1000 * mesure['temps']:>9.2f} ms {mesure['blocs']:>+9} blocs" for phase, mesure in rapport.items())
+
+
+def densite_eloignement_entree(dg: StrategieGeneration, ligne: int, colonne: int) -> float:
+    """
+    Densité de monstres qui augmente avec la distance à l'entrée : nulle sur l'entrée, maximale
+    à partir d'une demi-largeur de carte.
+
+    À passer à GenerateurCarte(..., densite_monstres=densite_eloignement_entree).
+
+    Args:
+        dg (StrategieGeneration): Le générateur, dont l'entrée est déjà placée (dg.liste_SE).
+        ligne (int): La ligne de la case.
+        colonne (int): La colonne de la case.
+
+    Returns:
+        float: Le facteur de densité, entre 0 et 1.
+    """
+    entree = dg.liste_SE[0]
+    distance = sqrt((ligne - entree[0]) ** 2 + (colonne - entree[1]) ** 2)
+    return min(1.0, 2 * distance / max(dg.width, dg.height))
@@ -0,0 +1,106 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+import multiprocessing
+from typing import Optional, Union
+
+from .cache import CacheEtages
+from .etage import construire_etage
+from .floor_plan import FloorPlan
+
+
+class PrechargeurEtages:
+    """Génère l'étage suivant dans un processus séparé pendant que le joueur joue l'étage courant.
+
+    Le processus de travail renvoie le plan de l'étage (FloorPlan), qui ne contient que des données simples :
+    le passage d'un étage à l'autre n'a plus à attendre le générateur.
+
+    Avec un cache d'étages, un étage déjà en cache n'est pas regénéré, et un étage généré y est enregistré
+    quand il est récupéré.
+    """
+
+    __slots__ = ['executeur', 'demande', 'tache', 'cache', 'a_enregistrer']
+
+    def __init__(self, cache: Optional[CacheEtages] = None) -> None:
+        """
+        Initialise le préchargeur. Le processus de travail n'est lancé qu'à la première demande.
+
+        Args:
+            cache (CacheEtages, optional): Le cache des étages. Par défaut None (pas de cache).
+        """
+        self.executeur: Optional[ProcessPoolExecutor] = None
+        self.demande: Optional[tuple[int, int, Union[int, str]]] = None
+        self.tache: Optional[Future] = None
+        self.cache = cache
+        self.a_enregistrer = False
+
+    def demander(self, taille: int, difficulte: int, seed: Union[int, str]) -> None:
+        """
+        Lance la génération d'un étage en arrière-plan, s'il n'est pas déjà demandé.
+
+        Une seule génération est gardée à la fois : une demande différente remplace la précédente.
+
+        Args:
+            taille (int): La taille de la carte.
+            difficulte (int): Le coefficient de difficulté de la carte (l'étage).
+            seed (int | str): La graine de l'étage.
+        """
+        if self.demande == (taille, difficulte, seed) and self.tache is not None:
+            return
+
+        if self.tache is not None:
+            self.tache.cancel()
+
+        self.demande = (taille, difficulte, seed)
+
+        etage = self.cache.charger(seed, taille, difficulte) if self.cache is not None else None
+        if etage is not None:
+            # déjà en cache : pas besoin du processus de travail
+            self.tache = Future()
+            self.tache.set_result(etage)
+            self.a_enregistrer = False
+            return
+
+        if self.executeur is None:
+            # "spawn" : le processus de travail repart d'un interpréteur neuf, il n'hérite pas de l'état de pygame
+            # ni de tkinter. Il réimporte __main__ (main.py, dont les imports du jeu sont dans le garde)
+            # puis engine.generation, qui n'importe ni l'un ni l'autre
+            self.executeur = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+        self.tache = self.executeur.submit(construire_etage, taille, difficulte, seed, verifier=True)
+        self.a_enregistrer = self.cache is not None
+
+    def recuperer(self, taille: int, difficulte: int, seed: Union[int, str]) -> Optional[FloorPlan]:
+        """
+        Récupère l'étage demandé, en attendant la fin de sa génération si besoin.
+
+        Args:
+            taille (int): La taille de la carte.
+            difficulte (int): Le coefficient de difficulté de la carte (l'étage).
+            seed (int | str): La graine de l'étage.
+
+        Returns:
+            FloorPlan | None: Le plan de l'étage, ou None s'il n'a pas été demandé
+                         ou si sa génération a échoué (il faut alors le générer normalement).
+        """
+        if self.demande != (taille, difficulte, seed) or self.tache is None:
+            return None
+
+        tache, self.tache, self.demande = self.tache, None, None
+        try:
+            etage = tache.result()
+        except Exception as e:
+            print("Échec du préchargement de l'étage :", e)
+            return None
+
+        if self.a_enregistrer:
+            self.cache.enregistrer(seed, taille, difficulte, etage)
+        return etage
+
+    def fermer(self) -> None:
+        """
+        Abandonne la génération en cours et arrête le processus de travail.
+        """
+        if self.executeur is not None:
+            self.executeur.shutdown(wait=False, cancel_futures=True)
+        self.executeur = None
+        self.tache = None
+        self.demande = None
@@ -0,0 +1,181 @@
+from collections import deque
+
+
+class RoomGraph:
+    """Graphe non orienté des salles du donjon.
+
+    Une salle est identifiée par les coordonnées (ligne, colonne) de son centre.
+    Chaque arête porte la liste des cases du couloir qui relie les deux salles.
+    """
+
+    __slots__ = ['adjacence']
+
+    def __init__(self):
+        """
+        Initialise un graphe vide.
+
+        L'adjacence est un dictionnaire {salle: {voisine: couloir}} : les tests d'appartenance
+        sont en O(1) et l'ordre d'insertion des salles et des voisines est conservé.
+        """
+        self.adjacence = {}
+
+    def __len__(self):
+        """
+        Renvoie le nombre de salles du graphe.
+
+        Returns:
+            int: Le nombre de salles.
+        """
+        return len(self.adjacence)
+
+    def __contains__(self, salle):
+        """
+        Indique si la salle fait partie du graphe.
+
+        Args:
+            salle (tuple): Le centre de la salle.
+
+        Returns:
+            bool: True si la salle est dans le graphe, False sinon.
+        """
+        return salle in self.adjacence
+
+    def __iter__(self):
+        """
+        Parcourt les salles du graphe dans l'ordre d'insertion.
+
+        Returns:
+            iterator: Un itérateur sur les centres des salles.
+        """
+        return iter(self.adjacence)
+
+    def add_room(self, salle):
+        """
+        Ajoute une salle au graphe si elle n'y est pas déjà.
+
+        Args:
+            salle (tuple): Le centre de la salle.
+        """
+        if salle not in self.adjacence:
+            self.adjacence[salle] = {}
+
+    def connect(self, salle1, salle2, couloir):
+        """
+        Relie deux salles par un couloir (dans les deux sens).
+
+        Args:
+            salle1 (tuple): Le centre de la première salle.
+            salle2 (tuple): Le centre de la deuxième salle.
+            couloir (list): Les cases (ligne, colonne) du couloir qui relie les deux salles.
+        """
+        self.add_room(salle1)
+        self.add_room(salle2)
+        self.adjacence[salle1][salle2] = couloir
+        self.adjacence[salle2][salle1] = couloir
+
+    def neighbors(self, salle):
+        """
+        Renvoie les salles voisines d'une salle.
+
+        Args:
+            salle (tuple): Le centre de la salle.
+
+        Returns:
+            dict_keys: Les centres des salles reliées à la salle.
+        """
+        return self.adjacence[salle].keys()
+
+    def degree(self, salle):
+        """
+        Renvoie le nombre de couloirs qui partent d'une salle.
+
+        Args:
+            salle (tuple): Le centre de la salle.
+
+        Returns:
+            int: Le degré de la salle.
+        """
+        return len(self.adjacence[salle])
+
+    def corridor(self, salle1, salle2):
+        """
+        Renvoie le couloir qui relie deux salles voisines.
+
+        Args:
+            salle1 (tuple): Le centre de la première salle.
+            salle2 (tuple): Le centre de la deuxième salle.
+
+        Returns:
+            list: Les cases (ligne, colonne) du couloir.
+        """
+        return self.adjacence[salle1][salle2]
+
+    def corridors(self):
+        """
+        Parcourt les couloirs du graphe, chacun une seule fois.
+
+        Returns:
+            iterator: Des tuples (salle1, salle2, couloir).
+        """
+        vues = set()
+        for salle, voisines in self.adjacence.items():
+            vues.add(salle)
+            for voisine, couloir in voisines.items():
+                if voisine not in vues:
+                    yield salle, voisine, couloir
+
+    def bfs(self, racine, bloquees=()):
+        """
+        Parcourt le graphe en largeur à partir d'une salle.
+
+        Args:
+            racine (tuple): Le centre de la salle de départ.
+            bloquees (set, optional): Les salles dans lesquelles le parcours ne doit pas entrer.
+
+        Returns:
+            tuple: Un tuple (parent, ordre) où parent indique le parent de chaque salle atteinte
+                   (la racine n'a pas de parent) et ordre liste les salles dans l'ordre de visite.
+        """
+        parent = {}
+        ordre = [racine]
+        vues = {racine}
+        vues.update(bloquees)
+        file = deque(ordre)
+        while file:
+            salle = file.popleft()
+            for voisine in self.adjacence[salle]:
+                if voisine not in vues:
+                    vues.add(voisine)
+                    parent[voisine] = salle
+                    ordre.append(voisine)
+                    file.append(voisine)
+        return parent, ordre
+
+    def path(self, depart, arrivee):
+        """
+        Renvoie le plus court chemin (en nombre de couloirs) entre deux salles.
+
+        Le parcours en largeur part de l'arrivée, puis le chemin est reconstruit de façon
+        itérative en remontant les parents depuis le départ.
+
+        Args:
+            depart (tuple): Le centre de la salle de départ.
+            arrivee (tuple): Le centre de la salle d'arrivée.
+
+        Returns:
+            list: Les centres des salles du chemin, du départ à l'arrivée inclus,
+                  ou une liste vide si les deux salles ne sont pas reliées.
+        """
+        if depart == arrivee:
+            return [depart]
+
+        parent, _ = self.bfs(arrivee)
+        if depart not in parent:
+            return []
+
+        chemin = [depart]
+        salle = depart
+        while salle != arrivee:
+            salle = parent[salle]
+            chemin.append(salle)
+        return chemin
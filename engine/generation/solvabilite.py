@@ -0,0 +1,311 @@
+from bisect import bisect_right
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from .floor_plan import FloorPlan
+from .map_generation import CLE, ENTREE, MUR, PORTE, SORTIE
+from .union_find import UnionFind
+
+
+# Masque des cases praticables : tout sauf les murs et les portes
+TABLE_PRATICABLE = bytes(int(code not in (MUR, PORTE)) for code in range(256))
+
+# Suites de cases praticables (dans le masque) et suites de cases de porte (dans la matrice)
+MOTIF_PRATICABLE = re.compile(rb"\x01+")
+MOTIF_PORTE = re.compile(bytes((PORTE,)) + rb"+")
+
+# Nombre de cases d'une porte du jeu (un carré de 2x2), c'est-à-dire d'une clé à dépenser
+CASES_PAR_PORTE = 4
+
+
+class Segments:
+    """Suites horizontales de cases d'un même type, ligne par ligne, reliées en composantes connexes.
+
+    Chaque segment reçoit un numéro global ; deux segments de lignes voisines qui se chevauchent
+    sont dans la même composante (connexité 4).
+    """
+
+    __slots__ = ['debuts', 'fins', 'premiers', 'groupes']
+
+    def __init__(self, lignes: Sequence[bytes], motif: re.Pattern) -> None:
+        """
+        Découpe les lignes en segments puis les regroupe en composantes.
+
+        Une ligne identique à la précédente (c'est le cas d'une ligne sur deux dans une matrice agrandie)
+        partage ses segments et leurs numéros : il n'y a rien à découper ni à relier.
+
+        Args:
+            lignes (Sequence[bytes]): Les lignes dans lesquelles chercher le motif.
+            motif (re.Pattern): Le motif d'une suite de cases.
+        """
+        self.debuts = []
+        self.fins = []
+        self.premiers = [] # numéro global du premier segment de chaque ligne
+        copies = []
+        total = 0
+        precedente = None
+        for ligne in lignes:
+            if ligne == precedente:
+                self.debuts.append(self.debuts[-1])
+                self.fins.append(self.fins[-1])
+                self.premiers.append(self.premiers[-1])
+                copies.append(True)
+                continue
+            spans = [m.span() for m in motif.finditer(ligne)]
+            self.debuts.append([debut for debut, _ in spans])
+            self.fins.append([fin for _, fin in spans])
+            self.premiers.append(total)
+            copies.append(False)
+            total += len(spans)
+            precedente = ligne
+
+        self.groupes = UnionFind(total)
+        for y in range(1, len(lignes)):
+            if not copies[y]:
+                self.relier(y - 1, y)
+
+    def relier(self, y1: int, y2: int) -> None:
+        """
+        Réunit les segments de deux lignes voisines qui se chevauchent.
+
+        Args:
+            y1 (int): La première ligne.
+            y2 (int): La ligne suivante.
+        """
+        debuts1, fins1, debuts2, fins2 = self.debuts[y1], self.fins[y1], self.debuts[y2], self.fins[y2]
+        premier1, premier2 = self.premiers[y1], self.premiers[y2]
+        union = self.groupes.union
+        n1, n2 = len(debuts1), len(debuts2)
+        i = j = 0
+        while i < n1 and j < n2:
+            if debuts1[i] < fins2[j] and debuts2[j] < fins1[i]:
+                union(premier1 + i, premier2 + j)
+            # avancer le segment qui se termine le premier
+            if fins1[i] < fins2[j]:
+                i += 1
+            else:
+                j += 1
+
+    def composante(self, x: int, y: int) -> Optional[int]:
+        """
+        Renvoie la composante de la case (x, y).
+
+        Args:
+            x (int): La colonne de la case.
+            y (int): La ligne de la case.
+
+        Returns:
+            int | None: Le représentant de la composante, ou None si la case n'est dans aucun segment.
+        """
+        if not 0 <= y < len(self.debuts):
+            return None
+        k = bisect_right(self.debuts[y], x) - 1
+        if k < 0 or x >= self.fins[y][k]:
+            return None
+        return self.groupes.find(self.premiers[y] + k)
+
+    def touchant(self, y: int, debut: int, fin: int):
+        """
+        Renvoie les composantes des segments de la ligne y qui chevauchent les colonnes [debut, fin[.
+
+        Args:
+            y (int): La ligne.
+            debut (int): La première colonne.
+            fin (int): La colonne qui suit la dernière.
+
+        Returns:
+            generator: Les représentants des composantes.
+        """
+        if not 0 <= y < len(self.debuts):
+            return
+        debuts, fins = self.debuts[y], self.fins[y]
+        k = bisect_right(fins, debut)
+        while k < len(debuts) and debuts[k] < fin:
+            yield self.groupes.find(self.premiers[y] + k)
+            k += 1
+
+
+class RapportSolvabilite:
+    """Résultat de la vérification d'un étage."""
+
+    __slots__ = ['sortie_accessible', 'cles_inaccessibles', 'portes_inaccessibles', 'cles_restantes']
+
+    def __init__(self, sortie_accessible: bool, cles_inaccessibles: list, portes_inaccessibles: list, cles_restantes: int) -> None:
+        """
+        Initialise le rapport.
+
+        Args:
+            sortie_accessible (bool): La sortie peut être atteinte depuis l'entrée.
+            cles_inaccessibles (list): Les positions (x, y) des clés que le joueur ne peut pas atteindre.
+            portes_inaccessibles (list): La case du haut à gauche de chaque porte que le joueur ne peut pas atteindre ou ouvrir.
+            cles_restantes (int): Le nombre de clés ramassées et pas encore utilisées à la fin du parcours.
+        """
+        self.sortie_accessible = sortie_accessible
+        self.cles_inaccessibles = cles_inaccessibles
+        self.portes_inaccessibles = portes_inaccessibles
+        self.cles_restantes = cles_restantes
+
+    @property
+    def soluble(self) -> bool:
+        """
+        Indique si l'étage peut être terminé.
+
+        Returns:
+            bool: True si la sortie est accessible, False sinon.
+        """
+        return self.sortie_accessible
+
+    def __str__(self) -> str:
+        """
+        Décrit le rapport en une ligne.
+
+        Returns:
+            str: La description du rapport.
+        """
+        if self.soluble:
+            return "étage soluble"
+        return (f"sortie inaccessible ({len(self.cles_inaccessibles)} clé(s) et "
+                f"{len(self.portes_inaccessibles)} porte(s) hors d'atteinte)")
+
+
+def _trouver(lignes: Sequence[bytes], code: int) -> List[Tuple[int, int]]:
+    """
+    Cherche toutes les cases d'un code dans les lignes.
+
+    Args:
+        lignes (Sequence[bytes]): Les lignes de la matrice.
+        code (int): Le code cherché.
+
+    Returns:
+        List[Tuple[int, int]]: Les positions (x, y), dans l'ordre de lecture.
+    """
+    positions = []
+    for y, ligne in enumerate(lignes):
+        x = ligne.find(code)
+        while x != -1:
+            positions.append((x, y))
+            x = ligne.find(code, x + 1)
+    return positions
+
+
+def verifier_etage(matrice: Sequence[Sequence[int]], cles: Optional[list] = None,
+                   entree: Optional[Tuple[int, int]] = None, sortie: Optional[Tuple[int, int]] = None) -> RapportSolvabilite:
+    """
+    Vérifie qu'un étage peut être terminé : parcours de l'entrée à la sortie en ramassant les clés
+    et en ouvrant les portes, une clé (quelconque) étant dépensée par porte de 2x2 cases.
+
+    Les cases praticables sont regroupées en zones par suites horizontales (trouvées avec des expressions
+    régulières sur les octets des lignes) reliées par union-find ; les portes sont regroupées de la même façon.
+    Le parcours se fait ensuite sur le graphe des zones et des portes, sans jamais revenir aux cases :
+    quelques millisecondes pour une matrice de 300x300.
+
+    Parmi les portes accessibles, la première ouverte est celle qui rapporte le plus de clés une fois
+    dépensée la sienne, de préférence celle qui mène à la sortie. Le choix est exact quand les portes
+    sont en série sur le chemin de la sortie, comme celles du générateur.
+
+    Args:
+        matrice (Sequence[Sequence[int]]): La matrice du jeu (lignes d'octets ou listes d'entiers).
+        cles (list, optional): Les positions (x, y) des clés. Par défaut, les cases de code CLE de la matrice.
+        entree (Tuple[int, int], optional): La position de l'entrée. Par défaut, la case de code ENTREE.
+        sortie (Tuple[int, int], optional): La position de la sortie. Par défaut, la case de code SORTIE.
+
+    Returns:
+        RapportSolvabilite: Le rapport de vérification.
+    """
+    lignes = [ligne if isinstance(ligne, (bytes, bytearray)) else bytes(ligne) for ligne in matrice]
+    if cles is None:
+        cles = _trouver(lignes, CLE)
+    if entree is None:
+        entree = next(iter(_trouver(lignes, ENTREE)), None)
+    if sortie is None:
+        sortie = next(iter(_trouver(lignes, SORTIE)), None)
+
+    zones = Segments([ligne.translate(TABLE_PRATICABLE) for ligne in lignes], MOTIF_PRATICABLE)
+    portes = Segments(lignes, MOTIF_PORTE)
+
+    # clés de chaque zone
+    cles_par_zone = {}
+    for x, y in cles:
+        zone = zones.composante(x, y)
+        if zone is not None:
+            cles_par_zone[zone] = cles_par_zone.get(zone, 0) + 1
+
+    # zones voisines, nombre de cases et case du haut à gauche de chaque groupe de portes
+    voisines = {}
+    cases = {}
+    coins = {}
+    portes_par_zone = {}
+    for y, (debuts, fins) in enumerate(zip(portes.debuts, portes.fins)):
+        for k, (debut, fin) in enumerate(zip(debuts, fins)):
+            groupe = portes.groupes.find(portes.premiers[y] + k)
+            cases[groupe] = cases.get(groupe, 0) + fin - debut
+            coins.setdefault(groupe, (debut, y))
+            adjacentes = voisines.setdefault(groupe, set())
+            for x in (debut - 1, fin):
+                zone = zones.composante(x, y)
+                if zone is not None:
+                    adjacentes.add(zone)
+            adjacentes.update(zones.touchant(y - 1, debut, fin))
+            adjacentes.update(zones.touchant(y + 1, debut, fin))
+    for groupe, adjacentes in voisines.items():
+        for zone in adjacentes:
+            portes_par_zone.setdefault(zone, []).append(groupe)
+
+    depart = zones.composante(*entree) if entree else None
+    arrivee = zones.composante(*sortie) if sortie else None
+
+    atteintes = set()
+    ouvertes = set()
+    frontiere = set()
+    cles_en_main = 0
+
+    def visiter(zone):
+        nonlocal cles_en_main
+        if zone in atteintes:
+            return
+        atteintes.add(zone)
+        cles_en_main += cles_par_zone.get(zone, 0)
+        frontiere.update(g for g in portes_par_zone.get(zone, ()) if g not in ouvertes)
+
+    if depart is not None:
+        visiter(depart)
+
+    while arrivee is not None and arrivee not in atteintes:
+        meilleure = None
+        for groupe in frontiere:
+            cout = -(-cases[groupe] // CASES_PAR_PORTE)
+            if cout > cles_en_main:
+                continue
+            nouvelles = voisines[groupe] - atteintes
+            valeur = (arrivee in nouvelles, sum(cles_par_zone.get(zone, 0) for zone in nouvelles) - cout, -cout)
+            if meilleure is None or valeur > meilleure[0]:
+                meilleure = (valeur, groupe, cout)
+        if meilleure is None:
+            break
+
+        _, groupe, cout = meilleure
+        frontiere.discard(groupe)
+        ouvertes.add(groupe)
+        cles_en_main -= cout
+        for zone in voisines[groupe]:
+            visiter(zone)
+
+    return RapportSolvabilite(
+        sortie_accessible=arrivee is not None and arrivee in atteintes,
+        cles_inaccessibles=[(x, y) for x, y in cles if zones.composante(x, y) not in atteintes],
+        portes_inaccessibles=sorted((coins[groupe] for groupe in voisines if groupe not in ouvertes), key=lambda c: (c[1], c[0])),
+        cles_restantes=cles_en_main,
+    )
+
+
+def verifier_plan(plan: FloorPlan) -> RapportSolvabilite:
+    """
+    Vérifie qu'un plan d'étage peut être terminé (voir verifier_etage).
+
+    Args:
+        plan (FloorPlan): Le plan de l'étage.
+
+    Returns:
+        RapportSolvabilite: Le rapport de vérification.
+    """
+    return verifier_etage(plan.matrice, plan.cles, plan.entree, plan.sortie)
@@ -0,0 +1,26 @@
+from .caverne import GenerateurCaverne
+from .map_generation import GenerateurCarte, StrategieGeneration
+
+# Stratégies de génération disponibles, par nom (la première est celle du jeu)
+STRATEGIES = {classe.NOM: classe for classe in (GenerateurCarte, GenerateurCaverne)}
+
+
+def creer_generateur(strategie: str, taille: int, coef_difficulte: int, **options) -> StrategieGeneration:
+    """
+    Crée le générateur d'une carte carrée avec la stratégie donnée.
+
+    Args:
+        strategie (str): Le nom de la stratégie, clé de STRATEGIES.
+        taille (int): La largeur et la hauteur de la carte, en cases.
+        coef_difficulte (int): Le coefficient de difficulté de la carte.
+        **options: Les autres arguments du générateur (seed, densite_monstres, connecteur pour 'bsp', ...).
+
+    Returns:
+        StrategieGeneration: Le générateur, avant generate_map.
+
+    Raises:
+        ValueError: Si la stratégie est inconnue.
+    """
+    if strategie not in STRATEGIES:
+        raise ValueError(f"Stratégie inconnue : {strategie} (attendu : {', '.join(STRATEGIES)})")
+    return STRATEGIES[strategie](taille, taille, coef_difficulte=coef_difficulte, **options)
@@ -0,0 +1,101 @@
+from random import Random
+from typing import List, Tuple
+
+from .caverne import GenerateurCaverne
+from .floor_plan import ECHELLE
+from .map_generation import SOL
+
+# Côté d'un tronçon du monde sans fin, en cases du générateur (ECHELLE fois plus de tuiles une fois agrandi)
+TAILLE_TRONCON = 32
+
+# Côté d'un tronçon, en tuiles du jeu
+TUILES_TRONCON = ECHELLE * TAILLE_TRONCON
+
+
+def position_passage(graine, bord: Tuple[str, int, int]) -> int:
+    """
+    Renvoie la position du passage percé dans un bord de tronçon.
+
+    Le tirage ne dépend que de la graine et du bord : les deux tronçons qui partagent ce bord
+    percent leur passage au même endroit, quel que soit celui qui est généré en premier.
+
+    Args:
+        graine (int | str): La graine du monde.
+        bord (Tuple[str, int, int]): 'v' et le tronçon à droite du bord vertical,
+                                     ou 'h' et le tronçon en dessous du bord horizontal.
+
+    Returns:
+        int: La ligne (bord vertical) ou la colonne (bord horizontal) du passage, en cases du générateur.
+    """
+    return Random(f"{graine}:passage:{bord[0]}:{bord[1]}:{bord[2]}").randint(2, TAILLE_TRONCON - 3)
+
+
+def centre_caverne(grille: bytearray) -> Tuple[int, int]:
+    """
+    Renvoie la case de sol la plus proche du centre du tronçon.
+
+    Args:
+        grille (bytearray): La grille du tronçon, ligne par ligne.
+
+    Returns:
+        Tuple[int, int]: La case (ligne, colonne), le centre lui-même si le tronçon n'a pas de sol.
+    """
+    milieu = TAILLE_TRONCON // 2
+    sols = [divmod(i, TAILLE_TRONCON) for i, code in enumerate(grille) if code == SOL]
+    return min(sols, key=lambda case: abs(case[0] - milieu) + abs(case[1] - milieu), default=(milieu, milieu))
+
+
+def creuser(grille: bytearray, depart: Tuple[int, int], arrivee: Tuple[int, int]) -> None:
+    """
+    Creuse un couloir en L entre deux cases : d'abord le long de la ligne de départ, puis de la colonne d'arrivée.
+
+    Args:
+        grille (bytearray): La grille du tronçon.
+        depart (Tuple[int, int]): La case (ligne, colonne) de départ.
+        arrivee (Tuple[int, int]): La case (ligne, colonne) d'arrivée.
+    """
+    (l1, c1), (l2, c2) = depart, arrivee
+    for colonne in range(min(c1, c2), max(c1, c2) + 1):
+        grille[l1 * TAILLE_TRONCON + colonne] = SOL
+    for ligne in range(min(l1, l2), max(l1, l2) + 1):
+        grille[ligne * TAILLE_TRONCON + c2] = SOL
+
+
+def generer_troncon(graine, cx: int, cy: int) -> Tuple[List[bytearray], Tuple[int, int]]:
+    """
+    Génère un tronçon du monde sans fin : une caverne (voir GenerateurCaverne) reliée par un couloir
+    au passage percé dans chacun de ses quatre bords. Tous les tronçons sont donc reliés entre eux.
+
+    Le tronçon ne dépend que de la graine du monde et de ses coordonnées : il peut être oublié
+    puis régénéré à l'identique.
+
+    Args:
+        graine (int | str): La graine du monde.
+        cx (int): La colonne du tronçon.
+        cy (int): La ligne du tronçon.
+
+    Returns:
+        Tuple[List[bytearray], Tuple[int, int]]: Les lignes du tronçon agrandi (TUILES_TRONCON octets chacune,
+                                                 MUR ou SOL) et la tuile (x, y) du centre de sa caverne.
+    """
+    dg = GenerateurCaverne(TAILLE_TRONCON, TAILLE_TRONCON, seed=f"{graine}:{cx}:{cy}")
+    dg.automate(dg.remplissage_aleatoire())
+    dg.plus_grande_caverne()
+
+    grille = dg.dungeon
+    centre = centre_caverne(grille)
+    dernier = TAILLE_TRONCON - 1
+    creuser(grille, (position_passage(graine, ('v', cx, cy)), 0), centre)
+    creuser(grille, (position_passage(graine, ('v', cx + 1, cy)), dernier), centre)
+    creuser(grille, centre, (0, position_passage(graine, ('h', cx, cy))))
+    creuser(grille, centre, (dernier, position_passage(graine, ('h', cx, cy + 1))))
+
+    # agrandissement : chaque case devient un carré de ECHELLE x ECHELLE tuiles
+    lignes = []
+    for r in range(TAILLE_TRONCON):
+        ligne = bytearray(TUILES_TRONCON)
+        for d in range(ECHELLE):
+            ligne[d::ECHELLE] = grille[r * TAILLE_TRONCON:(r + 1) * TAILLE_TRONCON]
+        lignes.extend(bytearray(ligne) for _ in range(ECHELLE))
+
+    return lignes, (ECHELLE * centre[1], ECHELLE * centre[0])
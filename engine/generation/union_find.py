@@ -0,0 +1,57 @@
+class UnionFind:
+    """Structure union-find (ensembles disjoints) sur les entiers 0..n-1."""
+
+    __slots__ = ['parent', 'rang', 'nb_groupes']
+
+    def __init__(self, n):
+        """
+        Initialise n groupes contenant chacun un seul élément.
+
+        Args:
+            n (int): Le nombre d'éléments.
+        """
+        self.parent = list(range(n))
+        self.rang = [0] * n
+        self.nb_groupes = n
+
+    def find(self, x):
+        """
+        Renvoie le représentant du groupe de x (avec compression de chemin).
+
+        Args:
+            x (int): L'élément recherché.
+
+        Returns:
+            int: Le représentant du groupe de x.
+        """
+        parent = self.parent
+        racine = x
+        while parent[racine] != racine:
+            racine = parent[racine]
+        while parent[x] != racine:
+            parent[x], x = racine, parent[x]
+        return racine
+
+    def union(self, a, b):
+        """
+        Fusionne les groupes de a et de b (union par rang).
+
+        Args:
+            a (int): Un élément du premier groupe.
+            b (int): Un élément du deuxième groupe.
+
+        Returns:
+            bool: True si les deux groupes étaient distincts et ont été fusionnés, False sinon.
+        """
+        racine_a = self.find(a)
+        racine_b = self.find(b)
+        if racine_a == racine_b:
+            return False
+
+        if self.rang[racine_a] < self.rang[racine_b]:
+            racine_a, racine_b = racine_b, racine_a
+        self.parent[racine_b] = racine_a
+        if self.rang[racine_a] == self.rang[racine_b]:
+            self.rang[racine_a] += 1
+        self.nb_groupes -= 1
+        return True
@@ -1,6 +1,7 @@
 # Modules de la bibliothèque standard Python
 import pathlib
 from datetime import datetime, timedelta
+from functools import partial
 from random import randint
 from typing import Optional
 import traceback
@@ -9,17 +10,20 @@ import traceback
 import pygame
 
 # Modules locaux
+from engine.generation.prechargement import PrechargeurEtages
 from engine.ui.tilemap import Tilemap
+from engine.ui.tilemap_infinie import TilemapInfinie
 from engine.ui.game_over import GameOver
 from engine.ui.fin_niveau import FinNiveau
+from engine.utils.assets import ASSETS
 from engine.utils.vector import Vector
 
-from game.game import Game
+from game.game import CACHE_ETAGES, Game
 from game.constantes import (
     PLAYER_SPEED, FRAME_RATE, DEAD_ZONE, DEBUG, NB_EMPLACEMENTS_INVENTAIRE,
     TAILLE_BORDURE_INVENTAIRE, DISTANCE_AGRO_MONSTRES, DISTANCE_AGRO_STOP_MONSTRES,
     DISTANCE_ATTAQUE_MONSTRE, RECUl_DEGATS_ATTAQUANT, VIE_JOUEUR_DEFAUT, SOUNDS,
-    DISTANCE_ATTAQUE_JOUEUR, GHOST, DISTANCE_POUR_RAMASSER_OBJET,RECUL_DEGATS_ATTAQUEE
+    DISTANCE_ATTAQUE_JOUEUR, GHOST, DISTANCE_POUR_RAMASSER_OBJET,RECUL_DEGATS_ATTAQUEE, MODE_INFINI
     )
 from game.entites import Joueur, ObjetAuSol
 from game.objets import Arme, Epee, Coeur, Potion, Cle, Prop, Consommable, Botte
@@ -29,25 +33,15 @@ from .utils import resize
 # Chemin absolu du fichier
 PATH = pathlib.Path(__file__).parent.parent
 
-# Charger les images des objets
-HEART = pygame.image.load("ressources/objects/heart.png")
-HEART = pygame.transform.scale(HEART, (32, 32))
-HEART.set_colorkey((255, 255, 255))
-
-BLACK_HEART = pygame.image.load("ressources/objects/black_heart.png")
-BLACK_HEART = pygame.transform.scale(BLACK_HEART, (32, 32))
-BLACK_HEART.set_colorkey((255, 255, 255))
-
-BOTTE = pygame.image.load("ressources/objects/botte.png")   
-BOTTE = pygame.transform.scale(BOTTE, (32, 32))
-BOTTE.set_colorkey((255, 255, 255))
-
 # Autoriser la répétition des touches
 pygame.key.set_repeat(1, 20) # Répétition des touches toutes les 20ms
 
 # Variable globale pour le temps d'attente entre chaque attaque
 ATTENTE_PROCHAINE_ATTAQUE = None
 
+# Génère l'étage suivant en arrière-plan pendant que le joueur joue l'étage actuel
+PRECHARGEUR = PrechargeurEtages(CACHE_ETAGES)
+
 class Runtime():
     """Classe principale du jeu"""
 
@@ -78,19 +72,6 @@ class Runtime():
         
         self.player = self.game.joueur
 
-            
-        if self.game.start is None:
-            self.game.generate_map()
-
-        map = self.game.matrice
-        entree = self.game.start
-        sortie = self.game.end
-
-        entree.x -= 2
-        entree.y += 2
-
-        sortie.x -= 2
-        sortie.y += 2
 
         # screen creation
         self.display = pygame.display.set_mode((width, height))
@@ -98,12 +79,33 @@ class Runtime():
         # définir le titre de la fenêtre
         pygame.display.set_caption("Tilemap")
 
+        # charger les images de l'interface une fois l'écran créé, pour qu'elles soient converties à son format
+        self.heart = ASSETS.charger("ressources/objects/heart.png", (32, 32), (255, 255, 255))
+        self.black_heart = ASSETS.charger("ressources/objects/black_heart.png", (32, 32), (255, 255, 255))
+        self.botte = ASSETS.charger("ressources/objects/botte.png", (32, 32), (255, 255, 255))
+
         # store the width and height of the display
         self.width = width
         self.height = height
 
-        # store the map
-        self.map = Tilemap(map, entree, sortie)
+        if self.game.mode == MODE_INFINI:
+            # monde sans fin : la carte est générée par tronçons autour du joueur
+            self.map = TilemapInfinie(self.game.graine)
+            entree = self.map.entree
+        else:
+            if self.game.start is None:
+                self.game.generate_map()
+
+            # décaler l'entrée et la sortie sur de nouveaux vecteurs : celles de Game restent les positions
+            # dans la matrice, qui sont sauvegardées
+            entree = self.game.start + Vector(-2, 2)
+            sortie = self.game.end + Vector(-2, 2)
+
+            # store the map
+            self.map = Tilemap(self.game.matrice, entree, sortie)
+
+            # lancer la génération de l'étage suivant pendant que le joueur joue celui-ci
+            PRECHARGEUR.demander(self.game.taille_matrice, self.game.etage + 1, self.game.graine_etage(self.game.etage + 1))
 
         self.last_step = datetime.now()
 
@@ -453,10 +455,10 @@ class Runtime():
                     # retour au menu
                     return False
                 
-            # si le joueur a atteint la sortie (moins de 32 pixels de distance)
-            end_pos = self.game.end * 32 - Vector(*self.display.get_size()) // 2
+            # si le joueur a atteint la sortie (moins de 32 pixels de distance), le monde sans fin n'en a pas
+            end_pos = self.map.sortie * 32 - Vector(*self.display.get_size()) // 2 if self.map.sortie is not None else None
 
-            if self.player.position.distance_between(end_pos) <= 32:
+            if end_pos is not None and self.player.position.distance_between(end_pos) <= 32:
                 # jouer le son de la victoire
                 pygame.mixer.Sound("ressources/audio/" + SOUNDS["victoire"]).play()
 
@@ -481,8 +483,18 @@ class Runtime():
                 # Ssupprimer les entités de l'étage actuel
                 self.game.entites = [entite for entite in self.game.entites if isinstance(entite, Joueur)]
 
-                # supprimer la carte de l'étage actuel
+                # supprimer la carte et les portes de l'étage actuel
                 self.game.matrice = []
+                self.game.portes = []
+                self.game.start = self.game.end = None
+
+                # oublier les images que plus aucun objet n'utilise
+                ASSETS.evincer()
+
+                # installer l'étage suivant s'il a été généré en arrière-plan (sinon il sera généré au prochain lancement)
+                etage = PRECHARGEUR.recuperer(self.game.taille_matrice, self.game.etage, self.game.graine_etage())
+                if etage:
+                    self.game.charger_etage(etage)
 
                 # si on veut continuer
                 if suivant:
@@ -779,24 +791,24 @@ class Runtime():
         # afficher les coeurs noirs
         nb_coeurs = self.player.vie_max // 20
         for i in range(nb_coeurs):
-            self.display.blit(BLACK_HEART, (10 + i * 33, 10))
+            self.display.blit(self.black_heart, (10 + i * 33, 10))
         # afficher la santé du joueur
         vie = self.player.vie / 20
         for i in range(int(vie)):
-            self.display.blit(HEART, (10 + i * 33, 10))
+            self.display.blit(self.heart, (10 + i * 33, 10))
         
         # si le joueur à un nombre non entier de points de vie, on affiche un coeur partiel sur un coeur noir
         if vie % 1 != 0:
             width = vie % 1 * 32
-            self.display.blit(HEART, (10 + int(vie) * 33, 10), (0, 0, width, 32))
+            self.display.blit(self.heart, (10 + int(vie) * 33, 10), (0, 0, width, 32))
 
         # En dessous, afficher la vitesse du joueur
         # 1 botte pour la vitesse de base
-        self.display.blit(BOTTE, (10, 42))
+        self.display.blit(self.botte, (10, 42))
 
         # ensuite, 1 botte pour un buff de 25 de vitesse
         for i in range(self.player.buff_vitesse // 25):
-            self.display.blit(BOTTE, (10 + 33 + i * 33, 42))
+            self.display.blit(self.botte, (10 + 33 + i * 33, 42))
 
 
         # en dessous, afficher le score en blanc
@@ -860,10 +872,9 @@ class Runtime():
             degats = randint(5, 5+i*difficulte//2)
             
             proba = randint(0, int(proba_def/(i+1))) #de 0 à 1000
-            epee = Epee(degats)
             loots_possibles.append({
                 "proba": proba,
-                "objet": epee,
+                "objet": partial(Epee, degats), # créé seulement s'il est tiré
                 "vecteur": Vector(randint(10, 50), randint(10, 50))
             })
         
@@ -879,10 +890,9 @@ class Runtime():
             quantite = 1 #randint(1, 1+i*difficulte//2)
 
             proba = randint(0, int(proba_def/(i+1))) #de 0 à 1000
-            objet = conso(quantite)
             loots_possibles.append({
                 "proba": proba,
-                "objet": objet,
+                "objet": partial(conso, quantite),
                 "vecteur": Vector(randint(10, 50), randint(10, 50))
             })
 
@@ -893,7 +903,7 @@ class Runtime():
         
         
         for loot in loots:
-            self.game.entites.append(ObjetAuSol(loot["objet"], entite.position + loot["vecteur"]))
+            self.game.entites.append(ObjetAuSol(loot["objet"](), entite.position + loot["vecteur"]))
         
     def handle_event(self, event) -> None:
         """
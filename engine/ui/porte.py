@@ -1,6 +1,6 @@
 import pygame
 
-from engine.utils import Vector
+from engine.utils import ASSETS, Vector
 
 
 class Porte:
@@ -22,10 +22,9 @@ class Porte:
         self.x = x
         self.y = y
 
-        self.sheet = pygame.image.load("ressources/objects/porte.png")
-        self.image = pygame.Surface((64, 64))
-        self.image.blit(self.sheet, (0, 0), (0, 0, 64, 64))
-        self.image.set_colorkey((0, 0, 0))
+        self.sheet = ASSETS.charger("ressources/objects/porte.png")
+        # image partagée par toutes les portes
+        self.image = ASSETS.decouper("ressources/objects/porte.png", (0, 0, 64, 64), (0, 0, 0))
         self.rect = self.image.get_rect()
 
     def draw(self, screen: pygame.Surface, offset:Vector) -> None:
@@ -1,4 +1,5 @@
-from typing import Any, TYPE_CHECKING
+from collections import OrderedDict
+from typing import Any, Optional, TYPE_CHECKING
 
 import pygame
 
@@ -6,11 +7,85 @@ from engine.ui.tileset import Tileset
 from engine.ui.porte import Porte
 from engine.utils.vector import Vector
 
-from game.constantes import TILEMAP_PATH, DEBUG, SOUNDS
+from game.constantes import TILEMAP_PATH, DEBUG, SOUNDS, TUILES_RENDU, NB_MAX_RENDUS
 
 if TYPE_CHECKING:
     from game.entites.entite import Entite
 
+# Textures des murs, par identifiant (0 : pas de mur)
+TEXTURES_MURS = (
+    None, "stone",
+    "up_wall", "down_wall", "left_wall", "right_wall",
+    "up_left_ext_wall", "up_right_ext_wall", "down_left_ext_wall", "down_right_ext_wall",
+    "up_left_int_wall", "up_right_int_wall", "down_left_int_wall", "down_right_int_wall",
+)
+ID_TEXTURES_MURS = {texture: identifiant for identifiant, texture in enumerate(TEXTURES_MURS)}
+
+# Voisins d'une case : le voisin i est le bit 1 << i du masque des murs autour d'elle
+VOISINS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, -1), (-1, 1), (1, 1))
+GAUCHE, DROITE, HAUT, BAS, HAUT_GAUCHE, HAUT_DROITE, BAS_GAUCHE, BAS_DROITE = (1 << i for i in range(len(VOISINS)))
+CARDINAUX = GAUCHE | DROITE | HAUT | BAS
+
+# Règles de choix de la texture d'un mur, par priorité : (voisins murs requis, voisins murs exclus, texture)
+REGLES_MURS = (
+    (0xFF, 0, "stone"),
+    (DROITE | BAS, GAUCHE | HAUT, "down_right_ext_wall"),
+    (GAUCHE | BAS, DROITE | HAUT, "down_left_ext_wall"),
+    (DROITE | HAUT, GAUCHE | BAS, "up_right_ext_wall"),
+    (GAUCHE | HAUT, DROITE | BAS, "up_left_ext_wall"),
+    (GAUCHE | DROITE | BAS, HAUT, "down_wall"),
+    (GAUCHE | DROITE | HAUT, BAS, "up_wall"),
+    (GAUCHE | HAUT | BAS, DROITE, "left_wall"),
+    (DROITE | HAUT | BAS, GAUCHE, "right_wall"),
+    (CARDINAUX | HAUT_DROITE | BAS_DROITE | BAS_GAUCHE, HAUT_GAUCHE, "down_right_int_wall"),
+    (CARDINAUX | HAUT_GAUCHE | BAS_DROITE | BAS_GAUCHE, HAUT_DROITE, "down_left_int_wall"),
+    (CARDINAUX | HAUT_DROITE | HAUT_GAUCHE | BAS_DROITE, BAS_GAUCHE, "up_right_int_wall"),
+    (CARDINAUX | HAUT_DROITE | HAUT_GAUCHE | BAS_GAUCHE, BAS_DROITE, "up_left_int_wall"),
+)
+
+# Identifiant de la texture d'un mur pour chacun des 256 masques de voisins (pierre si aucune règle ne correspond)
+TABLE_MURS = bytes(
+    next((ID_TEXTURES_MURS[texture] for requis, exclus, texture in REGLES_MURS if masque & requis == requis and not masque & exclus),
+         ID_TEXTURES_MURS["stone"])
+    for masque in range(256)
+)
+
+# 1 pour les codes de la matrice qui sont des murs (mur et porte), 0 sinon
+TABLE_EST_MUR = bytes(1 if code in (0, 2) else 0 for code in range(256))
+
+
+def textures_murs(grille: bytes, largeur: int, hauteur: int) -> bytearray:
+    """
+    Calcule d'un coup l'identifiant de texture (voir TEXTURES_MURS) de toutes les cases d'une grille.
+
+    La grille est lue comme un seul entier, un octet par case : les masques des voisins de toutes les cases
+    sont la somme des huit décalages de cet entier (un par voisin, pondéré par son bit), sans retenue
+    puisqu'un masque tient dans un octet. TABLE_MURS donne ensuite la texture de chaque masque.
+
+    Args:
+        grille (bytes): La grille bordée, (largeur + 2) x (hauteur + 2) octets ligne par ligne, 1 pour un mur et 0 sinon.
+                        La bordure donne les voisins des cases du bord.
+        largeur (int): La largeur de la grille, sans la bordure.
+        hauteur (int): La hauteur de la grille, sans la bordure.
+
+    Renvoie:
+        bytearray: Les identifiants des textures des cases de la grille (sans la bordure) ligne par ligne, 0 pour le sol.
+    """
+    pas = largeur + 2
+    taille = len(grille)
+    murs = int.from_bytes(grille, "little")
+
+    # le voisin de gauche de l'octet i est l'octet i - 1, amené en i par un décalage d'un octet vers le haut, etc.
+    masques = 0
+    for i, (dx, dy) in enumerate(VOISINS):
+        decalage = 8 * (dy * pas + dx)
+        masques += (murs >> decalage if decalage > 0 else murs << -decalage) << i
+    masques = (masques & ((1 << 8 * taille) - 1)).to_bytes(taille, "little").translate(TABLE_MURS)
+
+    # les cases de sol n'ont pas de texture
+    textures = (int.from_bytes(masques, "little") & murs * 0xFF).to_bytes(taille, "little")
+    return bytearray(b"".join(textures[y * pas + 1:y * pas + 1 + largeur] for y in range(1, hauteur + 1)))
+
 # initialiser pygame
 pygame.init()
 pygame.mixer.init()
@@ -18,7 +93,7 @@ pygame.mixer.init()
 class Tilemap:
     """Classe représentant la carte de l'étage du jeu."""
 
-    __slots__ = ["matrice", "size", "tile_size", "walls", "doors", "tilesets", "entree", "sortie", "offset"]
+    __slots__ = ["matrice", "size", "tile_size", "walls", "doors", "tilesets", "entree", "sortie", "offset", "rendus", "images_murs", "liste_portes"]
 
     def __init__(self, matrice:list[list[int]], entree:Vector, sortie:Vector, tile_size:tuple[int, int]=(32, 32)) -> None:
         """
@@ -37,11 +112,14 @@ class Tilemap:
         self.matrice = matrice
         self.size = (len(matrice[0]), len(matrice))
         self.tile_size = tile_size
-        self.walls:dict[tuple[int, int]: [pygame.Surface]] = {}
-        self.doors:dict[tuple[int, int]: [pygame.Surface]] = {}
+        self.walls = bytearray(self.size[0] * self.size[1]) # identifiant de la texture de chaque case, ligne par ligne
+        self.doors:dict[tuple[int, int], dict[tuple[int, int], list[Porte]]] = {} # voir indexer_portes
+        self.liste_portes:Optional[list[Porte]] = None
+        self.rendus:OrderedDict[tuple[int, int], pygame.Surface] = OrderedDict()
         self.tilesets = {
             "terrain": Tileset(TILEMAP_PATH, (8, 8), mode="terrain"),
         }
+        self.images_murs = self.creer_images_murs()
 
         self.entree = entree
         self.sortie = sortie
@@ -61,56 +139,92 @@ class Tilemap:
         Renvoie:
             bool: True si la case est un mur, False sinon.
         """
-        try:
+        # les cases hors de la carte sont des murs
+        if 0 <= x < self.size[0] and 0 <= y < self.size[1]:
             return self.matrice[y][x] in [0, 2]
-        except IndexError:
-            return True
+        return True
 
     def setup_walls(self) -> None:
         """
         Configure les murs du tilemap en fonction de la matrice de tuiles.
 
-        Cette méthode parcourt la matrice de tuiles et détermine le type de mur à afficher en fonction des tuiles environnantes.
-        Les différents types de murs sont définis par des textures spécifiques.
+        La texture de chaque mur dépend des murs qui l'entourent (voir REGLES_MURS) : les masques des voisins
+        de toutes les cases sont calculés d'un coup par textures_murs, puis traduits par TABLE_MURS.
+        L'identifiant de la texture (voir TEXTURES_MURS) est rangé dans la grille self.walls.
 
         Renvoie:
             None
         """
-        for y in range(self.size[1]):
-            for x in range(self.size[0]):
-                if self.matrice[y][x] in [0, 2]:
-                    walls = self.walls_around(x, y)
-                    if ["left", "right", "up", "down", "up_left", "up_right", "down_left", "down_right"] == walls:
-                        texture = "stone"
-                    elif "right" in walls and "down" in walls and not "left" in walls and not "up" in walls:
-                        texture = "down_right_ext_wall"
-                    elif "left" in walls and "down" in walls and not "right" in walls and not "up" in walls:
-                        texture = "down_left_ext_wall"
-                    elif "right" in walls and "up" in walls and not "left" in walls and not "down" in walls:
-                        texture = "up_right_ext_wall"
-                    elif "left" in walls and "up" in walls and not "right" in walls and not "down" in walls:
-                        texture = "up_left_ext_wall"
-                    elif not "up" in walls and "left" in walls and "right" in walls and "down" in walls:
-                        texture = "down_wall"
-                    elif not "down" in walls and "left" in walls and "right" in walls and "up" in walls:
-                        texture = "up_wall"
-                    elif not "right" in walls and "left" in walls and "up" in walls and "down" in walls:
-                        texture = "left_wall"
-                    elif not "left" in walls and "right" in walls and "up" in walls and "down" in walls:
-                        texture = "right_wall"
-                    elif all([i in walls for i in ["right", "left", "down", "up", "up_right", "down_right", "down_left"]]) and not "up_left" in walls:
-                        texture = "down_right_int_wall"
-                    elif all([i in walls for i in ["right", "left", "down", "up", "up_left", "down_right", "down_left"]]) and not "up_right" in walls:
-                        texture = "down_left_int_wall"
-                    elif all([i in walls for i in ["right", "left", "down", "up", "up_right", "up_left", "down_right"]]) and not "down_left" in walls:
-                        texture = "up_right_int_wall"
-                    elif all([i in walls for i in ["right", "left", "down", "up", "up_right", "up_left", "down_left"]]) and not "down_right" in walls:
-                        texture = "up_left_int_wall"
-                    
-                    wall_image = pygame.Surface(self.tile_size)
-                    wall_image.blit(self.tilesets["terrain"].tiles[texture], (0, 0))
-                    wall_image.set_colorkey((0, 0, 0)) 
-                    self.walls[(x, y)] = wall_image
+        largeur, hauteur = self.size
+        bord = b"\1" * (largeur + 2) # les cases hors de la carte sont des murs
+        grille = bord + b"".join(b"\1" + bytes(ligne).translate(TABLE_EST_MUR) + b"\1" for ligne in self.matrice) + bord
+        self.walls = textures_murs(grille, largeur, hauteur)
+
+    def set_cell(self, x: int, y: int, code: int) -> None:
+        """
+        Modifie une case de la matrice, puis recalcule les textures des cases autour d'elle (les seules
+        qui en dépendent) et les redessine dans le bloc pré-rendu qui les contient.
+
+        Args:
+            x (int): La coordonnée x de la case.
+            y (int): La coordonnée y de la case.
+            code (int): Le nouveau code de la case (1 pour du sol, 0 pour un mur...).
+
+        Renvoie:
+            None
+        """
+        self.matrice[y][x] = code
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if 0 <= x + dx < self.size[0] and 0 <= y + dy < self.size[1]:
+                    self.retile(x + dx, y + dy)
+
+    def retile(self, x: int, y: int) -> None:
+        """
+        Recalcule la texture de la case (x, y), après une modification de la matrice autour d'elle,
+        et la redessine dans son bloc pré-rendu.
+
+        Args:
+            x (int): La coordonnée x de la case.
+            y (int): La coordonnée y de la case.
+
+        Renvoie:
+            None
+        """
+        self.walls[y * self.size[0] + x] = self.texture_case(x, y)
+        self.redessiner_case(x, y)
+
+    def texture_case(self, x: int, y: int) -> int:
+        """
+        Calcule la texture de la case (x, y) d'après les murs qui l'entourent (voir REGLES_MURS).
+
+        Args:
+            x (int): La coordonnée x de la case.
+            y (int): La coordonnée y de la case.
+
+        Renvoie:
+            int: L'identifiant de la texture (voir TEXTURES_MURS), 0 si la case n'est pas un mur.
+        """
+        if not self.is_wall(x, y):
+            return 0
+        masque = sum(1 << i for i, (dx, dy) in enumerate(VOISINS) if self.is_wall(x + dx, y + dy))
+        return TABLE_MURS[masque]
+
+    def creer_images_murs(self) -> list[Optional[pygame.Surface]]:
+        """
+        Crée les images des murs, une par texture, partagées par toutes les cases de même texture.
+
+        Renvoie:
+            list[pygame.Surface | None]: Les images indexées comme TEXTURES_MURS (None pour l'identifiant 0),
+                                         le noir étant transparent.
+        """
+        images = [None]
+        for texture in TEXTURES_MURS[1:]:
+            wall_image = pygame.Surface(self.tile_size)
+            wall_image.blit(self.tilesets["terrain"].tiles[texture], (0, 0))
+            wall_image.set_colorkey((0, 0, 0))
+            images.append(wall_image)
+        return images
     
     def setup_doors(self) -> None:
             """
@@ -124,42 +238,14 @@ class Tilemap:
                     if self.matrice[y][x] == 2:
                         pass
 
-    def walls_around(self, x:int, y:int) -> list[str]:
-        """
-        Renvoie une liste des murs autour de la position (x, y).
-
-        Args:
-            x (int): La coordonnée x de la position.
-            y (int): La coordonnée y de la position.
-
-        Envoie:
-            list[str]: Une liste contenant les directions des murs autour de la position (x, y).
-                      Les directions possibles sont "left", "right", "up", "down", "up_left",
-                      "up_right", "down_left" et "down_right".
-        """
-        walls = []
-        if self.is_wall(x-1, y):
-            walls.append("left")
-        if self.is_wall(x+1, y):
-            walls.append("right")
-        if self.is_wall(x, y-1):
-            walls.append("up")
-        if self.is_wall(x, y+1):
-            walls.append("down")
-        if self.is_wall(x-1, y-1):
-            walls.append("up_left")
-        if self.is_wall(x+1, y-1):
-            walls.append("up_right")
-        if self.is_wall(x-1, y+1):
-            walls.append("down_left")
-        if self.is_wall(x+1, y+1):
-            walls.append("down_right")
-        return walls
-
     def draw(self, screen: pygame.Surface, offset=Vector(0, 0), portes: list[Porte] = []) -> None:
             """
             Dessine la carte sur l'écran avec un décalage optionnel et une liste de portes.
 
+            Le sol et les murs ne changent pas d'une image à l'autre : ils sont dessinés une fois pour toutes
+            dans des blocs de TUILES_RENDU x TUILES_RENDU tuiles (voir rendu), et seuls les blocs visibles
+            sont copiés sur l'écran.
+
             Args:
                 screen (pygame.Surface): La surface sur laquelle dessiner la carte.
                 offset (Vector, optional): Le décalage de la carte. Par défaut, (0, 0).
@@ -172,57 +258,197 @@ class Tilemap:
             # Nouvel offset
             self.offset += offset
 
-            # Taille de l'écran en tiles
-            screen_width, screen_height = screen.get_size()
             tile_width, tile_height = self.tile_size
+            start_x, start_y, end_x, end_y = self.limites_visibles(screen)
+
+            # Dessiner les blocs pré-rendus du sol et des murs
+            for ry in range(start_y // TUILES_RENDU, (end_y - 1) // TUILES_RENDU + 1):
+                for rx in range(start_x // TUILES_RENDU, (end_x - 1) // TUILES_RENDU + 1):
+                    pos = (rx * TUILES_RENDU * tile_width + self.offset.x, ry * TUILES_RENDU * tile_height + self.offset.y)
+                    screen.blit(self.rendu(rx, ry), pos)
+
+            if DEBUG:
+                for y in range(start_y, end_y):
+                    for x in range(start_x, end_x):
+                        pos = (x * tile_width + self.offset.x, y * tile_height + self.offset.y)
+                        # cadriage vert pour les rect des sols, rouge pour ceux des murs
+                        couleur = (255, 0, 0) if self.image_mur(x, y) is not None else (0, 255, 0)
+                        pygame.draw.rect(screen, couleur, (pos, (tile_width, tile_height)), 1)
+
+                # dessiner des carrés mauves sur le sol pour l'arrivée et le départ
+                carre = pygame.Surface(self.tile_size)
+                carre.fill((255, 0, 255))
+                for case in (self.entree, self.sortie):
+                    if case is not None:
+                        screen.blit(carre, (case.x * tile_width + self.offset.x, case.y * tile_height + self.offset.y))
+
+            if portes is not self.liste_portes:
+                self.indexer_portes(portes)
+
+            # Dessiner les portes proches de l'écran : une image par groupe, celle de sa case en haut à gauche
+            # (une tuile de marge : un groupe qui commence juste avant l'écran peut y déborder)
+            for _, groupe in self.portes_proches(start_x - 1, start_y - 1, end_x, end_y):
+                groupe[0].draw(screen, self.offset)
 
-            # Calculer les limites visibles
-            start_x = max(0, -self.offset.x // tile_width)
-            start_y = max(0, -self.offset.y // tile_height)
+                if DEBUG:
+                    # relier porte / joueur en bleu
+                    pygame.draw.line(screen, (0, 255, 255), groupe[0].rect.topleft, (screen.get_width()//2, screen.get_height()//2))
 
-            end_x = min(self.size[0], int(screen_width - self.offset.x) // tile_width + 1)
-            end_y = min(self.size[1], int(screen_height - self.offset.y) // tile_height + 1)
+    def indexer_portes(self, portes: list[Porte]) -> None:
+        """
+        Range les portes par groupes : une porte du jeu occupe un carré de 2x2 cases, chacune étant un objet Porte.
 
-            # Convertir en entiers
-            start_x, start_y, end_x, end_y = map(int, (start_x, start_y, end_x, end_y))
+        Chaque groupe est indexé par sa case en haut à gauche, dans le bloc de TUILES_RENDU x TUILES_RENDU tuiles
+        qui la contient : les portes proches du joueur ou de l'écran se trouvent sans parcourir toutes les portes.
+        L'index est refait quand draw ou verifier_portes reçoit une autre liste que celle indexée.
 
-            # Dessiner le sol en premier
-            for y in range(start_y, end_y):
-                for x in range(start_x, end_x):
-                    pos = (x * tile_width + self.offset.x, y * tile_height + self.offset.y)
-                    screen.blit(self.tilesets["terrain"].tiles["ground"], pos)
-
-                    if DEBUG:
-                        # cadriage vert pour les rect des sols
-                        pygame.draw.rect(screen, (0, 255, 0), (pos, (tile_width, tile_height)), 1)
-
-                        # dessiner des carrés mauves sur le sol pour l'arrivée et le départ
-                        carre = pygame.Surface(self.tile_size)
-                        carre.fill((255, 0, 255))
-                        screen.blit(carre.copy(), (self.entree.x * tile_width + self.offset.x, self.entree.y * tile_height + self.offset.y))
-                        screen.blit(carre.copy(), (self.sortie.x * tile_width + self.offset.x, self.sortie.y * tile_height + self.offset.y))
-
-            # Dessiner les murs depuis le dictionnaire
-            for (x, y), texture in self.walls.items():
-                if start_x <= x < end_x and start_y <= y < end_y:
-                    pos = (x * tile_width + self.offset.x, y * tile_height + self.offset.y)
-                    screen.blit(texture, pos)
-                    
-
-                    if DEBUG:
-                        # cadriage rouge pour les rect des murs
-                        pygame.draw.rect(screen, (255, 0, 0), (pos, (tile_width, tile_height)), 1)
-
-            drawn = []
-            # Dessiner les portes
-            for porte in portes:
-                if (porte.x, porte.y) not in drawn:
-                    porte.draw(screen, self.offset)
-                    drawn+= [(porte.x, porte.y), (porte.x + 1, porte.y), (porte.x, porte.y + 1), (porte.x + 1, porte.y + 1)]
+        Args:
+            portes (list[Porte]): La liste des portes de l'étage, gardée à jour quand une porte s'ouvre.
 
-                if DEBUG:
-                    # relier porte / joueur en bleu
-                    pygame.draw.line(screen, (0, 255, 255), porte.rect.topleft, (screen.get_width()//2, screen.get_height()//2))
+        Renvoie:
+            None
+        """
+        self.doors = {}
+        self.liste_portes = portes
+
+        cases = {(porte.x, porte.y): porte for porte in portes}
+        rangees = set()
+        for x, y in sorted(cases, key=lambda case: (case[1], case[0])):
+            if (x, y) in rangees:
+                continue
+            # la première case lue d'un groupe est celle en haut à gauche
+            groupe = [cases[case] for case in ((x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)) if case in cases and case not in rangees]
+            rangees.update((porte.x, porte.y) for porte in groupe)
+            self.doors.setdefault((x // TUILES_RENDU, y // TUILES_RENDU), {})[(x, y)] = groupe
+
+    def portes_proches(self, start_x: int, start_y: int, end_x: int, end_y: int):
+        """
+        Parcourt les groupes de portes des blocs qui recouvrent une zone de la carte.
+
+        Args:
+            start_x (int): La première colonne de la zone, en tuiles.
+            start_y (int): La première ligne de la zone, en tuiles.
+            end_x (int): La colonne de fin de la zone (exclue).
+            end_y (int): La ligne de fin de la zone (exclue).
+
+        Renvoie:
+            Iterator[tuple[tuple[int, int], list[Porte]]]: Les groupes, avec leur case en haut à gauche.
+        """
+        for ry in range(start_y // TUILES_RENDU, (end_y - 1) // TUILES_RENDU + 1):
+            for rx in range(start_x // TUILES_RENDU, (end_x - 1) // TUILES_RENDU + 1):
+                yield from self.doors.get((rx, ry), {}).items()
+
+    def limites(self) -> Optional[tuple[int, int, int, int]]:
+        """
+        Renvoie les limites de la carte, en tuiles.
+
+        Renvoie:
+            tuple[int, int, int, int] | None: (x_min, y_min, x_max, y_max), bornes max exclues,
+                                              ou None si la carte n'a pas de limites.
+        """
+        return (0, 0, self.size[0], self.size[1])
+
+    def limites_visibles(self, screen: pygame.Surface) -> tuple[int, int, int, int]:
+        """
+        Calcule les tuiles visibles à l'écran avec l'offset actuel, bornées par les limites de la carte.
+
+        Args:
+            screen (pygame.Surface): L'écran.
+
+        Renvoie:
+            tuple[int, int, int, int]: (start_x, start_y, end_x, end_y), bornes de fin exclues.
+        """
+        screen_width, screen_height = screen.get_size()
+        tile_width, tile_height = self.tile_size
+
+        start_x = int(-self.offset.x // tile_width)
+        start_y = int(-self.offset.y // tile_height)
+        end_x = int((screen_width - self.offset.x) // tile_width) + 1
+        end_y = int((screen_height - self.offset.y) // tile_height) + 1
+
+        limites = self.limites()
+        if limites is not None:
+            start_x, start_y = max(start_x, limites[0]), max(start_y, limites[1])
+            end_x, end_y = min(end_x, limites[2]), min(end_y, limites[3])
+        return start_x, start_y, end_x, end_y
+
+    def image_mur(self, x: int, y: int) -> Optional[pygame.Surface]:
+        """
+        Renvoie l'image du mur aux coordonnées (x, y).
+
+        Args:
+            x (int): La coordonnée x de la case.
+            y (int): La coordonnée y de la case.
+
+        Renvoie:
+            pygame.Surface | None: L'image du mur, ou None si la case n'est pas un mur.
+        """
+        return self.images_murs[self.walls[y * self.size[0] + x]]
+
+    def rendu(self, rx: int, ry: int) -> pygame.Surface:
+        """
+        Renvoie le bloc pré-rendu (sol puis murs) de TUILES_RENDU x TUILES_RENDU tuiles aux coordonnées (rx, ry),
+        en le dessinant s'il n'est pas en cache. Les blocs les moins récemment utilisés sont oubliés
+        au-delà de NB_MAX_RENDUS. Un bloc au bord de la carte est tronqué à ses limites.
+
+        Args:
+            rx (int): La colonne du bloc.
+            ry (int): La ligne du bloc.
+
+        Renvoie:
+            pygame.Surface: L'image du bloc.
+        """
+        cle = (rx, ry)
+        rendu = self.rendus.get(cle)
+        if rendu is not None:
+            self.rendus.move_to_end(cle)
+            return rendu
+
+        tile_width, tile_height = self.tile_size
+        x0, y0 = rx * TUILES_RENDU, ry * TUILES_RENDU
+        x1, y1 = x0 + TUILES_RENDU, y0 + TUILES_RENDU
+        limites = self.limites()
+        if limites is not None:
+            x1, y1 = min(x1, limites[2]), min(y1, limites[3])
+
+        rendu = pygame.Surface(((x1 - x0) * tile_width, (y1 - y0) * tile_height))
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                self.dessiner_case(rendu, x, y, ((x - x0) * tile_width, (y - y0) * tile_height))
+
+        self.rendus[cle] = rendu
+        while len(self.rendus) > NB_MAX_RENDUS:
+            self.rendus.popitem(last=False)
+        return rendu
+
+    def dessiner_case(self, surface: pygame.Surface, x: int, y: int, pos: tuple[int, int]) -> None:
+        """
+        Dessine le sol de la case (x, y), puis son mur s'il y en a un.
+
+        Args:
+            surface (pygame.Surface): La surface sur laquelle dessiner.
+            x (int): La coordonnée x de la case.
+            y (int): La coordonnée y de la case.
+            pos (tuple[int, int]): La position de la case sur la surface.
+        """
+        surface.blit(self.tilesets["terrain"].tiles["ground"], pos)
+        mur = self.image_mur(x, y)
+        if mur is not None:
+            surface.blit(mur, pos)
+
+    def redessiner_case(self, x: int, y: int) -> None:
+        """
+        Redessine la case (x, y) dans son bloc pré-rendu, s'il est en cache (sinon il sera dessiné à jour
+        au prochain affichage).
+
+        Args:
+            x (int): La coordonnée x de la case modifiée.
+            y (int): La coordonnée y de la case modifiée.
+        """
+        rendu = self.rendus.get((x // TUILES_RENDU, y // TUILES_RENDU))
+        if rendu is not None:
+            pos = ((x % TUILES_RENDU) * self.tile_size[0], (y % TUILES_RENDU) * self.tile_size[1])
+            self.dessiner_case(rendu, x, y, pos)
 
     def detect_collision(self, wall_rect: pygame.Rect, other_rect: pygame.Rect) -> bool:
         """
@@ -279,6 +505,9 @@ class Tilemap:
     def correct_movement(self, other, velocity: Vector) -> Vector:
             """
             Corrige le mouvement de l'objet 'other' en fonction de la collision avec les murs du tilemap.
+
+            Seules les tuiles couvertes par la position future de l'objet, plus une tuile de marge, sont testées,
+            ligne par ligne : le coût ne dépend pas de la taille de la carte.
             
             Args:
                 other (object): L'objet avec lequel la collision doit être vérifiée.
@@ -291,11 +520,18 @@ class Tilemap:
             future_rect = other.hitbox.copy()
             future_rect.center = (Vector(*other.rect.center) + velocity).coords 
 
-            for (x, y), wall in self.walls.items():
-            
-                wall_rect = wall.get_rect()
-                wall_rect.topleft = (x * self.tile_size[0] + self.offset.x, y * self.tile_size[1] + self.offset.y)
-                velocity = self.resolve_collision(future_rect, wall_rect, velocity)
+            # tuiles autour de la position future (la résolution d'une collision peut pousser l'objet d'une tuile)
+            tile_width, tile_height = self.tile_size
+            start_x = int((future_rect.left - self.offset.x) // tile_width) - 1
+            start_y = int((future_rect.top - self.offset.y) // tile_height) - 1
+            end_x = int((future_rect.right - self.offset.x) // tile_width) + 2
+            end_y = int((future_rect.bottom - self.offset.y) // tile_height) + 2
+
+            for y in range(start_y, end_y):
+                for x in range(start_x, end_x):
+                    if self.is_wall(x, y):
+                        wall_rect = pygame.Rect((x * tile_width + self.offset.x, y * tile_height + self.offset.y), self.tile_size)
+                        velocity = self.resolve_collision(future_rect, wall_rect, velocity)
 
             return velocity
     
@@ -303,6 +539,8 @@ class Tilemap:
         """
         Vérifie les portes et effectue les actions appropriées en fonction de la distance entre le joueur et les portes.
 
+        Seuls les groupes de portes des blocs autour du joueur sont testés (voir indexer_portes).
+
         Args:
             joueur (Joueur): L'objet représentant le joueur.
             portes (list[Porte]): La liste des portes à vérifier.
@@ -310,10 +548,21 @@ class Tilemap:
         Returns:
             None
         """
+        if portes is not self.liste_portes:
+            self.indexer_portes(portes)
+
+        # zone où chercher : la portée, plus la taille d'un groupe puisqu'il est indexé par son coin
+        portee = 100
+        rayon = int(portee // min(self.tile_size)) + 2
+        x = int((joueur.rect.centerx - self.offset.x) // self.tile_size[0])
+        y = int((joueur.rect.centery - self.offset.y) // self.tile_size[1])
+
         # Vérifier les portes
-        for i, porte in enumerate(portes):
-            distance = (Vector(*porte.rect.center) - Vector(*joueur.rect.center)).distance()
-            if distance < 100:
+        for cle, groupe in list(self.portes_proches(x - rayon, y - rayon, x + rayon + 1, y + rayon + 1)):
+            porte = groupe[0]
+            centre = porte.position + self.offset + Vector(*porte.rect.size) / 2
+            distance = (centre - Vector(*joueur.rect.center)).distance()
+            if distance < portee:
                 # savoir si le joueur a une clé
                 for j, objet in enumerate(joueur.inventaire):
                     if objet.nom == "Clé" and objet.quantite > 0:
@@ -325,33 +574,27 @@ class Tilemap:
                         # son d'ouverte de porte
                         pygame.mixer.Sound("ressources/audio/" + SOUNDS["porte"]).play()
 
-                        # suppression de la porte et des portes adjacentes
-                        portes_a_supprimer = [i]
-                        for k, porte_adjacente in enumerate(portes):
-                            if porte_adjacente.x == porte.x and porte_adjacente.y == porte.y + 1:
-                                portes_a_supprimer.append(k)
-                            elif porte_adjacente.x == porte.x +1 and porte_adjacente.y == porte.y + 1:
-                                portes_a_supprimer.append(k)
-                            elif porte_adjacente.x == porte.x + 1 and porte_adjacente.y == porte.y:
-                                portes_a_supprimer.append(k)
-                            
-
-                        while len(portes_a_supprimer) > 0:
-                            portes.pop(portes_a_supprimer.pop(0))
-
-                            portes_a_supprimer = [i - 1 for i in portes_a_supprimer]
-
-
-                        # suppression des murs
-                        self.walls.pop((porte.x, porte.y))
-                        self.walls.pop((porte.x + 1, porte.y))
-                        self.walls.pop((porte.x, porte.y + 1))
-                        self.walls.pop((porte.x + 1, porte.y + 1))
-
-                        # mise à jour de la matrice
-                        self.matrice[porte.y][porte.x] = 1
-                        self.matrice[porte.y][porte.x + 1] = 1
-                        self.matrice[porte.y + 1][porte.x] = 1
-                        self.matrice[porte.y + 1][porte.x + 1] = 1
+                        self.ouvrir_porte(cle)
                         break
 
+    def ouvrir_porte(self, cle: tuple[int, int]) -> None:
+        """
+        Ouvre un groupe de portes : il est retiré de l'index et de la liste des portes, et ses cases deviennent du sol.
+
+        Args:
+            cle (tuple[int, int]): La case en haut à gauche du groupe.
+
+        Returns:
+            None
+        """
+        bloc = (cle[0] // TUILES_RENDU, cle[1] // TUILES_RENDU)
+        groupe = self.doors[bloc].pop(cle)
+        if not self.doors[bloc]:
+            del self.doors[bloc]
+
+        # la liste est celle sauvegardée avec la partie
+        self.liste_portes[:] = [porte for porte in self.liste_portes if porte not in groupe]
+
+        for porte in groupe:
+            # les cases de la porte deviennent du sol, les murs autour changent de texture
+            self.set_cell(porte.x, porte.y, 1)
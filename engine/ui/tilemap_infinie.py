@@ -0,0 +1,217 @@
+from collections import OrderedDict
+from typing import Optional
+
+import pygame
+
+from engine.generation.troncons import TUILES_TRONCON, generer_troncon
+from engine.ui.tilemap import TABLE_EST_MUR, Tilemap, textures_murs
+from engine.ui.tileset import Tileset
+from engine.utils.vector import Vector
+
+from game.constantes import TILEMAP_PATH, NB_MAX_TRONCONS
+
+
+class TilemapInfinie(Tilemap):
+    """Carte du monde sans fin, découpée en tronçons carrés générés à la demande.
+
+    Un tronçon n'est généré que lorsque la caméra (ou une collision) s'en approche, à partir de la graine du monde
+    et de ses coordonnées seulement. Les tronçons les moins récemment utilisés sont oubliés au-delà de
+    NB_MAX_TRONCONS : la mémoire reste bornée, et un tronçon oublié est régénéré à l'identique s'il le faut.
+    Les cases modifiées (set_cell) sont gardées à part et réappliquées au tronçon régénéré.
+
+    La carte n'a pas de matrice : matrice, size et walls valent None, et les méthodes qui s'en servent
+    dans Tilemap sont redéfinies pour passer par les tronçons.
+
+    Les tronçons ne contiennent pas de portes : verifier_portes (hérité) n'en trouve donc aucune,
+    mais ouvrirait comme sur un étage normal celles qui seraient ajoutées à la partie.
+    """
+
+    __slots__ = ["graine", "troncons", "murs", "modifications", "nb_max_troncons"]
+
+    def __init__(self, graine, tile_size:tuple[int, int]=(32, 32), nb_max_troncons:int=NB_MAX_TRONCONS) -> None:
+        """
+        Initialise la carte du monde sans fin. L'entrée est au centre de la caverne du tronçon (0, 0).
+
+        Paramètres :
+            - graine (int | str): La graine du monde.
+            - tile_size (tuple[int, int]): La taille des tuiles de la carte.
+            - nb_max_troncons (int): Le nombre de tronçons gardés en mémoire.
+
+        Renvoie :
+            None
+        """
+        # pas de matrice : les cases sont dans les tronçons
+        self.matrice = None
+        self.size = None
+        self.walls = None
+
+        self.graine = graine
+        self.tile_size = tile_size
+        self.nb_max_troncons = nb_max_troncons
+        self.troncons: OrderedDict[tuple[int, int], tuple[list[bytearray], tuple[int, int]]] = OrderedDict()
+        self.murs: dict[tuple[int, int], bytearray] = {}
+        self.modifications: dict[tuple[int, int], dict[tuple[int, int], int]] = {}
+        self.rendus: OrderedDict[tuple[int, int], pygame.Surface] = OrderedDict()
+        self.doors = {}
+        self.liste_portes = None
+        self.tilesets = {
+            "terrain": Tileset(TILEMAP_PATH, (8, 8), mode="terrain"),
+        }
+        self.images_murs = self.creer_images_murs()
+
+        # le joueur apparaît au coin commun des quatre tuiles de la case de sol du centre
+        x, y = self.troncon(0, 0)[1]
+        self.entree = Vector(x + 1, y + 1)
+        self.sortie = None # le monde n'a pas de sortie
+
+        self.offset = Vector(0, 0)
+
+    def troncon(self, cx: int, cy: int) -> tuple[list[bytearray], tuple[int, int]]:
+        """
+        Renvoie un tronçon, en le générant s'il n'est pas en mémoire, et oublie les plus anciens si besoin.
+
+        Args:
+            cx (int): La colonne du tronçon.
+            cy (int): La ligne du tronçon.
+
+        Renvoie:
+            tuple[list[bytearray], tuple[int, int]]: Les lignes du tronçon et la tuile du centre de sa caverne.
+        """
+        cle = (cx, cy)
+        troncon = self.troncons.get(cle)
+        if troncon is not None:
+            self.troncons.move_to_end(cle)
+            return troncon
+
+        troncon = self.troncons[cle] = generer_troncon(self.graine, cx, cy)
+        for (x, y), code in self.modifications.get(cle, {}).items():
+            troncon[0][y][x] = code
+        while len(self.troncons) > self.nb_max_troncons:
+            ancien, _ = self.troncons.popitem(last=False)
+            self.murs.pop(ancien, None)
+        return troncon
+
+    def is_wall(self, x, y) -> bool:
+        """
+        Vérifie si la case aux coordonnées (x, y) est un mur, en générant son tronçon si besoin.
+
+        Args:
+            x (int): La coordonnée x de la case.
+            y (int): La coordonnée y de la case.
+
+        Renvoie:
+            bool: True si la case est un mur, False sinon.
+        """
+        cx, x = divmod(int(x), TUILES_TRONCON)
+        cy, y = divmod(int(y), TUILES_TRONCON)
+        return self.troncon(cx, cy)[0][y][x] in [0, 2]
+
+    def setup_walls(self) -> None:
+        """
+        Oublie les textures des murs et les blocs pré-rendus : ils sont recalculés à la demande.
+
+        Renvoie:
+            None
+        """
+        self.murs.clear()
+        self.rendus.clear()
+
+    def set_cell(self, x: int, y: int, code: int) -> None:
+        """
+        Modifie une case du monde, puis recalcule les textures des cases autour d'elle.
+
+        La modification est gardée : elle est réappliquée si le tronçon est oublié puis régénéré.
+
+        Args:
+            x (int): La coordonnée x de la case.
+            y (int): La coordonnée y de la case.
+            code (int): Le nouveau code de la case (1 pour du sol, 0 pour un mur...).
+
+        Renvoie:
+            None
+        """
+        cx, lx = divmod(int(x), TUILES_TRONCON)
+        cy, ly = divmod(int(y), TUILES_TRONCON)
+        self.modifications.setdefault((cx, cy), {})[(lx, ly)] = code
+        self.troncon(cx, cy)[0][ly][lx] = code
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                self.retile(x + dx, y + dy)
+
+    def retile(self, x: int, y: int) -> None:
+        """
+        Recalcule la texture de la case (x, y) si les murs de son tronçon sont en mémoire
+        (sinon ils seront calculés à jour), et la redessine dans son bloc pré-rendu.
+
+        Args:
+            x (int): La coordonnée x de la case.
+            y (int): La coordonnée y de la case.
+
+        Renvoie:
+            None
+        """
+        cx, lx = divmod(x, TUILES_TRONCON)
+        cy, ly = divmod(y, TUILES_TRONCON)
+        murs = self.murs.get((cx, cy))
+        if murs is not None:
+            murs[ly * TUILES_TRONCON + lx] = self.texture_case(x, y)
+        self.redessiner_case(x, y)
+
+    def murs_troncon(self, cx: int, cy: int) -> bytearray:
+        """
+        Renvoie les identifiants des textures des murs d'un tronçon (voir TEXTURES_MURS), ligne par ligne.
+
+        Les textures des murs du bord dépendent des tronçons voisins, qui sont générés si besoin
+        (sans leurs propres murs : il n'y a pas de réaction en chaîne).
+
+        Args:
+            cx (int): La colonne du tronçon.
+            cy (int): La ligne du tronçon.
+
+        Renvoie:
+            bytearray: Les identifiants des textures, 0 pour le sol.
+        """
+        lignes = self.troncon(cx, cy)[0]
+        murs = self.murs.get((cx, cy))
+        if murs is not None:
+            return murs
+
+        # grille du tronçon bordée des cases des tronçons voisins
+        x0, y0 = cx * TUILES_TRONCON, cy * TUILES_TRONCON
+        x1, y1 = x0 + TUILES_TRONCON, y0 + TUILES_TRONCON
+        haut = bytes(self.is_wall(x, y0 - 1) for x in range(x0 - 1, x1 + 1))
+        bas = bytes(self.is_wall(x, y1) for x in range(x0 - 1, x1 + 1))
+        milieu = b"".join(
+            bytes((self.is_wall(x0 - 1, y0 + y),)) + ligne.translate(TABLE_EST_MUR) + bytes((self.is_wall(x1, y0 + y),))
+            for y, ligne in enumerate(lignes)
+        )
+        murs = textures_murs(haut + milieu + bas, TUILES_TRONCON, TUILES_TRONCON)
+
+        # les voisins ont pu faire oublier ce tronçon : il est régénéré avec ses murs
+        self.troncon(cx, cy)
+        self.murs[(cx, cy)] = murs
+        return murs
+
+    def limites(self) -> None:
+        """
+        Le monde sans fin n'a pas de limites.
+
+        Renvoie:
+            None
+        """
+        return None
+
+    def image_mur(self, x: int, y: int) -> Optional[pygame.Surface]:
+        """
+        Renvoie l'image du mur aux coordonnées (x, y), en générant son tronçon si besoin.
+
+        Args:
+            x (int): La coordonnée x de la case.
+            y (int): La coordonnée y de la case.
+
+        Renvoie:
+            pygame.Surface | None: L'image du mur, ou None si la case n'est pas un mur.
+        """
+        cx, x = divmod(x, TUILES_TRONCON)
+        cy, y = divmod(y, TUILES_TRONCON)
+        return self.images_murs[self.murs_troncon(cx, cy)[y * TUILES_TRONCON + x]]
@@ -1,5 +1,40 @@
+from hashlib import sha256
+import os
+
 import pygame
 
+from game.constantes import DOSSIER_CACHE_TILESETS
+
+
+# Tuiles gardées pour chaque mode de feuille de textures : nom -> indice dans la feuille (lue ligne par ligne)
+TUILES_NOMMEES = {
+    "terrain": {
+        "ground": 580,
+        "down_left_int_wall": 568,
+        "down_right_int_wall": 571,
+        "up_left_int_wall": 472,
+        "up_right_int_wall": 475,
+        "up_wall": 473,
+        "down_wall": 570,
+        "left_wall": 504,
+        "right_wall": 539,
+        "stone": 454,
+        "up_left_ext_wall": 410,
+        "up_right_ext_wall": 411,
+        "down_left_ext_wall": 442,
+        "down_right_ext_wall": 443,
+    },
+}
+
+# Côté des tuiles une fois agrandies, en pixels
+TAILLE_TUILE = 32
+
+# Tuiles déjà chargées, par (chemin, taille des tuiles, mode) : chaque carte les réutilise au lieu de relire la feuille
+_TUILES_CHARGEES = {}
+
+# Clés des tuiles chargées déjà converties au format de l'écran
+_TUILES_CONVERTIES = set()
+
 
 class Tileset:
     """Classe représentant la feuille de textures de la carte."""
@@ -25,7 +60,10 @@ class Tileset:
     def load(self, path: str, name: str = "") -> None:
             """
             Charge les tuiles à partir d'un fichier image spécifié par le chemin `path`.
-            Les tuiles sont stockées dans la liste `self.tiles`.
+            Les tuiles sont stockées dans `self.tiles` : une liste de toutes les tuiles, ou un dictionnaire
+            des seules tuiles nommées si le tileset est dans TUILES_NOMMEES.
+
+            Les tuiles sont lues une seule fois par partie, puis converties au format de l'écran dès qu'il existe.
             
             Args:
                 path (str): Le chemin du fichier image contenant les tuiles.
@@ -34,33 +72,90 @@ class Tileset:
             Returns:
                 None
             """
-            
+            cle = (path, self.tile_size, name)
+            tiles = _TUILES_CHARGEES.get(cle)
+            if tiles is None:
+                tiles = _TUILES_CHARGEES[cle] = self.decouper(path, name)
+
+            if cle not in _TUILES_CONVERTIES and pygame.display.get_surface() is not None:
+                if isinstance(tiles, dict):
+                    tiles = {nom: tile.convert_alpha() for nom, tile in tiles.items()}
+                else:
+                    tiles = [tile.convert_alpha() for tile in tiles]
+                _TUILES_CHARGEES[cle] = tiles
+                _TUILES_CONVERTIES.add(cle)
+
+            self.tiles = tiles.copy()
+
+    def decouper(self, path: str, name: str) -> "list[pygame.Surface] | dict[str, pygame.Surface]":
+            """
+            Découpe la feuille de textures en tuiles agrandies à TAILLE_TUILE pixels.
+
+            Args:
+                path (str): Le chemin du fichier image contenant les tuiles.
+                name (str): Le nom du tileset.
+
+            Returns:
+                list[pygame.Surface] | dict[str, pygame.Surface]: Toutes les tuiles, ou les seules tuiles nommées
+                                                                 du tileset (voir charger_atlas).
+            """
+            noms = TUILES_NOMMEES.get(name)
+            if noms is not None:
+                atlas = self.charger_atlas(path, noms)
+                return {nom: atlas.subsurface((i * TAILLE_TUILE, 0, TAILLE_TUILE, TAILLE_TUILE)) for i, nom in enumerate(noms)}
+
             image = pygame.image.load(path)
-            #image = image.convert_alpha()
+            tiles = []
             for y in range(0, image.get_height(), self.tile_size[1]):
                 for x in range(0, image.get_width(), self.tile_size[0]):
-                    tile = pygame.transform.scale(image.subsurface(pygame.Rect(x, y, self.tile_size[0], self.tile_size[1])), (32, 32))
-                    self.tiles.append(tile)
-
-            # process the name of the tileset
-            if name == "terrain":
-                self.tiles = {
-                    "ground": self.tiles[580],
-                    "down_left_int_wall": self.tiles[568],
-                    "down_right_int_wall": self.tiles[571],
-                    "up_left_int_wall": self.tiles[472],
-                    "up_right_int_wall": self.tiles[475],
-                    "up_wall": self.tiles[473],
-                    "down_wall": self.tiles[570],
-                    "left_wall": self.tiles[504],
-                    "right_wall": self.tiles[539],
-                    "stone": self.tiles[454],
-                    "up_left_ext_wall": self.tiles[410],
-                    "up_right_ext_wall": self.tiles[411],
-                    "down_left_ext_wall": self.tiles[442],
-                    "down_right_ext_wall": self.tiles[443],
-                }
-            
+                    tile = pygame.transform.scale(image.subsurface(pygame.Rect(x, y, self.tile_size[0], self.tile_size[1])), (TAILLE_TUILE, TAILLE_TUILE))
+                    tiles.append(tile)
+            return tiles
+
+    def charger_atlas(self, path: str, noms: dict[str, int]) -> pygame.Surface:
+            """
+            Renvoie l'atlas des tuiles nommées : une ligne de tuiles agrandies, dans l'ordre de noms.
+
+            L'atlas est enregistré dans DOSSIER_CACHE_TILESETS, sous un nom qui dépend de la feuille (chemin,
+            taille et date de modification) et des tuiles demandées : il est relu tant qu'elles ne changent pas.
+
+            Args:
+                path (str): Le chemin du fichier image contenant les tuiles.
+                noms (dict[str, int]): Les tuiles à garder, par nom, avec leur indice dans la feuille.
+
+            Returns:
+                pygame.Surface: L'atlas.
+            """
+            taille_atlas = (len(noms) * TAILLE_TUILE, TAILLE_TUILE)
+            statistiques = os.stat(path)
+            cle = f"{os.path.abspath(path)}:{statistiques.st_size}:{statistiques.st_mtime_ns}:{self.tile_size}:{TAILLE_TUILE}:{list(noms.items())}"
+            chemin = os.path.join(DOSSIER_CACHE_TILESETS, sha256(cle.encode()).hexdigest()[:32] + ".png")
+
+            try:
+                atlas = pygame.image.load(chemin)
+                if atlas.get_size() == taille_atlas:
+                    return atlas
+            except (OSError, pygame.error):
+                pass # pas encore en cache ou illisible : l'atlas est refait
+
+            image = pygame.image.load(path)
+            colonnes = image.get_width() // self.tile_size[0]
+            atlas = pygame.Surface(taille_atlas, 0, image)
+            for i, indice in enumerate(noms.values()):
+                ligne, colonne = divmod(indice, colonnes)
+                source = image.subsurface(pygame.Rect(colonne * self.tile_size[0], ligne * self.tile_size[1], *self.tile_size))
+                # agrandie directement dans l'atlas, sans mélange de la transparence
+                pygame.transform.scale(source, (TAILLE_TUILE, TAILLE_TUILE), atlas.subsurface((i * TAILLE_TUILE, 0, TAILLE_TUILE, TAILLE_TUILE)))
+
+            temporaire = chemin + ".tmp.png"
+            try:
+                os.makedirs(DOSSIER_CACHE_TILESETS, exist_ok=True)
+                pygame.image.save(atlas, temporaire)
+                os.replace(temporaire, chemin) # écriture atomique : jamais de fichier à moitié écrit
+            except (OSError, pygame.error) as e:
+                print("Impossible d'enregistrer le tileset dans le cache :", e)
+            return atlas
+
     def get(self, index: int) -> pygame.Surface:
             """
             Renvoie la surface correspondante à l'index spécifié.
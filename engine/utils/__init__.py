@@ -1,2 +1,3 @@
 from .vector import Vector
-from .image import resize
\ No newline at end of file
+from .image import resize
+from .assets import AssetCache, ASSETS
\ No newline at end of file
@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from typing import Optional
+from weakref import WeakValueDictionary
+
+import pygame
+
+
+class AssetCache:
+    """Cache des images lues sur le disque, partagées par tous les objets qui les affichent.
+
+    Une image est identifiée par son chemin, sa taille après redimensionnement et sa couleur transparente :
+    le fichier n'est décodé qu'une fois, quel que soit le nombre de gobelins ou de portes qui l'utilisent.
+    Les images sont partagées : elles ne doivent pas être modifiées (il faut dessiner sur une copie).
+
+    Les images sont référencées faiblement : une image reste en cache tant qu'un objet la garde.
+    Les taille_max dernières images demandées sont en plus gardées par le cache lui-même, pour ne pas
+    relire une image dès que ses objets disparaissent (par exemple entre deux étages).
+    """
+
+    __slots__ = ["images", "recentes", "converties", "taille_max"]
+
+    def __init__(self, taille_max: Optional[int] = None) -> None:
+        """
+        Initialise le cache.
+
+        Args:
+            taille_max (int, optional): Le nombre d'images gardées par le cache même si plus aucun objet
+                                        ne les utilise. Par défaut None (toutes les images sont gardées).
+        """
+        self.images: WeakValueDictionary[tuple, pygame.Surface] = WeakValueDictionary()
+        self.recentes: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.converties: set[tuple] = set()
+        self.taille_max = taille_max
+
+    def charger(self, chemin: str, echelle: Optional[tuple[int, int]] = None, colorkey: Optional[tuple[int, int, int]] = None) -> pygame.Surface:
+        """
+        Renvoie une image, en la lisant sur le disque si elle n'est pas en cache.
+
+        L'image est convertie au format de l'écran dès qu'il existe (avant, elle est gardée telle quelle
+        et convertie à la demande suivante).
+
+        Args:
+            chemin (str): Le chemin du fichier image.
+            echelle (tuple[int, int], optional): La taille de l'image redimensionnée. Par défaut None (taille du fichier).
+            colorkey (tuple[int, int, int], optional): La couleur transparente. Par défaut None.
+
+        Returns:
+            pygame.Surface: L'image, partagée : ne pas la modifier.
+        """
+        cle = (chemin, echelle, colorkey)
+        image = self.trouver(cle)
+        if image is not None:
+            return image
+
+        image = self.images.get(cle)
+        if image is None:
+            image = pygame.image.load(chemin)
+            if echelle is not None:
+                image = pygame.transform.scale(image, echelle)
+
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+
+        if colorkey is not None:
+            image.set_colorkey(colorkey)
+
+        return self.ajouter(cle, image)
+
+    def decouper(self, chemin: str, zone: tuple[int, int, int, int], colorkey: Optional[tuple[int, int, int]] = None) -> pygame.Surface:
+        """
+        Renvoie une partie d'une image, copiée sur un fond noir opaque.
+
+        Args:
+            chemin (str): Le chemin du fichier image.
+            zone (tuple[int, int, int, int]): Le rectangle (x, y, largeur, hauteur) à copier.
+            colorkey (tuple[int, int, int], optional): La couleur transparente. Par défaut None.
+
+        Returns:
+            pygame.Surface: L'image découpée, partagée : ne pas la modifier.
+        """
+        cle = ("decoupe", chemin, zone, colorkey)
+        image = self.trouver(cle)
+        if image is not None:
+            return image
+
+        image = pygame.Surface(zone[2:])
+        image.blit(self.charger(chemin), (0, 0), zone)
+        if pygame.display.get_surface() is not None:
+            image = image.convert()
+
+        if colorkey is not None:
+            image.set_colorkey(colorkey)
+
+        return self.ajouter(cle, image)
+
+    def trouver(self, cle: tuple) -> Optional[pygame.Surface]:
+        """
+        Renvoie une image du cache si elle n'a pas besoin d'être (re)préparée.
+
+        Args:
+            cle (tuple): La clé de l'image.
+
+        Returns:
+            pygame.Surface | None: L'image, ou None si elle n'est pas en cache ou doit encore être convertie.
+        """
+        image = self.images.get(cle)
+        if image is None or (cle not in self.converties and pygame.display.get_surface() is not None):
+            return None
+
+        if cle in self.recentes:
+            self.recentes.move_to_end(cle)
+        else:
+            self.garder(cle, image)
+        return image
+
+    def ajouter(self, cle: tuple, image: pygame.Surface) -> pygame.Surface:
+        """
+        Enregistre une image préparée dans le cache.
+
+        Args:
+            cle (tuple): La clé de l'image.
+            image (pygame.Surface): L'image.
+
+        Returns:
+            pygame.Surface: L'image.
+        """
+        if pygame.display.get_surface() is not None:
+            self.converties.add(cle)
+        else:
+            self.converties.discard(cle)
+
+        self.images[cle] = image
+        self.recentes.pop(cle, None)
+        self.garder(cle, image)
+        return image
+
+    def garder(self, cle: tuple, image: pygame.Surface) -> None:
+        """
+        Garde une image parmi les plus récentes, en oubliant les plus anciennes au-delà de taille_max.
+
+        Args:
+            cle (tuple): La clé de l'image.
+            image (pygame.Surface): L'image.
+        """
+        self.recentes[cle] = image
+        if self.taille_max is not None:
+            while len(self.recentes) > self.taille_max:
+                self.recentes.popitem(last=False)
+
+    def evincer(self) -> None:
+        """
+        Oublie les images qui ne sont plus utilisées par aucun objet.
+        """
+        self.recentes.clear()
+        self.converties.intersection_update(self.images.keys())
+
+
+# Cache des images du jeu
+ASSETS = AssetCache()
@@ -2,4 +2,4 @@ from .constantes import *
 from .objets import *
 from .entites import *
 from .game import Game
-from .utils import get_image
\ No newline at end of file
+from .utils import get_image, jeu_images
\ No newline at end of file
@@ -1,5 +1,6 @@
 DEBUG = False # Informations de débogage (affichage de la hitbox, etc.)
 GHOST = False # Mode fantôme (pas de collision avec les murs, grande vitesse, etc.)
+PROFILER_GENERATION = False # Affiche la durée et les allocations de chaque phase de la génération des étages
 
 # constantes du jeu
 FRAME_RATE = 30 # En Hz (ou s-1)
@@ -34,6 +35,17 @@ SWORD_SPRITE = "ressources/objects/sword.png" # Dossier contenant les sprites de
 
 TAILLE_DONGEON = (50, 50) # Taille du dongeon en tiles
 
+DOSSIER_CACHE_ETAGES = "data/cache/etages" # Dossier du cache des étages générés
+TAILLE_MAX_CACHE_ETAGES = 32 * 1024 * 1024 # En octets
+DOSSIER_CACHE_TILESETS = "data/cache/tilesets" # Dossier des tuiles agrandies de la carte
+
+MODE_ETAGES = "etages" # Partie classique : des étages de taille fixe, une sortie par étage
+MODE_INFINI = "infini" # Monde sans fin, généré par tronçons autour du joueur
+NB_MAX_TRONCONS = 16 # Nombre de tronçons du monde sans fin gardés en mémoire
+
+TUILES_RENDU = 16 # Côté, en tuiles, des blocs pré-rendus du sol et des murs
+NB_MAX_RENDUS = 24 # Nombre de blocs pré-rendus gardés en mémoire (un écran en montre au plus 9)
+
 
 SOUNDS = { 
     "OST": [
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 
 import pygame
 
-from engine.utils import Vector
+from engine.utils import ASSETS, Vector
 
 from .entite import Entite
 
@@ -49,10 +49,8 @@ class Cle(Entite):
         )
         self.est_recuperee = False
 
-        self.sheet = pygame.image.load("ressources/objects/key.png")
-        self.image = pygame.Surface((32, 32))
-        self.image.blit(self.sheet, (0, 0), (0, 0, 32, 32))
-        self.image.set_colorkey((0, 0, 0))
+        self.sheet = ASSETS.charger("ressources/objects/key.png")
+        self.image = ASSETS.decouper("ressources/objects/key.png", (0, 0, 32, 32), (0, 0, 0))
         self.rect = self.image.get_rect()
 
     def recuperer(self, joueur: Joueur) -> bool:
@@ -305,7 +305,8 @@ class Entite(pygame.sprite.Sprite):
 
 
             if self.vitesse > 0 and self.rouge_jusqua is not None and datetime.datetime.now() < self.rouge_jusqua:
-                #dessin de l'entité en rouge
+                #dessin de l'entité en rouge, sur une copie : les images sont partagées entre les entités
+                image = image.copy()
                 image.fill((255, 0, 0, 128), special_flags=pygame.BLEND_RGBA_MULT)
                 screen.blit(image, self.rect.topleft)
             else:
@@ -9,9 +9,10 @@ from datetime import datetime
 import pygame
 
 # Bibliothèques locales
-from engine.utils import Vector
+from engine.utils import ASSETS, Vector
 from .entite import Entite
 from .contenant import Contenant
+from ..utils import jeu_images
 from ..constantes import NB_EMPLACEMENTS_INVENTAIRE, SOUNDS, PLAYER_SPEED, VITESSE_MAX_JOUEUR
 
 if TYPE_CHECKING:
@@ -56,11 +57,14 @@ class Joueur(Entite, Contenant):
 
 
         # Déclarer la feuille de texture du joueur
-        self.sheet = pygame.image.load("ressources/players/player.png")
+        self.sheet = ASSETS.charger("ressources/players/player.png")
         self.image_sheet_size = (32, 48)
 
+        # répertorier les images {orientation: {frame: image}}, découpées une fois par feuille
+        self.images = jeu_images(("Joueur", "ressources/players/player.png"), self.creer_images)
+
         # Charger l'image du joueur
-        self.image = self.get_image(4, 9)
+        self.image = self.images["S"][0]
 
         # Créer un rect pour l'image du joueur
         self.rect = self.image.get_rect()
@@ -87,8 +91,24 @@ class Joueur(Entite, Contenant):
         # intervalle de temps avec la frame précédente
         self.last_frame = time()
 
-        # répertorier les images {orientation: {frame: image}}
-        self.images = { # TODO: Modifier pour l'épée
+        # récupérer l'objet sélectionné
+        self.selected_item = self.get_selected_item()
+
+        # créer une ombre elliptique pour le joueur
+        
+        self.ombre = pygame.Surface((32, 12))
+        pygame.draw.ellipse(self.ombre, (64, 64, 64, 64), (0, 0, 32, 12))
+        self.ombre.set_colorkey((0, 0, 0))
+        self.ombre_rect = self.ombre.get_rect()
+
+    def creer_images(self) -> dict[str, dict[int, pygame.Surface]]:
+        """
+        Découpe les images d'animation du joueur dans sa feuille de texture.
+
+        Returns:
+            dict[str, dict[int, pygame.Surface]]: Les images, par orientation puis par frame.
+        """
+        return { # TODO: Modifier pour l'épée
             "N": {
                 0: self.get_image(0, 9),
                 1: self.get_image(0, 11),
@@ -131,16 +151,6 @@ class Joueur(Entite, Contenant):
             },
         }
 
-        # récupérer l'objet sélectionné
-        self.selected_item = self.get_selected_item()
-
-        # créer une ombre elliptique pour le joueur
-        
-        self.ombre = pygame.Surface((32, 12))
-        pygame.draw.ellipse(self.ombre, (64, 64, 64, 64), (0, 0, 32, 12))
-        self.ombre.set_colorkey((0, 0, 0))
-        self.ombre_rect = self.ombre.get_rect()
-
     def ajouter_vie(self, vie:int) -> int:
         """Ajoute de la vie au joueur
         
@@ -8,7 +8,8 @@ import pygame
 
 # Bibliothèques de l'application
 from .entite import Entite
-from engine.utils import Vector
+from ..utils import jeu_images
+from engine.utils import ASSETS, Vector
 
 
 class Gobelin(Entite):
@@ -39,15 +40,10 @@ class Gobelin(Entite):
         )
 
         # Déclarer la feuille de texture du monstre
-        self.sheet = pygame.image.load(f"ressources/entities/gobelin_{random.choice([1, 2])}.png")
+        chemin = f"ressources/entities/gobelin_{random.choice([1, 2])}.png"
+        self.sheet = ASSETS.charger(chemin)
         self.image_sheet_size = (32, 32)
 
-        # Charger l'image du monstre
-        self.image = self.get_image(1, 4)
-
-        # Créer un rect pour l'image du monstre
-        self.rect = self.image.get_rect()
-
         # definir une oriantation pour le monstre (par défault au sud)
         self.orientation = "S"
 
@@ -57,8 +53,23 @@ class Gobelin(Entite):
         # compter le temps de chaque frame
         self.clock = 0
 
-        # répertorier les images {orientation: {frame: image}}
-        self.images = {
+        # répertorier les images {orientation: {frame: image}}, découpées une fois par feuille
+        self.images = jeu_images(("Gobelin", chemin), self.creer_images)
+
+        # image de départ
+        self.image = self.images["S"][1]
+
+        # rect
+        self.rect = self.image.get_rect()
+
+    def creer_images(self) -> dict[str, dict[int, pygame.Surface]]:
+        """
+        Découpe les images d'animation du monstre dans sa feuille de texture.
+
+        Returns:
+            dict[str, dict[int, pygame.Surface]]: Les images, par orientation puis par frame.
+        """
+        return {
             "S": {
                 1: self.get_image(0, 4),
                 2: self.get_image(1, 4),
@@ -85,12 +96,6 @@ class Gobelin(Entite):
             }
         }
 
-        # image de départ
-        self.image = self.images["S"][1]
-
-        # rect
-        self.rect = self.image.get_rect()
-
     def from_json(data_json: dict) -> Gobelin:
         """
         Creates a Gobelin object from a JSON dictionary.
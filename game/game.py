@@ -1,16 +1,20 @@
 # Libraries de la bibliothèque standard
-from typing import List
+from random import Random, getrandbits
+from typing import List, Optional, Tuple, Union
 import importlib
 import json
 
 # Modules locaux
-from engine.generation import GenerateurCarte
+from engine.generation import CacheEtages, FloorPlan, construire_etage, formater_rapport, generer_contour_noir
 from engine.ui.porte import Porte
 from engine.utils import Vector
 from .entites import Entite, Joueur, Gobelin, ObjetAuSol
 
 from .objets import Cle, Prop
+from .constantes import DEBUG, DOSSIER_CACHE_ETAGES, MODE_ETAGES, MODE_INFINI, PROFILER_GENERATION, TAILLE_MAX_CACHE_ETAGES
 
+# Cache sur disque des étages déjà générés
+CACHE_ETAGES = CacheEtages(DOSSIER_CACHE_ETAGES, TAILLE_MAX_CACHE_ETAGES)
 
 
 OFFSET_PLACEMENT_X = 400
@@ -21,9 +25,9 @@ class Game:
     pour simplifier la sauvegarde du jeu en réunissant tout le contenu dans 
     une seule classe."""
 
-    __slots__ = ("numero", "nb_cles", "etage", "nb_cles_recuperees", "entites", "matrice", "score", "joueur", "taille_matrice", "nom", "start", "end", "portes")
+    __slots__ = ("numero", "nb_cles", "etage", "nb_cles_recuperees", "entites", "matrice", "score", "joueur", "taille_matrice", "nom", "start", "end", "portes", "mode", "graine")
 
-    def __init__(self, numero: int, nom: str, etage:int=1, taille_matrice:int=50,  nb_cles:int=0, nb_cles_recuperees:int=0, entites: List[Entite] = [], matrice: List[List[int]] = None, score:int=0, portes:List[Porte] = []) -> None:
+    def __init__(self, numero: int, nom: str, etage:int=1, taille_matrice:int=50,  nb_cles:int=0, nb_cles_recuperees:int=0, entites: List[Entite] = [], matrice: List[List[int]] = None, score:int=0, portes:List[Porte] = [], start:Optional[Tuple[int, int]] = None, end:Optional[Tuple[int, int]] = None, mode:str=MODE_ETAGES, graine:Optional[int]=None) -> None:
         """
         Initialise un objet de la classe Game.
 
@@ -38,6 +42,13 @@ class Game:
             matrice (List[List[int]], optional): La matrice représentant le jeu. Par défaut None.
             score (int, optional): Le score du joueur. Par défaut 0.
             portes (List[Porte], optional): La liste des portes présentes dans le jeu. Par défaut [].
+            start (Tuple[int, int], optional): La position de l'entrée dans la matrice. Par défaut None
+                                               (cherchée dans la matrice pour les anciennes sauvegardes).
+            end (Tuple[int, int], optional): La position de la sortie dans la matrice. Par défaut None.
+            mode (str, optional): MODE_ETAGES pour des étages de taille fixe, MODE_INFINI pour le monde sans fin
+                                  (sa carte n'est pas dans la matrice mais générée par tronçons). Par défaut MODE_ETAGES.
+            graine (int, optional): La graine de la partie : elle donne la graine de chaque étage (voir graine_etage)
+                                    ou celle du monde sans fin. Par défaut None (tirée au hasard).
         """
         
         self.numero = numero
@@ -47,6 +58,8 @@ class Game:
         self.nb_cles = nb_cles
         self.nb_cles_recuperees = nb_cles_recuperees
         self.etage = etage
+        self.mode = mode
+        self.graine = graine if graine is not None else getrandbits(32)
 
         self.entites = entites
         self.portes = portes
@@ -55,15 +68,19 @@ class Game:
         except IndexError:
             self.joueur = Joueur("Joueur", 100, Vector(0, 0))
             self.entites.append(self.joueur)
-        self.matrice = matrice
+        # une ligne d'octets par rangée : compact, et les codes se cherchent avec bytearray.find
+        self.matrice = [bytearray(row) for row in matrice] if matrice else matrice
 
-        self.start = None
-        self.end = None
+        self.start = Vector(*start) if start else None
+        self.end = Vector(*end) if end else None
 
         
 
         if matrice:
-            self.find_start_end()
+            if self.start is None or self.end is None:
+                self.find_start_end()
+        elif self.mode == MODE_INFINI:
+            self.matrice = []
         else:
             self.generate_map()
         
@@ -76,102 +93,108 @@ class Game:
         Recherche et définit les coordonnées du point de départ et du point d'arrivée dans la matrice.
         """
 
-        for y in range(len(self.matrice)):
-            for x in range(len(self.matrice[0])):
-                case = self.matrice[y][x]
+        for y, row in enumerate(self.matrice):
+            x = row.find(3)
+            if x != -1:
+                self.end = Vector(x, y)
+            x = row.find(4)
+            if x != -1:
+                self.start = Vector(x, y)
 
-                if case == 3:
-                    self.end = Vector(x, y)
-                elif case == 4:
-                    self.start = Vector(x, y)
-
-                if self.end and self.start: # arrêter la recherche si trouvé
-                    return
+            if self.end and self.start: # arrêter la recherche si trouvé
+                return
     
-    def generate_map(self) -> None:
-        """
-        Génère la carte du jeu en utilisant un générateur de carte.
-        Initialise la matrice de jeu avec les éléments générés.
-        Ajoute les portes, l'arrivée, le départ, les gobelins et les clés aux entités du jeu.
+    def graine_etage(self, etage: Optional[int] = None) -> str:
         """
-    
-        dg = GenerateurCarte(self.taille_matrice, self.taille_matrice, coef_difficulte=self.etage)
-        dg.generate_map()
-        dg.print_map()
-        self.matrice = dg.get_for_game()
+        Renvoie la graine d'un étage de la partie, tirée de la graine de la partie et du numéro de l'étage.
 
-        self.matrice= self.generer_contour_noir(self.matrice)
-
-        for y in range(len(self.matrice)):
-            for x in range(len(self.matrice[0])):
-                case = self.matrice[y][x]
-
-                if case == 2:
-                    porte = Porte(x, y)
-                    self.portes.append(porte)
+        Args:
+            etage (int, optional): Le numéro de l'étage. Par défaut None (l'étage courant).
 
+        Returns:
+            str: La graine de l'étage.
+        """
+        return f"{self.graine}:{self.etage if etage is None else etage}"
 
-                elif case == 3:
-                    self.end = Vector(x, y)
-                    # créer un prop pour la sortie
-                    prop = Prop("Arrivée", "ressources/objects/exit.png")
-                    self.entites.append(ObjetAuSol(prop, Vector((x-2)*32, (y+2)*32), collectible=False))
+    def generate_map(self, seed: Optional[Union[int, str, Random]] = None) -> None:
+        """
+        Génère la carte du jeu en utilisant un générateur de carte.
+        Initialise la matrice de jeu avec les éléments générés.
+        Ajoute les portes, l'arrivée, le départ, les gobelins et les clés aux entités du jeu.
 
-                elif case == 4:
-                    self.start = Vector(x, y)
-                    # créer un prop pour l'entrée
-                    prop = Prop("Départ", "ressources/objects/flag.png")
-                    self.entites.append(ObjetAuSol(prop, Vector((x-2)*32, (y+2)*32), collectible=False))
+        L'étage est d'abord cherché dans le cache des étages, et il y est enregistré après avoir été généré
+        (sauf si la graine est une instance de Random).
 
-                elif case == 6:
-                    self.entites.append(Gobelin(Vector(x*32, y*32)))
-                    self.matrice[y][x] = 1
+        Args:
+            seed (int | str | Random, optional): La graine de la carte. Une même graine donne toujours
+                                                 la même carte pour une taille et un étage donnés.
+                                                 Par défaut None (la graine de l'étage courant, voir graine_etage).
+        """
+        if seed is None:
+            seed = self.graine_etage()
+        en_cache = isinstance(seed, (int, str))
+
+        etage = CACHE_ETAGES.charger(seed, self.taille_matrice, self.etage) if en_cache else None
+        if etage is None:
+            if PROFILER_GENERATION:
+                etage, rapport = construire_etage(self.taille_matrice, self.etage, seed=seed, afficher=DEBUG, profiler=True, verifier=True)
+                print(f"Génération de l'étage {self.etage} ({self.taille_matrice}x{self.taille_matrice}) :")
+                print(formater_rapport(rapport))
+            else:
+                etage = construire_etage(self.taille_matrice, self.etage, seed=seed, afficher=DEBUG, verifier=True)
+            if en_cache:
+                CACHE_ETAGES.enregistrer(seed, self.taille_matrice, self.etage, etage)
+
+        self.charger_etage(etage)
+
+    def charger_etage(self, etage: FloorPlan) -> None:
+        """
+        Installe un étage généré : la matrice, les portes, l'arrivée, le départ, les gobelins et les clés.
 
-                elif case == 7:
-                    cle = Cle(1)
-                    self.entites.append(ObjetAuSol(cle, Vector(x*32, y*32), True))
-                    self.nb_cles += 1
-                    self.matrice[y][x] = 1
+        Toutes les positions viennent du plan : la matrice n'est pas parcourue.
 
-    def generer_contour_noir(self, matrice:List[List[int]]) -> tuple[List[List[int]], Vector, Vector]:
+        Args:
+            etage (FloorPlan): Le plan de l'étage, renvoyé par engine.generation.construire_etage.
+        """
+        self.matrice = etage.matrice
+
+        for x, y in etage.portes:
+            self.portes.append(Porte(x, y))
+
+        if etage.sortie:
+            x, y = etage.sortie
+            self.end = Vector(x, y)
+            # créer un prop pour la sortie
+            prop = Prop("Arrivée", "ressources/objects/exit.png")
+            self.entites.append(ObjetAuSol(prop, Vector((x-2)*32, (y+2)*32), collectible=False))
+
+        if etage.entree:
+            x, y = etage.entree
+            self.start = Vector(x, y)
+            # créer un prop pour l'entrée
+            prop = Prop("Départ", "ressources/objects/flag.png")
+            self.entites.append(ObjetAuSol(prop, Vector((x-2)*32, (y+2)*32), collectible=False))
+
+        for x, y in etage.monstres:
+            self.entites.append(Gobelin(Vector(x*32, y*32)))
+
+        for x, y in etage.cles:
+            cle = Cle(1)
+            self.entites.append(ObjetAuSol(cle, Vector(x*32, y*32), True))
+            self.nb_cles += 1
+
+    def generer_contour_noir(self, matrice:List[List[int]]) -> List[bytearray]:
         """
-        Génère un contour noir autour de la matrice donnée et effectue des modifications sur la matrice.
+        Génère un contour noir autour de la matrice donnée et double sa résolution.
 
         Args:
             matrice (List[List[int]]): La matrice d'entiers représentant le jeu.
 
         Returns:
-            tuple[List[List[int]], Vector, Vector]: Un tuple contenant la matrice modifiée avec le contour noir,
-            les coordonnées du point de départ et les coordonnées du point d'arrivée.
-
-        """
-        #  ajouter un cadre de 3 autour de la matrice pour éviter les sorties de la carte et rendre l'affichage des bords plus propre
-        matrice = [[0, 0, 0] + row + [0, 0, 0] for row in matrice]
-        matrice = [[0 for _ in range(len(matrice[0]))] for _ in range(3)] + matrice + [[0 for _ in range(len(matrice[0]))] for _ in range(3)]
-
-        square = [[0 for _ in range(len(matrice[0]) * 2)] for _ in range(len(matrice) * 2)]
-
-        for i, row in enumerate(matrice):
-            for j, col in enumerate(row):
-                square[i*2][j*2] = col
-                square[i*2][j*2+1] = col
-                square[i*2+1][j*2] = col
-                square[i*2+1][j*2+1] = col
-
-        # Pour les cases qui sont des entités ou des objets, on ne garde que la case du haut à gauche
-        for i, row in enumerate(square):
-            for j, col in enumerate(row):
-                if col in [3, 4, 6, 7]:
-                    square[i+1][j] = 1
-                    square[i][j+1] = 1
-                    square[i+1][j+1] = 1
-                    if col == 3:
-                        self.end = (i, j)
-                    elif col == 4:
-                        self.start = (i, j)
-                        print("ENTREE : ", i, j)
-
-        return square
+            List[bytearray]: La matrice modifiée avec le contour noir, une ligne d'octets par rangée.
+
+        """
+        return generer_contour_noir(matrice)
 
     def from_json(data_json: dict) -> None:
         """
@@ -200,6 +223,10 @@ class Game:
             portes=portes,
             matrice=data_json["matrice"],
             score=data_json["score"],
+            start=data_json.get("start"),
+            end=data_json.get("end"),
+            mode=data_json.get("mode", MODE_ETAGES),
+            graine=data_json.get("graine"),
         )
     
     def to_json(self) -> dict:
@@ -208,7 +235,7 @@ class Game:
 
         Retourne un dictionnaire contenant les attributs de l'objet sous forme de clés et leurs valeurs correspondantes.
         Les attributs inclus sont : 'numero', 'nom', 'etage', 'taille_matrice', 'nb_cles', 'nb_cles_recuperees', 'entites',
-        'portes', 'matrice' et 'score'.
+        'portes', 'matrice', 'score', 'start', 'end', 'mode' et 'graine'.
 
         Returns:
             dict: Un dictionnaire contenant les attributs de l'objet sous forme de clés et leurs valeurs correspondantes.
@@ -222,8 +249,12 @@ class Game:
             "nb_cles_recuperees": self.nb_cles_recuperees,
             "entites": [(entite.__class__.__name__, entite.to_json()) for entite in self.entites],
             "portes": [porte.to_json() for porte in self.portes],
-            "matrice": self.matrice,
-            "score": self.score
+            "matrice": [list(row) for row in self.matrice],
+            "score": self.score,
+            "start": [self.start.x, self.start.y] if self.start else None,
+            "end": [self.end.x, self.end.y] if self.end else None,
+            "mode": self.mode,
+            "graine": self.graine,
         }
     
     def save(self) -> None:
@@ -9,10 +9,10 @@ import pygame
 pygame.init()
 
 # Bibliothèques de l'application
-from engine.utils import Vector
+from engine.utils import ASSETS, Vector
 from game.constantes import SWORD_SPRITE
 from .objet import Objet
-from ..utils import get_image
+from ..utils import get_image, jeu_images
 
 
 if TYPE_CHECKING:
@@ -150,18 +150,13 @@ class Epee(Arme):
         self.last_frame = time.time()
 
         # feuillets de sprite
-        self.sheet = pygame.image.load(SWORD_SPRITE)
+        self.sheet = ASSETS.charger(SWORD_SPRITE)
         self.image_sheet_size = (96, 96)
 
-        icone= pygame.Surface((64, 64))
-        icone_src = pygame.image.load("ressources/objects/epee_icon.png")
-        icone.blit(icone_src, (0, 0))
-        icone.set_colorkey((0, 0, 0))
-
-        del icone_src
-
-        self.images = {
-            "common": icone,
+        # images de l'animation, découpées une fois pour toutes les épées
+        self.images = jeu_images(("Epee", SWORD_SPRITE), lambda: {
+            "common": self.creer_icone(),
+            "initiale": self.get_image(0, 0),
             "static": self.get_image(7, 0),
             "N": {
                 0: [self.get_image(5, 1), Vector(-10, -10)],
@@ -203,7 +198,7 @@ class Epee(Arme):
                 1: [self.get_image(7, 1), Vector(-30, -10)],
                 2: [self.get_image(7, 1), Vector(-30, -10)],
             },
-        }
+        })
 
         """self.images["common"] = self.images["NO"][1]
 
@@ -230,7 +225,7 @@ class Epee(Arme):
         }
 
         # image 
-        self.image = self.get_image(0, 0)
+        self.image = self.images["initiale"]
         self.rect = self.image.get_rect()
     
     def from_json(data_json: dict) -> Epee:
@@ -247,6 +242,18 @@ class Epee(Arme):
         epee.est_selectionne = data_json["est_selectionne"]
         return epee
 
+    def creer_icone(self) -> pygame.Surface:
+        """
+        Crée l'icône de l'épée, affichée dans l'inventaire.
+
+        Returns:
+            pygame.Surface: L'icône, le noir étant transparent.
+        """
+        icone= pygame.Surface((64, 64))
+        icone.blit(ASSETS.charger("ressources/objects/epee_icon.png"), (0, 0))
+        icone.set_colorkey((0, 0, 0))
+        return icone
+
     def get_image(self, row:int, col:int) -> pygame.Surface:
         """
         Renvoie l'image correspondante à la position donnée.
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import pygame
+from engine.utils import ASSETS
 
 from .objet import Objet
 
@@ -24,10 +24,8 @@ class Cle(Objet):
             quantite_max=1000,
         )
         
-        self.sheet = pygame.image.load("ressources/objects/key.png")
-        self.image = pygame.Surface((32, 32))
-        self.image.blit(self.sheet, (0, 0), (0, 0, 32, 32))
-        self.image.set_colorkey((0, 0, 0))
+        self.sheet = ASSETS.charger("ressources/objects/key.png")
+        self.image = ASSETS.decouper("ressources/objects/key.png", (0, 0, 32, 32), (0, 0, 0))
         self.rect = self.image.get_rect()
         
     def from_json(data_json: dict) -> Cle:
@@ -6,6 +6,8 @@ import datetime
 # Bibliothèques tierces
 import pygame
 
+from engine.utils import ASSETS
+
 # Bibliothèques de l'application
 from .objet import Objet
 
@@ -167,8 +169,8 @@ class Coeur(Consommable):
             effets=[("augmenter_vie_max", [20]), ("ajouter_vie", [20])],
             temps_attente=5000
         )
-        self.sheet = pygame.image.load("ressources/objects/heart.png")
-        self.image = pygame.transform.scale(self.sheet, (32, 32))
+        self.sheet = ASSETS.charger("ressources/objects/heart.png")
+        self.image = ASSETS.charger("ressources/objects/heart.png", (32, 32))
         self.rect = self.image.get_rect()
     
     def from_json(data_json: dict) -> Coeur:
@@ -228,8 +230,8 @@ class Potion(Consommable):
             temps_attente=5000
         )
 
-        self.sheet = pygame.image.load("ressources/objects/potion.png")
-        self.image = pygame.transform.scale(self.sheet, (32, 32))
+        self.sheet = ASSETS.charger("ressources/objects/potion.png")
+        self.image = ASSETS.charger("ressources/objects/potion.png", (32, 32))
 
         self.rect = self.image.get_rect()
     
@@ -276,9 +278,8 @@ class Botte(Consommable):
             temps_attente=5000  # 5 secondes
         )
 
-        self.sheet = pygame.image.load("ressources/objects/botte.png")
-        self.image = pygame.transform.scale(self.sheet, (32, 32))
-        self.image.set_colorkey((255, 255, 255))
+        self.sheet = ASSETS.charger("ressources/objects/botte.png")
+        self.image = ASSETS.charger("ressources/objects/botte.png", (32, 32), (255, 255, 255))
 
         self.rect = self.image.get_rect()
     
@@ -1,8 +1,6 @@
 from __future__ import annotations
 
-import pygame
-
-from engine.utils import Vector
+from engine.utils import ASSETS, Vector
 
 from game.objets.objet import Objet
 
@@ -28,10 +26,8 @@ class Prop(Objet):
             quantite_max=1
         )
         self.nom_image = nom_image
-        self.sheet = pygame.image.load(nom_image)
-        self.image = pygame.Surface((48, 48))
-        self.image.blit(self.sheet, (0, 0), (0, 0, 48, 48))
-        self.image.set_colorkey((0, 0, 0))
+        self.sheet = ASSETS.charger(nom_image)
+        self.image = ASSETS.decouper(nom_image, (0, 0, 48, 48), (0, 0, 0))
         #pygame.transform.rotozoom(self.image, 0, 0.1)
         self.rect = self.image.get_rect()
     
@@ -1,8 +1,12 @@
-from typing import Optional
+from typing import Any, Callable, Hashable, Optional
 
 import pygame
 
 
+# Jeux d'images d'animation déjà découpés, par classe et feuille de sprites (voir jeu_images)
+_JEUX_IMAGES: dict[Hashable, Any] = {}
+
+
 def get_image(self, col:int, row:int, resize:Optional[int]=None) -> pygame.Surface:
     """
     Récupère une image à partir d'une feuille de sprites et la redimensionne si nécessaire.
@@ -27,4 +31,24 @@ def get_image(self, col:int, row:int, resize:Optional[int]=None) -> pygame.Surfa
 
     image.set_colorkey((0, 0, 0))  
 
-    return image
\ No newline at end of file
+    return image
+
+
+def jeu_images(cle: Hashable, creer: Callable[[], Any]) -> Any:
+    """
+    Renvoie un jeu d'images d'animation (par exemple {orientation: {frame: image}}), partagé par toutes
+    les instances d'une classe qui utilisent la même feuille de sprites : il n'est découpé qu'une fois.
+
+    Les images sont partagées : il faut dessiner sur une copie pour les modifier.
+
+    Args:
+        cle (Hashable): L'identifiant du jeu d'images, par exemple (nom de la classe, chemin de la feuille).
+        creer (Callable[[], Any]): La fonction qui découpe le jeu d'images, appelée seulement au premier appel.
+
+    Returns:
+        Any: Le jeu d'images.
+    """
+    images = _JEUX_IMAGES.get(cle)
+    if images is None:
+        images = _JEUX_IMAGES[cle] = creer()
+    return images
\ No newline at end of file
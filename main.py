@@ -1,6 +1,7 @@
-from menu.menu_principal import MenuPrincipal
-
 if __name__ == "__main__":
+    # import dans le garde : les processus de travail du préchargement (lancés en "spawn") réimportent ce module,
+    # ils ne doivent charger ni tkinter ni pygame
+    from menu.menu_principal import MenuPrincipal
     
     # boucle infinie pour relancer le menu principal après la fin d'une partie 
     # l'évènement de sortie de du menu à été écrasé par sys.exit() pour éviter une boucle infinie
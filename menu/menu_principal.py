@@ -15,7 +15,8 @@ from .menu_score import Scores
 from .gestion_parties import GestionParties
 
 from game import Game
-from engine.runtime import Runtime
+from game.constantes import MODE_ETAGES
+from engine.runtime import Runtime, PRECHARGEUR
 
 
 class MenuPrincipal (tk.Tk):
@@ -134,6 +135,7 @@ class MenuPrincipal (tk.Tk):
         :paramètres: 
         :return:
         """
+        PRECHARGEUR.fermer()
         self.destroy()
         sys.exit()
 
@@ -181,11 +183,12 @@ class MenuPrincipal (tk.Tk):
         self.fen_launcher= New_game(self, self.l_fen_launcher, self.h_fen_launcher)
         
 
-    def create_new_game(self, nom: str, size: int) -> None:
+    def create_new_game(self, nom: str, size: int, mode: str = MODE_ETAGES) -> None:
         """
           fonction qui crée une nouvelle partie correspondant 
           :paramètres: nom: string donnant le nom de la partie
                      : size : int donnant la taille de la carte de la nouvelle partie
+                     : mode : MODE_ETAGES (étages de taille fixe) ou MODE_INFINI (monde sans fin)
           :return:
         """
         # récupérer un id unique
@@ -194,13 +197,13 @@ class MenuPrincipal (tk.Tk):
             id += 1
         
         # créer une nouvelle partie
-        game = Game(id, nom, etage=1, taille_matrice=int(size))
+        game = Game(id, nom, etage=1, taille_matrice=int(size), mode=mode)
 
         # enregistrer la partie pour créer un fichier de sauvegarde
         game.save()
 
         # ajouter la partie à la liste des parties
-        self.games[id] = {"nom": nom, "taille": size, "etage": 1, "score": 0}
+        self.games[id] = {"nom": nom, "taille": size if mode == MODE_ETAGES else "∞", "etage": 1, "score": 0}
 
         # enregistrer la liste des parties
         json.dump(self.games, open("data/saves.json", "w"))
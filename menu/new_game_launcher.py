@@ -1,11 +1,13 @@
 import tkinter as tk 
 from tkinter import messagebox
 
+from game.constantes import MODE_ETAGES, MODE_INFINI
+
 
 class New_game(tk.Toplevel):
     """Classe pour afficher une fenêtre permettant de paramétrer une nouvelle partie dans une fenêtre tkinter."""
 
-    __slots__=["master", "width","height", "saisie", "valeur_seuil","indication"]
+    __slots__=["master", "width","height", "saisie", "valeur_seuil","indication", "infini"]
 
     def __init__(self, master, width, height) -> None:
         """
@@ -33,6 +35,7 @@ class New_game(tk.Toplevel):
         - Un label pour indiquer de nommer le jeu.
         - Un champ de saisie pour le nom du jeu.
         - Une échelle pour ajuster la taille de la carte.
+        - Une case à cocher pour jouer dans le monde sans fin.
         - Un bouton pour valider les paramètres.
 
         """
@@ -44,7 +47,7 @@ class New_game(tk.Toplevel):
         scale_bg = "#1abc9c"
 
         self.title("Paramètres")
-        self.geometry("425x300")
+        self.geometry("425x350")
         self.configure(bg=bg_color)
 
         # Label pour indiquer de nommer le jeu
@@ -60,15 +63,20 @@ class New_game(tk.Toplevel):
         self.scale = tk.Scale(self, orient='horizontal', from_=50, to=150, resolution=1, tickinterval=50,length=400, label='Size of the map', variable=self.valeur_seuil, font=("Arial", 12), bg=bg_color, fg=fg_color, troughcolor=scale_bg, highlightbackground=bg_color)
         self.scale.grid(row=2, column=0, padx=10, pady=20)
 
+        # Case à cocher pour le monde sans fin (la taille de la carte ne compte plus)
+        self.infini = tk.BooleanVar()
+        self.case_infini = tk.Checkbutton(self, text="Endless floor", variable=self.infini, font=("Arial", 12), bg=bg_color, fg=fg_color, selectcolor=entry_bg, activebackground=bg_color, activeforeground=fg_color)
+        self.case_infini.grid(row=3, column=0)
+
         # Bouton pour valider les paramètres
         self.bouton_valider = tk.Button(self, text="Valider", command=self.valider_parametres, font=("Arial", 12), bg=button_bg, fg=fg_color)
-        self.bouton_valider.grid(row=3, column=0, pady=20)
+        self.bouton_valider.grid(row=4, column=0, pady=20)
 
     def valider_parametres(self) -> None:
         """
         Valide les paramètres saisis pour le nouveau jeu.
 
-        Cette méthode récupère le nom du jeu saisi par l'utilisateur et la taille de la carte choisie.
+        Cette méthode récupère le nom du jeu saisi par l'utilisateur, la taille de la carte choisie et le mode de jeu.
         Ensuite, elle affiche le nom du jeu et la taille de la carte dans la console.
         Si le nom du jeu est vide ou déjà utilisé, une boîte de dialogue d'erreur est affichée.
         Sinon, les guillemets doubles sont supprimés du nom du jeu pour éviter les injections de code.
@@ -82,6 +90,7 @@ class New_game(tk.Toplevel):
         """
         nom_jeu = self.saisie.get()
         taille_carte = int(self.valeur_seuil.get())
+        mode = MODE_INFINI if self.infini.get() else MODE_ETAGES
         print(f"Nom du jeu: {nom_jeu}")
         print(f"Taille de la carte: {taille_carte}")
         noms = [g.get('nom') for g in self.master.games.values()]
@@ -91,4 +100,4 @@ class New_game(tk.Toplevel):
             # supprimer les " du nom pour éviter les injections de code
             nom_jeu = nom_jeu.replace('"', "")
             self.destroy()
-            self.master.create_new_game(nom_jeu, taille_carte)
\ No newline at end of file
+            self.master.create_new_game(nom_jeu, taille_carte, mode)
\ No newline at end of file
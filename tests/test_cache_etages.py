@@ -0,0 +1,50 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pytest
+
+import game.game as module_game
+from engine.generation import CacheEtages
+from engine.generation.prechargement import PrechargeurEtages
+from game.game import Game
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = CacheEtages(str(tmp_path / "etages"))
+    monkeypatch.setattr(module_game, "CACHE_ETAGES", cache)
+    return cache
+
+
+def test_deuxieme_chargement_depuis_le_cache(cache, monkeypatch):
+    premiere = Game(1, "partie", taille_matrice=50, entites=[], portes=[], graine=1234)
+    assert cache.charger(premiere.graine_etage(), 50, 1) is not None
+
+    def construire_etage(*args, **kwargs):
+        raise AssertionError("l'étage aurait dû venir du cache")
+
+    monkeypatch.setattr(module_game, "construire_etage", construire_etage)
+    seconde = Game(2, "partie", taille_matrice=50, entites=[], portes=[], graine=1234)
+
+    assert seconde.matrice == premiere.matrice
+    assert (seconde.start.x, seconde.start.y) == (premiere.start.x, premiere.start.y)
+
+
+def test_graine_par_etage(cache):
+    partie = Game(1, "partie", taille_matrice=50, entites=[], portes=[], graine=1234)
+
+    assert partie.graine_etage() == partie.graine_etage(1)
+    assert partie.graine_etage(1) != partie.graine_etage(2)
+
+
+def test_prechargement_depuis_le_cache(cache):
+    partie = Game(1, "partie", taille_matrice=50, entites=[], portes=[], graine=1234)
+    prechargeur = PrechargeurEtages(cache)
+
+    prechargeur.demander(50, 1, partie.graine_etage())
+    etage = prechargeur.recuperer(50, 1, partie.graine_etage())
+
+    assert prechargeur.executeur is None # aucun processus de travail lancé
+    assert etage.matrice == partie.matrice
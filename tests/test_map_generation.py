@@ -0,0 +1,29 @@
+from engine.generation import GenerateurCarte, UnionFind
+from engine.generation.map_generation import PieceCarte
+
+
+def generateur(salles):
+    generateur = GenerateurCarte(60, 60, seed=1)
+    generateur.rooms = [PieceCarte(*salle) for salle in salles]
+    return generateur
+
+
+def test_voisines_les_plus_proches():
+    # trois salles alignées sur les mêmes lignes, une quatrième sous la première
+    dg = generateur([(2, 2, 5, 5), (2, 12, 5, 5), (2, 22, 5, 5), (12, 3, 5, 5)])
+    paires = {(i, j): type for _, i, j, type in dg.candidate_pairs()}
+
+    assert paires == {(0, 1): 'rows', (1, 2): 'rows', (0, 3): 'cols'}
+
+
+def test_toutes_les_salles_reliees():
+    # grille de 4x4 salles de tailles et de décalages variés
+    salles = [(2 + 12 * r + (c % 2), 2 + 12 * c + (r % 3), 6 + (r + c) % 3, 5 + (r * c) % 4) for r in range(4) for c in range(4)]
+    dg = generateur(salles)
+    paires = dg.candidate_pairs()
+
+    assert len(paires) <= 4 * len(salles)
+    groupes = UnionFind(len(salles))
+    for _, i, j, _ in paires:
+        groupes.union(i, j)
+    assert groupes.nb_groupes == 1
@@ -0,0 +1,41 @@
+from engine.generation import construire_etage, verifier_etage
+
+# Couloir de deux cases de haut : l'entrée (4) à gauche, une porte 2x2 (2), puis la sortie (3).
+# La dernière ligne contient une poche fermée où une clé (7) peut être enfermée.
+COULOIR = [
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 4, 1, 1, 1, 2, 2, 1, 3, 0],
+    [0, 1, 1, 1, 1, 2, 2, 1, 1, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+]
+
+
+def etage(cle):
+    matrice = [list(ligne) for ligne in COULOIR]
+    x, y = cle
+    matrice[y][x] = 7
+    return matrice
+
+
+def test_cle_accessible():
+    rapport = verifier_etage(etage((2, 2)))
+
+    assert rapport.soluble
+    assert rapport.cles_inaccessibles == []
+
+
+def test_cle_inaccessible():
+    rapport = verifier_etage(etage((1, 4)))
+
+    assert not rapport.soluble
+    assert rapport.cles_inaccessibles == [(1, 4)]
+    assert rapport.portes_inaccessibles == [(5, 1)]
+
+
+def test_etage_bsp_soluble():
+    plan = construire_etage(60, 5, seed=1)
+
+    assert plan.portes
+    assert verifier_etage(plan.matrice, plan.cles, plan.entree, plan.sortie).soluble
@@ -0,0 +1,38 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pytest
+
+from engine.ui.tilemap import ID_TEXTURES_MURS, TABLE_MURS, VOISINS
+
+NOMS = {(-1, 0): "left", (1, 0): "right", (0, -1): "up", (0, 1): "down",
+        (-1, -1): "up_left", (1, -1): "up_right", (-1, 1): "down_left", (1, 1): "down_right"}
+
+
+def masque(*voisins):
+    return sum(1 << VOISINS.index(voisin) for voisin, nom in NOMS.items() if nom in voisins)
+
+
+@pytest.mark.parametrize("voisins, texture", [
+    (("left", "right", "up", "down", "up_left", "up_right", "down_left", "down_right"), "stone"),
+    (("right", "down"), "down_right_ext_wall"),
+    (("left", "down", "down_left"), "down_left_ext_wall"),
+    (("right", "up"), "up_right_ext_wall"),
+    (("left", "up", "up_left"), "up_left_ext_wall"),
+    (("left", "right", "down"), "down_wall"),
+    (("left", "right", "up", "up_left", "up_right"), "up_wall"),
+    (("left", "up", "down"), "left_wall"),
+    (("right", "up", "down", "down_right"), "right_wall"),
+    (("right", "left", "down", "up", "up_right", "down_right", "down_left"), "down_right_int_wall"),
+    (("right", "left", "down", "up", "up_left", "down_right", "down_left"), "down_left_int_wall"),
+    (("right", "left", "down", "up", "up_right", "up_left", "down_right"), "up_right_int_wall"),
+    (("right", "left", "down", "up", "up_right", "up_left", "down_left"), "up_left_int_wall"),
+])
+def test_texture_des_murs(voisins, texture):
+    assert TABLE_MURS[masque(*voisins)] == ID_TEXTURES_MURS[texture]
+
+
+def test_mur_isole_en_pierre():
+    assert TABLE_MURS[0] == ID_TEXTURES_MURS["stone"]
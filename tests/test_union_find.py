@@ -0,0 +1,22 @@
+from engine.generation import UnionFind
+
+
+def test_groupes_separes_au_depart():
+    groupes = UnionFind(4)
+
+    assert groupes.nb_groupes == 4
+    assert len({groupes.find(i) for i in range(4)}) == 4
+
+
+def test_union_et_find():
+    groupes = UnionFind(6)
+
+    assert groupes.union(0, 1)
+    assert groupes.union(2, 3)
+    assert groupes.union(1, 3)
+    assert not groupes.union(0, 2) # déjà dans le même groupe
+
+    assert groupes.find(0) == groupes.find(1) == groupes.find(2) == groupes.find(3)
+    assert groupes.find(4) != groupes.find(0)
+    assert groupes.find(5) != groupes.find(4)
+    assert groupes.nb_groupes == 3